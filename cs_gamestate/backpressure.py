@@ -0,0 +1,138 @@
+"""
+Counter-Strike Game State Integration Backpressure
+"""
+
+# Synchronize updating the measurements from the request threads
+import threading
+# Measure the CPU time used by the process relative to the wall time
+import time
+
+
+# Derives how long to delay the response to the game from the load of the
+# consumers, the game does not send again before receiving the response
+class Backpressure:
+    """
+    Computes response delays slowing down the game's update rate while the
+    consumers fall behind or the process exceeds its CPU budget, and
+    acknowledging immediately once they caught up.
+    """
+
+    # Configures the sources of pressure and the delays
+    def __init__(
+            self, sources=(), budget=None, max_delay=1.0, threshold=0.5,
+            smoothing=0.2, interval=0.1
+    ):
+        """
+        Initializes the backpressure without load.
+        :param sources: Callables returning the fill ratio of a consumer queue
+            from 0 (empty) to 1 (full), e.g., GSIBroker.pressure
+        :param budget: Fraction of a processor the whole process may use,
+            e.g., 0.5 for half a core, None to ignore the CPU usage
+        :param max_delay: Longest delay of a response in seconds
+            Note: Keep this below the timeout of the game configuration, 1.1
+                seconds by default, the game considers delays beyond a failure
+        :param threshold: Pressure from which the responses are delayed, the
+            delay grows linearly up to the maximum at full pressure, i.e., full
+            queues or the CPU usage reaching the budget, from 0 up to but
+            excluding 1
+        :param smoothing: Weight of the latest CPU usage measurement in the
+            moving average
+        :param interval: Minimum seconds between two CPU usage measurements
+        """
+        # The delay grows from the threshold to full pressure, which needs a
+        # range to grow in
+        if not 0 <= threshold < 1:
+            raise ValueError(f"The threshold must be in [0, 1): {threshold}")
+        # Callables measuring the fill ratio of the consumer queues
+        self.sources = list(sources)
+        # Delay configuration
+        self.budget, self.max_delay = budget, max_delay
+        self.threshold = threshold
+        # CPU usage measurement configuration
+        self.smoothing, self.interval = smoothing, interval
+        # Moving average of the fraction of a processor used by the process
+        self.usage = 0.0
+        # Wall and CPU time of the last measurement
+        self.last = (time.monotonic(), time.process_time())
+        # Number of responses, of those delayed and the sum of the delays
+        self.responses, self.delayed, self.total_delay = 0, 0, 0.0
+        # Lock to synchronize the measurements of concurrent requests
+        self.lock = threading.Lock()
+
+    # Adds a source of pressure
+    def watch(self, source):
+        """
+        Registers a consumer queue to watch.
+        :param source: Callable returning the fill ratio of the queue from 0
+            to 1, e.g., lambda: len(pool.pending["feed"]) / 64
+        """
+        self.sources.append(source)
+
+    # Measures the fraction of a processor used by the process
+    def cpu(self) -> float:
+        """
+        Updates the moving average of the CPU usage of the process.
+        :return: Returns the fraction of a processor used recently
+        """
+        # Lock access to the measurements
+        with self.lock:
+            # Wall and CPU time now and since the last measurement
+            wall, cpu = time.monotonic(), time.process_time()
+            elapsed = wall - self.last[0]
+            # Measurements too close together are too noisy
+            if elapsed >= self.interval:
+                # Fraction of a processor used since the last measurement
+                usage = (cpu - self.last[1]) / elapsed
+                # Smooth the measurements by a moving average
+                self.usage += self.smoothing * (usage - self.usage)
+                self.last = (wall, cpu)
+            # Return the recent CPU usage
+            return self.usage
+
+    # Combined pressure of the consumer queues and the CPU usage
+    def pressure(self) -> float:
+        """
+        Measures the current pressure.
+        :return: Returns the highest of the queue fill ratios and the CPU usage
+            relative to the budget, 1 or above is full pressure
+        """
+        # Fill ratio of the fullest consumer queue
+        queues = max((source() for source in self.sources), default=0.0)
+        # CPU usage relative to the budget, if there is a budget
+        cpu = self.cpu() / self.budget if self.budget else 0.0
+        # The most loaded resource determines the pressure
+        return max(queues, cpu)
+
+    # Delay of the next response
+    def delay(self) -> float:
+        """
+        Computes the delay of the response to the current request.
+        :return: Returns the seconds to delay the response, 0 to acknowledge
+            immediately
+        """
+        # Pressure above the threshold scaled to the range from 0 to 1
+        excess = (self.pressure() - self.threshold) / (1 - self.threshold)
+        # Delay linearly growing with the excess, capped at the maximum
+        delay = self.max_delay * min(max(excess, 0.0), 1.0)
+        # Count the response and its delay
+        with self.lock:
+            self.responses += 1
+            if delay > 0:
+                self.delayed += 1
+                self.total_delay += delay
+        # Return the delay
+        return delay
+
+    # Summarizes the delays so far
+    def stats(self) -> dict:
+        """
+        Summarizes the delayed responses.
+        :return: Dictionary of the number of responses, of those delayed, the
+            average delay of the delayed responses and the recent CPU usage
+        """
+        return {
+            "responses": self.responses, "delayed": self.delayed,
+            "average_delay": self.total_delay / self.delayed
+            if self.delayed else 0.0,
+            "cpu": self.usage,
+        }
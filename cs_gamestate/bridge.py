@@ -0,0 +1,229 @@
+"""
+Counter-Strike Game State Integration Inter-Process Bridge
+"""
+
+# Serialize the game states into the frames
+import json
+# Remove stale socket files
+import os
+# Wait for readable sockets with a timeout
+import select
+# Unix domain sockets connecting the processes
+import socket
+# Encode the length prefix of the frames
+import struct
+# Run the publishing side in separate threads
+import threading
+# Bounded queues dropping the oldest frames of slow readers
+from collections import deque
+
+# Decodes raw payloads into the game state structures
+from cs_gamestate.decoder import Decoder
+
+# Header of each frame: Length of the payload as unsigned 32-bit big endian
+HEADER = struct.Struct("!I")
+
+
+# Connection to a single reader process on the publishing side of the bridge
+class _Connection:
+    # Sets up the frame queue and starts the sending thread
+    def __init__(self, sock, maxsize):
+        # Socket connected to the reader
+        self.sock = sock
+        # Bounded queue of frames not sent yet
+        self.frames = deque(maxlen=maxsize)
+        # Condition to wait for new frames
+        self.condition = threading.Condition()
+        # Flag indicating whether the reader is still connected
+        self.connected = True
+        # Send the frames in the background to never block the server
+        threading.Thread(target=self.run, daemon=True).start()
+
+    # Enqueues a frame to be sent, dropping the oldest if the reader is behind
+    def put(self, frame):
+        # Lock access to the queue and wake up the sending thread
+        with self.condition:
+            self.frames.append(frame)
+            self.condition.notify()
+
+    # Sends the queued frames until the reader disconnects
+    def run(self):
+        # Send until the connection breaks
+        while self.connected:
+            # Wait for the next frame
+            with self.condition:
+                self.condition.wait_for(lambda: self.frames)
+                frame = self.frames.popleft()
+            # Send the complete frame, the reader disconnecting terminates
+            try:
+                self.sock.sendall(frame)
+            # Broken pipe or reset connection
+            except OSError:
+                # Mark as disconnected to be removed by the bridge
+                self.connected = False
+        # Release the socket
+        self.sock.close()
+
+
+# Publishing side of the bridge sharing the game states received by the server
+# with other processes on the same host
+class GSIBridge:
+    """
+    Shares each game state received by an endpoint server with reader processes
+    connected via a Unix domain socket, using length prefixed JSON frames.
+    """
+
+    # Creates the listening socket and attaches to the server
+    def __init__(self, address, server=None, maxsize=16):
+        """
+        Initializes the listening socket and accepts readers in the background.
+        :param address: Filesystem path of the Unix domain socket
+        :param server: GSIServer to receive the raw game states from, if None,
+            payloads must be published manually via publish
+        :param maxsize: Maximum number of frames queued per reader, the oldest
+            frame is dropped if a reader falls behind
+        """
+        # Maximum number of queued frames per reader
+        self.maxsize = maxsize
+        # Connections to the readers as tuple, replaced on change to allow
+        # iterating without holding the lock
+        self.connections = ()
+        # Lock to synchronize changing the connections
+        self.lock = threading.Lock()
+        # Remove a stale socket file of a previous run
+        if os.path.exists(address):
+            os.unlink(address)
+        # Listen for readers on the Unix domain socket
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.bind(address)
+        self.sock.listen()
+        # Accept readers in the background
+        threading.Thread(target=self.accept, daemon=True).start()
+        # Register to receive each raw payload from the server
+        if server is not None:
+            server.add_listener(self.publish)
+
+    # Accepts reader connections until the socket is closed
+    def accept(self):
+        # Accept forever, closing the socket terminates the loop
+        while True:
+            # Wait for the next reader to connect
+            try:
+                sock, _ = self.sock.accept()
+            # The listening socket has been closed
+            except OSError:
+                break
+            # Replace the connections by an extended copy
+            with self.lock:
+                self.connections = (
+                    *self.connections, _Connection(sock, self.maxsize)
+                )
+
+    # Serializes and distributes a raw game state payload to all readers
+    def publish(self, payload: dict):
+        """
+        Serializes the raw game state once and sends it to all readers.
+        :param payload: Raw JSON payload dictionary
+        """
+        # Nobody to publish to, skip serializing
+        if not self.connections:
+            return
+        # Serialize the payload once, prefixed by its length
+        data = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        frame = HEADER.pack(len(data)) + data
+        # Enqueue the frame for each connected reader
+        for connection in self.connections:
+            connection.put(frame)
+        # Remove the readers which have disconnected
+        if not all(c.connected for c in self.connections):
+            with self.lock:
+                self.connections = tuple(
+                    c for c in self.connections if c.connected
+                )
+
+    # Stops accepting new readers
+    def close(self):
+        """
+        Closes the listening socket, connected readers are not affected.
+        """
+        self.sock.close()
+
+
+# Reading side of the bridge, receiving the game states in another process
+class BridgeReader:
+    """
+    Receives the game states shared by a GSIBridge running in another process.
+    """
+
+    # Connects to the bridge
+    def __init__(self, address, decoder=None):
+        """
+        Connects to the Unix domain socket of the bridge.
+        :param address: Filesystem path of the Unix domain socket
+        :param decoder: Decoder used to decode the raw payloads, defaults to
+            decoding without any options
+        """
+        # Decoder converting the raw payloads into game state structures
+        self.decoder = decoder if decoder is not None else Decoder()
+        # Connect to the listening socket of the bridge
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(address)
+
+    # Receives exactly the specified number of bytes
+    def _recv(self, size):
+        # Preallocate the buffer to receive into
+        buffer = bytearray(size)
+        view = memoryview(buffer)
+        # Receive until the buffer is filled
+        received = 0
+        while received < size:
+            # Receive directly into the remaining part of the buffer
+            n = self.sock.recv_into(view[received:])
+            # The bridge closed the connection
+            if n == 0:
+                raise ConnectionError("Bridge closed the connection")
+            received += n
+        # Return the filled buffer
+        return buffer
+
+    # Reads the next game state from the bridge
+    def read(self, block=True, timeout=None, decode=True):
+        """
+        Reads the next game state.
+        :param block: Block while there is no game state
+        :param timeout: Maximum time in seconds to block
+        :param decode: Decode the raw JSON payload into a GameState object
+        :return: Returns the next game state as a GameState object or as the
+            raw JSON payload dictionary if decoding is disabled, or None if
+            there is no game state
+        """
+        # Wait for the next frame to become available, if not blocking, only
+        # check whether there is something to read
+        readable, _, _ = select.select(
+            [self.sock], [], [], timeout if block else 0
+        )
+        # Nothing to read
+        if not readable:
+            return None
+        # Receive the length prefix followed by the payload
+        (size,) = HEADER.unpack(self._recv(HEADER.size))
+        payload = json.loads(self._recv(size))
+        # Optionally skip decoding and return the raw payload
+        if not decode:
+            return payload
+        # Return the decoded game state
+        return self.decoder.decode(payload)
+
+    # Iterates the received game states, blocking for each
+    def __iter__(self):
+        # Block for each game state, raises ConnectionError once the bridge
+        # disconnects
+        while True:
+            yield self.read(block=True)
+
+    # Disconnects from the bridge
+    def close(self):
+        """
+        Closes the connection to the bridge.
+        """
+        self.sock.close()
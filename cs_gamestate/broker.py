@@ -0,0 +1,290 @@
+"""
+Counter-Strike Game State Integration Publish/Subscribe Broker
+"""
+
+# Asynchronous subscribers receive game states via asyncio queues
+import asyncio
+# Bounded queues dropping the oldest game states
+from collections import deque
+# Synchronize publishing and subscribing threads
+import threading
+
+# Top-Level Game State Structure
+from cs_gamestate.structs.gamestate import GameState
+# Decodes raw payloads into the game state structures
+from cs_gamestate.decoder import Decoder
+
+
+# Subscription to the game states published by a broker
+class Subscription:
+    """
+    Bounded queue of game states published to a single subscriber, optionally
+    filtered to a subset of game state components.
+    """
+
+    # Configures the subscription queue and component filter
+    def __init__(self, components=None, maxsize=16):
+        """
+        Initializes the bounded game state queue.
+        :param components: Names of the GameState fields to receive, e.g.,
+            ("bomb", "round"), or None to receive complete game states
+        :param maxsize: Maximum number of queued game states, the oldest game
+            state is dropped if a new one arrives while the queue is full
+        """
+        # Component filter as a tuple of game state field names
+        self.components = tuple(components) if components else None
+        # Maximum number of queued game states, zero if not queued at all
+        self.maxsize = maxsize
+        # Bounded queue automatically dropping the oldest states
+        self.queue = deque(maxlen=maxsize)
+        # Condition to wait for new states
+        self.condition = threading.Condition()
+        # Number of states dropped due to the subscriber falling behind
+        self.dropped = 0
+
+    # Restricts the game state to the subscribed components
+    def filter(self, state: GameState) -> GameState | None:
+        """
+        Applies the component filter to the game state.
+        :param state: Complete game state as published by the broker
+        :return: Returns the game state reduced to the subscribed components
+            or None if none of the components is present
+        """
+        # Without filter, the complete game state is delivered
+        if self.components is None:
+            return state
+        # Collect the subscribed components of the state
+        fields = {name: getattr(state, name) for name in self.components}
+        # Skip the state if none of the components is present
+        if all(value is None for value in fields.values()):
+            return None
+        # Construct a reduced game state sharing the decoded components
+        return GameState(**fields)
+
+    # Delivers a game state to the subscriber, called by the broker
+    def put(self, state: GameState):
+        """
+        Appends the game state to the queue, dropping the oldest game state if
+        the queue is full.
+        :param state: Filtered game state to be delivered
+        """
+        # Lock access to the queue and wake up waiting readers
+        with self.condition:
+            # The queue drops the oldest state if it is full
+            if len(self.queue) == self.queue.maxlen:
+                # Count the dropped state
+                self.dropped += 1
+            # Enqueue the new state
+            self.queue.append(state)
+            # Wake up readers waiting for a new state
+            self.condition.notify_all()
+
+    # Reads the next game state from the queue
+    def get(self, block=True, timeout=None) -> GameState | None:
+        """
+        Reads the next game state from the queue.
+        :param block: Block while there is no game state
+        :param timeout: Maximum time in seconds to block
+        :return: Returns the oldest queued game state or None if there is none
+        """
+        # Lock access to the queue while waiting and reading
+        with self.condition:
+            # Optionally wait for the queue to become non-empty
+            if block:
+                self.condition.wait_for(lambda: self.queue, timeout)
+            # Take the oldest state if there is one
+            return self.queue.popleft() if self.queue else None
+
+    # Number of game states waiting to be read
+    def __len__(self):
+        return len(self.queue)
+
+    # Fill ratio of the queue, e.g., as source of backpressure
+    def pressure(self) -> float:
+        """
+        Measures how far the subscriber falls behind.
+        :return: Returns the fill ratio of the queue from 0 (empty) to 1
+            (full), 0 if the game states are not queued
+        """
+        return len(self) / self.maxsize if self.maxsize else 0.0
+
+    # Iterates the received game states, blocking for each
+    def __iter__(self):
+        # Block until the next game state forever
+        while True:
+            yield self.get(block=True)
+
+
+# Subscription delivering game states into an asyncio event loop
+class AsyncSubscription(Subscription):
+    """
+    Bounded queue of game states published to a subscriber running as an
+    asyncio task.
+    """
+
+    # Configures the subscription queue, component filter and event loop
+    def __init__(self, loop=None, components=None, maxsize=16):
+        """
+        Initializes the bounded game state queue within the event loop.
+        :param loop: Event loop of the subscribing task, defaults to the
+            running event loop
+        :param components: Names of the GameState fields to receive
+        :param maxsize: Maximum number of queued game states
+        """
+        # Initialize the component filter, the deque is not used
+        super().__init__(components, maxsize)
+        # Event loop the subscriber runs in
+        self.loop = loop or asyncio.get_running_loop()
+        # Asyncio queue living in the event loop
+        self.queue = asyncio.Queue(maxsize)
+
+    # Enqueues a game state within the event loop
+    def _put(self, state: GameState):
+        # The queue drops the oldest state if it is full
+        if self.queue.full():
+            # Drop and count the oldest state
+            self.queue.get_nowait()
+            self.dropped += 1
+        # Enqueue the new state
+        self.queue.put_nowait(state)
+
+    # Delivers a game state to the subscriber, called by the broker
+    def put(self, state: GameState):
+        # Hand the state over to the event loop thread
+        self.loop.call_soon_threadsafe(self._put, state)
+
+    # Reads the next game state from the queue
+    async def get(self) -> GameState:  # noqa: Signature differs from base
+        """
+        Waits for and reads the next game state from the queue.
+        :return: Returns the oldest queued game state
+        """
+        return await self.queue.get()
+
+    # Number of game states waiting to be read
+    def __len__(self):
+        return self.queue.qsize()
+
+    # Iterates the received game states asynchronously
+    async def __aiter__(self):  # noqa: Overrides synchronous iteration
+        # Wait for the next game state forever
+        while True:
+            yield await self.get()
+
+
+# Subscription calling a function for each game state
+class CallbackSubscription(Subscription):
+    """
+    Subscription calling a function for each game state in the publishing
+    thread, i.e., the callback should return quickly.
+    """
+
+    # Configures the callback and component filter
+    def __init__(self, callback, components=None):
+        """
+        Initializes the callback subscription.
+        :param callback: Callable receiving each filtered game state
+        :param components: Names of the GameState fields to receive
+        """
+        # Initialize the component filter, there is no queue
+        super().__init__(components, maxsize=0)
+        # Function to be called with each game state
+        self.callback = callback
+
+    # Delivers a game state to the subscriber, called by the broker
+    def put(self, state: GameState):
+        # Call the function directly in the publishing thread
+        self.callback(state)
+
+
+# Publish/subscribe broker decoding each game state once and distributing it to
+# any number of subscribers
+class GSIBroker:
+    """
+    Decodes each game state received by an endpoint server once and publishes
+    it to all subscribers.
+    """
+
+    # Attaches the broker to the endpoint server
+    def __init__(self, server=None, decoder=None):
+        """
+        Initializes the broker, optionally listening to an endpoint server.
+        :param server: GSIServer to receive the raw game states from, if None,
+            payloads must be published manually via publish
+        :param decoder: Decoder used to decode the raw payloads, defaults to
+            the decoder of the server
+        """
+        # Use the decoder of the server unless specified otherwise
+        if decoder is None:
+            decoder = server.decoder if server is not None else Decoder()
+        # Decoder converting the raw payloads into game state structures
+        self.decoder = decoder
+        # Subscriptions as tuple, replaced on change to allow iterating without
+        # holding the lock
+        self.subscriptions = ()
+        # Lock to synchronize changing the subscriptions
+        self.lock = threading.Lock()
+        # Number of game states published so far
+        self.published = 0
+        # Register to receive each raw payload from the server
+        if server is not None:
+            server.add_listener(self.publish)
+
+    # Adds a subscription to the broker
+    def subscribe(self, subscription: Subscription = None, **kwargs):
+        """
+        Registers a new subscriber.
+        :param subscription: Subscription to register, if None, a new
+            Subscription is created from the keyword arguments
+        :return: Returns the registered subscription
+        """
+        # Create a default subscription if none is given
+        if subscription is None:
+            subscription = Subscription(**kwargs)
+        # Replace the subscriptions by an extended copy
+        with self.lock:
+            self.subscriptions = (*self.subscriptions, subscription)
+        # Return the subscription to read from
+        return subscription
+
+    # Removes a subscription from the broker
+    def unsubscribe(self, subscription: Subscription):
+        """
+        Unregisters a subscriber.
+        :param subscription: Subscription to be removed
+        """
+        # Replace the subscriptions by a reduced copy
+        with self.lock:
+            self.subscriptions = tuple(
+                s for s in self.subscriptions if s is not subscription
+            )
+
+    # Fill ratio of the fullest subscription queue
+    def pressure(self) -> float:
+        """
+        Measures how far the slowest subscriber falls behind, e.g., as source
+        of backpressure.
+        :return: Returns the highest fill ratio of the subscription queues
+        """
+        return max((s.pressure() for s in self.subscriptions), default=0.0)
+
+    # Decodes and distributes a raw game state payload
+    def publish(self, payload: dict):
+        """
+        Decodes the raw game state once and delivers it to all subscribers.
+        :param payload: Raw JSON payload dictionary
+        """
+        # Nobody to publish to, skip decoding
+        if not self.subscriptions:
+            return
+        # Decode the game state once for all subscribers
+        state = self.decoder.decode(payload)
+        # Count the published state
+        self.published += 1
+        # Deliver to each subscriber
+        for subscription in self.subscriptions:
+            # Apply the component filter of the subscriber
+            filtered = subscription.filter(state)
+            # Skip subscribers not interested in this state
+            if filtered is not None:
+                subscription.put(filtered)
@@ -0,0 +1,152 @@
+# Game state components which can be subscribed to via the GSIConfig, mapped to
+# the paths of the fields they provide within the game state payload
+#   Note: "*" matches any key of dictionaries keyed by player or grenade ID
+COMPONENTS = {
+    "provider": [("provider",)],
+    "player_id": [
+        ("player", "steamid"),
+        ("player", "name"),
+        ("player", "clan"),
+        ("player", "observer_slot"),
+        ("player", "team"),
+        ("player", "activity"),
+        ("player", "spectarget"),
+    ],
+    "player_state": [("player", "state")],
+    "map": [
+        ("map", "name"),
+        ("map", "mode"),
+        ("map", "phase"),
+        ("map", "round"),
+        ("map", "team_t"),
+        ("map", "team_ct"),
+        ("map", "num_matches_to_win_series"),
+        ("map", "current_spectators"),
+        ("map", "souvenirs_total"),
+    ],
+    "map_round_wins": [("map", "round_wins")],
+    "player_match_stats": [("player", "match_stats")],
+    "player_weapons": [("player", "weapons")],
+    "round": [("round",)],
+    "player_position": [("player", "position"), ("player", "forward")],
+    "allgrenades": [("grenades",)],
+    "allplayers_id": [
+        ("allplayers", "*", "name"),
+        ("allplayers", "*", "clan"),
+        ("allplayers", "*", "observer_slot"),
+        ("allplayers", "*", "team"),
+    ],
+    "allplayers_state": [("allplayers", "*", "state")],
+    "allplayers_match_stats": [("allplayers", "*", "match_stats")],
+    "allplayers_weapons": [("allplayers", "*", "weapons")],
+    "allplayers_position": [
+        ("allplayers", "*", "position"), ("allplayers", "*", "forward")
+    ],
+    "bomb": [("bomb",)],
+    "phase_countdowns": [("phase_countdowns",)],
+}
+
+
+# Collects the field paths of a set of components, optionally including the
+# corresponding paths of the "previously" and "added" change information
+def component_paths(components, changes=True):
+    # Collect the paths of all components in a flat list
+    paths = [path for name in components for path in COMPONENTS[name]]
+    # The change information mirrors the structure of the game state
+    if changes:
+        # Prefix each path with the two change information fields
+        paths += [("previously", *path) for path in paths] + [
+            ("added", *path) for path in paths
+        ]
+    # Return the list of path tuples
+    return paths
+
+
+# Names of the components subscribed to by a GSIConfig
+def subscribed(config):
+    # Components are the boolean flags of the configuration named like them
+    return [name for name in COMPONENTS if getattr(config, name, False)]
+
+
+# Converts a field path given as dotted string, e.g., "allplayers.*.weapons",
+# into a path tuple, tuples are kept as they are
+def as_path(path):
+    return tuple(path.split(".")) if isinstance(path, str) else tuple(path)
+
+
+# Compiles a list of field paths into a tree of nested dictionaries, where True
+# marks the end of a path, i.e., the whole subtree is covered
+def compile_paths(paths):
+    # Start with an empty tree
+    tree = {}
+    # Insert each path into the tree
+    for path in paths:
+        # Start each path at the root of the tree
+        node = tree
+        # Descend along all but the last path component, creating missing nodes
+        for key in path[:-1]:
+            # If this prefix is already covered completely, there is nothing to
+            # refine
+            if node.get(key) is True:
+                # Stop descending, the path is already covered
+                break
+            # Descend into the existing or a newly created node
+            node = node.setdefault(key, {})
+        # The loop did not break: Mark the last path component as covered
+        else:
+            # Covering a node overrides all more specific paths below
+            node[path[-1]] = True
+    # Return the compiled tree
+    return tree
+
+
+# Selects the fields covered by a compiled path tree from the game state payload
+#   Note: Produces new dictionaries along the paths, leaves are shared
+def select(payload, tree):
+    # Selection ends at a covered node: Take the whole subtree
+    if tree is True:
+        return payload
+    # Only dictionaries can be descended into, anything else is not present
+    if not isinstance(payload, dict):
+        return None
+    # Collect the selected fields into a new dictionary
+    selected = {}
+    # Run over the children of the node in the tree
+    for key, subtree in tree.items():
+        # The wildcard applies the subtree to each key of the payload
+        keys = payload.keys() if key == "*" else [key]
+        # Select from each of the matched keys
+        for k in keys:
+            # Skip keys not present in the payload
+            if k not in payload:
+                continue
+            # Recursively select from the field
+            value = select(payload[k], subtree)
+            # Empty selections are treated as not present
+            if value is not None and value != {}:
+                # Insert the selected field
+                selected[k] = value
+    # Return the dictionary of selected fields
+    return selected
+
+
+# Removes the fields covered by a compiled path tree from the game state payload
+#   Note: Produces new dictionaries along the paths, leaves are shared
+def exclude(payload, tree):
+    # Only dictionaries can be descended into, anything else is kept as is
+    if not isinstance(payload, dict):
+        return payload
+    # Collect the remaining fields into a new dictionary
+    remaining = {}
+    # Run over all fields of the payload
+    for key, value in payload.items():
+        # The explicit key takes precedence over the wildcard
+        subtree = tree.get(key, tree.get("*"))
+        # Fields not mentioned in the tree are kept unchanged
+        if subtree is None:
+            remaining[key] = value
+        # Fields not covered completely are pruned recursively
+        elif subtree is not True:
+            remaining[key] = exclude(value, subtree)
+    # Return the dictionary of remaining fields
+    return remaining
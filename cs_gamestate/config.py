@@ -69,6 +69,11 @@ class GSIConfig:
     # Subscribes to phase countdowns of a round
     phase_countdowns: bool = True
 
+    # Token sent along with each game state to authenticate the game at the
+    # endpoint, no authentication if None
+    #   Note: Last field to keep the positions of the other fields
+    token: str = None
+
     # Generates the configuration file
     def generate_cfg(self):
         # Converts a named config attribute to the configuration string
@@ -92,6 +97,13 @@ class GSIConfig:
             set_cfg("buffer"),
             set_cfg("throttle"),
             set_cfg("heartbeat"),
+            # Configure the authentication section, if a token is set
+            *([
+                f"\"auth\"",
+                f"{{",
+                set_cfg("token"),
+                f"}}",
+            ] if self.token is not None else []),
             # Configure the output section setting the resolution of
             # information
             f"\"output\"",
@@ -0,0 +1,575 @@
+"""
+Counter-Strike Game State Integration Decoder
+"""
+
+# Least recently used order of the cached substructures
+from collections import OrderedDict
+# Pause the cyclic garbage collector while decoding batches
+import gc
+# Intern repeated strings
+import sys
+# Synchronize the caches and the shared state of concurrent requests
+import threading
+
+# Select or exclude fields of the raw payload by component or path
+from cs_gamestate.components import (
+    as_path, compile_paths, component_paths, exclude, select, subscribed
+)
+
+# Configuration of the subscribed components
+from cs_gamestate.config import GSIConfig
+# Top-Level Game State Structure and its substructures
+from cs_gamestate.structs.gamestate import GameState
+from cs_gamestate.structs.arrays import GameStateArrays
+from cs_gamestate.structs.provider import Provider
+from cs_gamestate.structs.player import Player
+from cs_gamestate.structs.bomb import Bomb
+from cs_gamestate.structs.round import Round
+from cs_gamestate.structs.phase import PhaseCountdowns
+from cs_gamestate.structs.map import Map
+from cs_gamestate.structs.equipment import Weapon, ActiveGrenade
+# Enumeration of the round winning conditions, the other enumerations are
+# declared by the structures
+from cs_gamestate.enums.map import RoundWinCondition
+
+# Fields of the game state structures holding one of the known enum values, as
+# declared for their verification
+ENUM_FIELDS = {
+    cls: cls.ENUMS
+    for cls in [Weapon, ActiveGrenade, Player, Round, Bomb, PhaseCountdowns, Map]
+}
+
+# Fields of the game state structures holding strings repeated over many game
+# states but without known enum values
+INTERN_FIELDS = {
+    Provider: ("name", "steamid"),
+    Weapon: ("paintkit",),
+    ActiveGrenade: ("owner",),
+    Player: ("name", "clan", "steamid", "spectarget"),
+    Bomb: ("player",),
+    Map: ("name",),
+}
+
+
+# Substructures which can be cached by their raw payload
+CACHEABLE = (
+    Weapon, Map.Team, Player.State, Player.Stats, Round, Bomb, PhaseCountdowns
+)
+
+
+# Least recently used cache of substructures decoded from raw dictionaries
+class ParseCache:
+    """
+    Maps raw dictionaries to the substructures decoded from them, evicting the
+    least recently used substructures beyond the maximum size.
+    """
+
+    # Configures the type of substructure and the maximum size
+    def __init__(self, cls, maxsize):
+        """
+        Initializes an empty cache.
+        :param cls: Type of the substructures, initialized from the raw
+            dictionaries by keyword unpacking
+        :param maxsize: Maximum number of cached substructures
+        """
+        # Type and maximum number of substructures
+        self.cls, self.maxsize = cls, maxsize
+        # Decoded substructures by canonical raw dictionary, least recently
+        # used first
+        self.entries = OrderedDict()
+        # Statistics for tuning the maximum size
+        self.hits, self.misses, self.evictions = 0, 0, 0
+        # Lock to synchronize lookups of concurrent requests, reordering the
+        # entries is not thread-safe
+        self.lock = threading.Lock()
+
+    # Gets the substructure decoded from the raw dictionary
+    def get(self, raw: dict):
+        """
+        Looks up or decodes the substructure of a raw dictionary.
+        :param raw: Raw dictionary of the substructure
+        :return: Returns the cached substructure if an equal dictionary has
+            been decoded before, the newly decoded substructure otherwise
+        """
+        # The game sends the fields in a fixed order, the items identify the
+        # raw dictionary, cheaper than an order independent key
+        key = tuple(raw.items())
+        # Reuse the substructure decoded before and mark as recently used
+        with self.lock:
+            try:
+                obj = self.entries.get(key)
+            # Unhashable, i.e., nested values cannot be cached
+            except TypeError:
+                return self.cls(**raw)
+            if obj is not None:
+                self.hits += 1
+                self.entries.move_to_end(key)
+                return obj
+        # Decode the new substructure without holding the lock
+        obj = self.cls(**raw)
+        # Insert the new substructure
+        with self.lock:
+            self.misses += 1
+            self.entries[key] = obj
+            # Evict the least recently used substructure if the cache is full
+            if len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+        # Return the new substructure
+        return obj
+
+    # Summarizes the effectiveness of the cache
+    def stats(self) -> dict:
+        """
+        Summarizes the lookups of the cache.
+        :return: Dictionary of the hits, misses, evictions, current and maximum
+            size and the ratio of hits to lookups
+        """
+        # Number of lookups so far
+        lookups = self.hits + self.misses
+        # Collect the statistics
+        return {
+            "hits": self.hits, "misses": self.misses,
+            "evictions": self.evictions, "size": len(self.entries),
+            "maxsize": self.maxsize,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+# Decodes raw game state payloads into the game state structures
+class Decoder:
+    """
+    Decodes raw game state payloads into GameState objects, optionally
+    restricted to a subset of the fields and canonicalizing repeated string
+    values. A decoder may be used by concurrent threads, e.g., the request
+    threads of the server, but sharing substructures is only effective for
+    the game states of a single feed, give each feed its own decoder.
+    """
+
+    # Configures the decoding options
+    def __init__(
+            self, enums=False, intern=False, share=False, components=None,
+            ignore=None, cache=None
+    ):
+        """
+        Initializes the decoder.
+        :param enums: Decode fields with known values into the members of the
+            enums in cs_gamestate.enums, unknown values are kept as interned
+            strings, members compare equal to their string values
+        :param intern: Intern the strings of fields repeated over many game
+            states, e.g., weapon names, skins, player names and steam IDs
+        :param share: Reuse the substructures of the previously decoded game
+            state where the raw payload did not change, i.e., unchanged parts
+            of consecutive game states are identical objects
+            Note: The shared substructures must not be modified
+        :param components: Only decode the fields of these components, given
+            as a GSIConfig or as a list of component names, e.g., ["round",
+            "bomb"], all other fields are skipped without decoding
+        :param ignore: Skip decoding these fields, given as list of paths
+            either as tuples or dotted strings with "*" matching any key, e.g.,
+            ["allplayers.*.weapons"]
+        :param cache: Reuse the substructures decoded from equal raw
+            dictionaries, given as the maximum number of cached substructures
+            per type, e.g., {Weapon: 1024, Map.Team: 16}, see CACHEABLE for
+            the types which can be cached
+            Note: The cached substructures must not be modified
+        """
+        # Decoding options
+        self.enums, self.intern, self.share = enums, intern, share
+        # Tree of the fields to decode, compiled once, None decodes all fields
+        self.keep = None
+        # Components can be given as a configuration or as names
+        if components is not None:
+            # Names of the components subscribed to by the configuration
+            if isinstance(components, GSIConfig):
+                components = subscribed(components)
+            # The change information is restricted to the same fields
+            self.keep = compile_paths(component_paths(components))
+        # Tree of the fields to skip, compiled once, None skips nothing
+        self.drop = None
+        # Ignored fields are skipped in the change information as well
+        if ignore:
+            # Normalize the paths to tuples
+            paths = [as_path(path) for path in ignore]
+            # The change information mirrors the structure of the game state
+            self.drop = compile_paths(
+                paths + [("previously", *path) for path in paths]
+                + [("added", *path) for path in paths]
+            )
+        # Caches of the decoded substructures by type
+        self.caches = {}
+        for cls, maxsize in (cache or {}).items():
+            # Only substructures decoded from flat dictionaries can be cached
+            if cls not in CACHEABLE:
+                raise ValueError(f"Cannot cache {cls.__qualname__}")
+            self.caches[cls] = ParseCache(cls, maxsize)
+        # Whether any substructure of the players is cached
+        self.player_caches = bool(
+            {Player.State, Player.Stats, Weapon} & self.caches.keys()
+        )
+        # Raw payload and decoded game state of the previous call, kept as a
+        # single tuple to be replaced atomically
+        self.previous = ({}, GameState())
+        # Lock to decode concurrent game states relative to each other one at
+        # a time when sharing substructures
+        self.lock = threading.Lock()
+        # Lookup tables from value to enum member, faster than calling the
+        # enum and catching the ValueError of unknown values
+        self.members = {
+            enum: {member.value: member for member in enum}
+            for fields in ENUM_FIELDS.values() for enum in fields.values()
+        }
+        # Lookup table of the round winning conditions
+        self.members[RoundWinCondition] = {
+            member.value: member for member in RoundWinCondition
+        }
+
+    # Restricts a raw payload to the fields to decode
+    def _restrict(self, payload: dict) -> dict:
+        # Restrict the payload to the fields of the selected components
+        if self.keep is not None:
+            payload = select(payload, self.keep)
+        # Skip the ignored fields
+        if self.drop is not None:
+            payload = exclude(payload, self.drop)
+        # Return the restricted payload
+        return payload
+
+    # Decodes a raw payload already restricted to the fields to decode
+    def _decode(self, payload: dict) -> GameState:
+        # Substitute unchanged parts by the previously decoded substructures
+        if self.share:
+            # Lock access to the previous payload and game state
+            with self.lock:
+                # Substitute relative to the previous payload and game state
+                state = GameState(**self.lookup(
+                    self.substitute(payload, *self.previous)
+                ))
+                # Remember this payload and game state for the next call
+                self.previous = (payload, state)
+        # Decode into the game state structure
+        else:
+            state = GameState(**self.lookup(payload))
+        # Optionally canonicalize the string values
+        if self.enums or self.intern:
+            self.canonicalize(state)
+        # Return the decoded game state
+        return state
+
+    # Decodes a raw game state payload
+    def decode(self, payload: dict) -> GameState:
+        """
+        Decodes a raw game state payload.
+        :param payload: Raw JSON payload dictionary
+        :return: Returns the decoded game state
+        """
+        return self._decode(self._restrict(payload))
+
+    # Decodes many raw game state payloads at once, e.g., a recorded match
+    def decode_batch(self, payloads, arrays=False, pause_gc=False):
+        """
+        Decodes a batch of raw game state payloads in order, with the decoding
+        options applied as by decode.
+        :param payloads: Iterable of raw JSON payload dictionaries
+        :param arrays: Collect the payloads into a GameStateArrays
+            struct-of-arrays representation instead of decoding each of them
+        :param pause_gc: Disable the cyclic garbage collector while decoding,
+            which otherwise repeatedly traverses the growing batch without
+            ever finding garbage
+            Note: This affects the whole process, including other threads,
+                e.g., of a running server, only use it for offline batches
+        :return: Returns the list of decoded game states or the
+            struct-of-arrays representation of the batch
+        """
+        # Restrict the payloads to the selected fields once in advance
+        payloads = [self._restrict(payload) for payload in payloads]
+        # Optionally collect the columns without decoding the structures
+        if arrays:
+            return GameStateArrays.from_payloads(payloads)
+        # Preallocate the list of decoded game states
+        states = [None] * len(payloads)
+        # Pause the garbage collector if requested and enabled at all
+        paused = pause_gc and gc.isenabled()
+        if paused:
+            gc.disable()
+        try:
+            # Decode in order, relative to the previous payload of the batch
+            for index, payload in enumerate(payloads):
+                states[index] = self._decode(payload)
+        # Resume garbage collection if it has been paused
+        finally:
+            if paused:
+                gc.enable()
+        # Return the decoded game states in order
+        return states
+
+    # Summarizes the effectiveness of the substructure caches
+    def cache_stats(self) -> dict:
+        """
+        Summarizes the lookups of each substructure cache for tuning their
+        sizes.
+        :return: Dictionary of the statistics of each cache by type name
+        """
+        return {
+            cls.__qualname__: cache.stats()
+            for cls, cache in self.caches.items()
+        }
+
+    # Gets a substructure from its cache if the raw value is a dictionary
+    def cached(self, cls, raw):
+        # Only raw dictionaries of cached types are looked up
+        if cls in self.caches and isinstance(raw, dict):
+            return self.caches[cls].get(raw)
+        # Keep anything else, e.g., substituted substructures, to be decoded
+        return raw
+
+    # Replaces the raw dictionaries of a player by the cached substructures
+    def lookup_player(self, raw):
+        # Only raw players contain raw dictionaries
+        if not isinstance(raw, dict) or not self.player_caches:
+            return raw
+        # Shallow copy of the player to insert the cached substructures
+        raw = dict(raw)
+        # Look up the state and match statistics
+        for key, cls in [
+            ("state", Player.State), ("match_stats", Player.Stats)
+        ]:
+            if key in raw:
+                raw[key] = self.cached(cls, raw[key])
+        # Look up each weapon of the equipment
+        if Weapon in self.caches and isinstance(raw.get("weapons"), dict):
+            raw["weapons"] = {
+                slot: self.cached(Weapon, weapon)
+                for slot, weapon in raw["weapons"].items()
+            }
+        # Return the player with the cached substructures
+        return raw
+
+    # Replaces the raw dictionaries of a payload by the cached substructures
+    def lookup(self, payload):
+        """
+        Replaces the raw dictionaries of the cached substructure types by the
+        substructures decoded from equal dictionaries before.
+        :param payload: Raw JSON payload dictionary, not modified
+        :return: Returns a shallow copy of the payload with the cached
+            substructures inserted, or the payload itself without caches
+        """
+        # Nothing to look up without caches
+        if not self.caches:
+            return payload
+        # Shallow copy of the payload to insert the cached substructures
+        payload = dict(payload)
+        # Look up the flat substructures as a whole
+        for key, cls in [
+            ("bomb", Bomb), ("round", Round),
+            ("phase_countdowns", PhaseCountdowns)
+        ]:
+            if key in payload:
+                payload[key] = self.cached(cls, payload[key])
+        # Look up the teams of the map
+        if Map.Team in self.caches and isinstance(payload.get("map"), dict):
+            payload["map"] = {
+                **payload["map"], **{
+                    key: self.cached(Map.Team, payload["map"][key])
+                    for key in ["team_t", "team_ct"] if key in payload["map"]
+                }
+            }
+        # Look up the player and each of all players
+        if "player" in payload:
+            payload["player"] = self.lookup_player(payload["player"])
+        if isinstance(payload.get("allplayers"), dict):
+            payload["allplayers"] = {
+                key: self.lookup_player(player)
+                for key, player in payload["allplayers"].items()
+            }
+        # Return the payload with the cached substructures
+        return payload
+
+    # Canonicalizes a single string value
+    def value(self, value, enum=None):
+        # Only strings can be canonicalized
+        if not isinstance(value, str):
+            return value
+        # Look up the enum member of the value if requested
+        if self.enums and enum is not None:
+            # Member corresponding to the value, None if the value is unknown
+            member = self.members[enum].get(value)
+            # Unknown values fall back to interned strings
+            return member if member is not None else sys.intern(value)
+        # Values without enum or with enums disabled are interned if requested
+        if self.intern:
+            return sys.intern(value)
+        # Keep the value as is
+        return value
+
+    # Canonicalizes the string fields of a single structure
+    def fields(self, obj):
+        # Nothing to canonicalize if the structure is not present
+        if obj is None:
+            return
+        # Canonicalize the fields with known enum values
+        for attr, enum in ENUM_FIELDS.get(type(obj), {}).items():
+            setattr(obj, attr, self.value(getattr(obj, attr), enum))
+        # Canonicalize the other repeated string fields
+        if self.intern:
+            for attr in INTERN_FIELDS.get(type(obj), ()):
+                setattr(obj, attr, self.value(getattr(obj, attr)))
+
+    # Canonicalizes the string fields of a player and its weapons
+    def player(self, player: Player):
+        # Nothing to canonicalize if the player is not present
+        if player is None:
+            return
+        # Canonicalize the player fields
+        self.fields(player)
+        # Canonicalize each of the weapons
+        if isinstance(player.weapons, dict):
+            for weapon in player.weapons.values():
+                self.fields(weapon)
+
+    # Canonicalizes the string fields of the whole game state in place
+    def canonicalize(self, state: GameState):
+        """
+        Replaces the string fields of the game state by enum members and/or
+        interned strings according to the decoding options.
+        :param state: Decoded game state, modified in place
+        """
+        # Canonicalize the flat substructures
+        for obj in [
+            state.provider, state.bomb, state.round, state.phase_countdowns,
+            state.map
+        ]:
+            self.fields(obj)
+        # Canonicalize the round winning history of the map
+        if state.map is not None and isinstance(state.map.round_wins, dict):
+            # Replace by a canonicalized copy
+            state.map.round_wins = {
+                sys.intern(str(key)): self.value(value, RoundWinCondition)
+                for key, value in state.map.round_wins.items()
+            }
+        # Canonicalize the player and all players
+        self.player(state.player)
+        for player in (state.allplayers or {}).values():
+            self.player(player)
+        # Canonicalize all grenades
+        for grenade in (state.grenades or {}).values():
+            self.fields(grenade)
+        # The previous state shares the structure of the game state
+        if state.previously is not None:
+            self.canonicalize(state.previously)
+
+    # Reuses the previously decoded substructure if the raw payload is unchanged
+    @staticmethod
+    def reuse(raw, previous_raw, previous):
+        # Reuse only what has actually been decoded into a substructure
+        if previous is not None and raw == previous_raw:
+            return previous
+        # Keep the raw payload to be decoded
+        return raw
+
+    # Substitutes the unchanged parts of a raw player by the previously decoded
+    # substructures
+    def substitute_player(self, raw, previous_raw, previous: Player):
+        # Nothing to substitute if there is no previous player
+        if previous is None or not isinstance(raw, dict):
+            return raw
+        # The whole player is unchanged
+        if raw == previous_raw:
+            return previous
+        # Collect the substituted fields into a shallow copy of the player
+        raw = dict(raw)
+        # Substitute the state and match statistics
+        for key in ["state", "match_stats"]:
+            if key in raw:
+                raw[key] = self.reuse(
+                    raw[key], previous_raw.get(key), getattr(previous, key)
+                )
+        # Substitute each unchanged weapon of the equipment
+        if isinstance(raw.get("weapons"), dict) and previous.weapons:
+            # Reuse the whole equipment if nothing changed
+            if raw["weapons"] == previous_raw.get("weapons"):
+                raw["weapons"] = previous.weapons
+            # Reuse the weapons at unchanged slots
+            else:
+                raw["weapons"] = {
+                    slot: self.reuse(
+                        weapon,
+                        (previous_raw.get("weapons") or {}).get(slot),
+                        previous.weapons.get(slot)
+                    )
+                    for slot, weapon in raw["weapons"].items()
+                }
+        # Return the substituted player
+        return raw
+
+    # Substitutes the unchanged parts of a raw payload by the substructures of
+    # the previously decoded game state
+    def substitute(self, payload, previous_raw, previous: GameState):
+        """
+        Replaces unchanged parts of the raw payload by the substructures
+        decoded from the previous payload.
+        :param payload: Raw JSON payload dictionary, not modified
+        :param previous_raw: Raw JSON payload decoded previously
+        :param previous: Game state decoded from the previous payload
+        :return: Returns a shallow copy of the payload with the unchanged parts
+            replaced by the previous substructures
+        """
+        # Shallow copy of the payload to insert the reused substructures
+        payload = dict(payload)
+        # Substitute the flat substructures as a whole
+        for key in ["provider", "bomb", "round", "phase_countdowns"]:
+            if key in payload:
+                payload[key] = self.reuse(
+                    payload[key], previous_raw.get(key), getattr(previous, key)
+                )
+        # Substitute the map or its teams and history
+        if isinstance(payload.get("map"), dict) and previous.map is not None:
+            # Raw map of the previous payload
+            previous_map = previous_raw.get("map") or {}
+            # Reuse the whole map if nothing changed
+            if payload["map"] == previous_map:
+                payload["map"] = previous.map
+            # Reuse the unchanged parts
+            else:
+                payload["map"] = {
+                    **payload["map"], **{
+                        key: self.reuse(
+                            payload["map"][key], previous_map.get(key),
+                            getattr(previous.map, key)
+                        )
+                        for key in ["team_t", "team_ct", "round_wins"]
+                        if key in payload["map"]
+                    }
+                }
+        # Substitute the player
+        if "player" in payload:
+            payload["player"] = self.substitute_player(
+                payload["player"], previous_raw.get("player"), previous.player
+            )
+        # Substitute each of all players
+        if isinstance(payload.get("allplayers"), dict):
+            # Raw and decoded previous players keyed by steam ID
+            previous_players = previous_raw.get("allplayers") or {}
+            decoded_players = previous.allplayers or {}
+            # Substitute each player relative to the same steam ID
+            payload["allplayers"] = {
+                key: self.substitute_player(
+                    player, previous_players.get(key), decoded_players.get(key)
+                )
+                for key, player in payload["allplayers"].items()
+            }
+        # Substitute each of the unchanged grenades
+        if isinstance(payload.get("grenades"), dict):
+            # Raw and decoded previous grenades keyed by grenade ID
+            previous_grenades = previous_raw.get("grenades") or {}
+            decoded_grenades = previous.grenades or {}
+            # Reuse each unchanged grenade
+            payload["grenades"] = {
+                key: self.reuse(
+                    grenade, previous_grenades.get(key),
+                    decoded_grenades.get(key)
+                )
+                for key, grenade in payload["grenades"].items()
+            }
+        # Return the substituted payload
+        return payload
@@ -2,13 +2,66 @@
 Counter-Strike Game State Integration Server
 """
 
+# Compare the authentication token in constant time
+import hmac
+# Parse the raw, possibly decompressed, request body
+import json
+# Report failing listeners without failing the request
+import logging
+# Strip the timestamps off the raw payloads to detect duplicates
+import re
 # Run server in separate thread
 import threading
+# Delay the responses under backpressure
+import time
+# Decompress gzip or deflate encoded request bodies
+import zlib
 # HTTP server (endpoint for game state integration POST requests)
-from flask import Flask, request
+from flask import Flask, Response, request
 
-# Top-Level Game State Structure
-from cs_gamestate.structs.gamestate import GameState
+# Decodes raw payloads into the game state structures
+from cs_gamestate.decoder import Decoder
+# Server-sent events stream of game states
+from cs_gamestate.stream import GSIStream
+
+# Timestamp fields in the raw payload, the only part of a heartbeat changing if
+# the game state did not change
+TIMESTAMP = re.compile(rb'"timestamp"\s*:\s*\d+')
+# Logger reporting failing listeners
+logger = logging.getLogger(__name__)
+# Window bits selecting the zlib stream format of each content encoding
+ENCODINGS = {"gzip": 16 + zlib.MAX_WBITS, "deflate": zlib.MAX_WBITS}
+
+
+# Decompresses an encoded request body, bounded by a maximum size to not be
+# blown up by compressed junk
+#   Note: Returns None if the decompressed body exceeds the maximum size
+def decompress(body, encoding, max_size=None):
+    # Stop decompressing one byte beyond the maximum size, zero is unlimited
+    limit = max_size + 1 if max_size is not None else 0
+    # Deflate encoded bodies are supposed to be zlib streams, but some clients
+    # send raw deflate streams instead
+    try:
+        data = zlib.decompressobj(ENCODINGS[encoding]).decompress(body, limit)
+    except zlib.error:
+        # Only retry deflate as raw stream, anything else is invalid
+        if encoding != "deflate":
+            raise
+        data = zlib.decompressobj(-zlib.MAX_WBITS).decompress(body, limit)
+    # Decompressing stopped at the maximum size with input left over
+    if max_size is not None and len(data) > max_size:
+        return None
+    # Return the decompressed body
+    return data
+
+
+# Checks the authentication section of a parsed game state against the token
+def authorized(auth, token: bytes):
+    # The section must contain the token as string
+    if not isinstance(auth, dict) or not isinstance(auth.get("token"), str):
+        return False
+    # Compare in constant time
+    return hmac.compare_digest(auth["token"].encode(), token)
 
 
 # Counter Strike: Game State Integration Server
@@ -20,44 +73,218 @@ class GSIServer:
     """
 
     # Configures game state integration service
-    def __init__(self, path, port):
+    def __init__(
+            self, path, port, stream_path=None, decoder=None, deduplicate=False,
+            token=None, max_size=1 << 20, backpressure=None
+    ):
         """
         Initializes the HTTP server, current game state and thread lock for
         accessing the game state
+        :param path: Path of the endpoint receiving the game states
+        :param port: Port on which the server listens
+        :param stream_path: Optional path under which the received game states
+            are pushed to clients as server-sent events, append "?delta=1" to
+            receive merge patches of the changes instead of full states
+        :param decoder: Decoder used to decode the raw payloads into game
+            states, defaults to decoding without any options
+        :param deduplicate: Acknowledge but otherwise ignore payloads identical
+            to the previous one apart from the timestamp, e.g., heartbeats
+        :param token: Reject requests not carrying this authentication token,
+            see the token option of the GSIConfig, the authentication section
+            is removed from accepted payloads
+        :param max_size: Reject request bodies larger than this number of
+            bytes, None to accept any size
+        :param backpressure: Backpressure delaying the responses to slow down
+            the game while the consumers fall behind, see
+            cs_gamestate.backpressure, None always responds immediately
         """
         # Current game state
         self.state = None
+        # Decoder converting the raw payloads into game state structures
+        self.decoder = decoder if decoder is not None else Decoder()
+        # Suppress duplicate payloads by comparing fingerprints of the raw body
+        self.deduplicate = deduplicate
+        # Fingerprint of the previous payload
+        self.fingerprint = None
+        # Number of duplicate payloads suppressed so far
+        self.suppressed = 0
+        # Expected authentication token as raw bytes, None accepts any request
+        self.token = token.encode() if token is not None else None
+        # Maximum size of request bodies in bytes
+        self.max_size = max_size
+        # Number of requests rejected so far by status code
+        self.rejected = {}
+        # Number of listener calls which raised an exception so far
+        self.failed = 0
+        # Optional backpressure controlling the update rate of the game
+        self.backpressure = backpressure
         # Thread lock to synchronize access to the game state
         self.lock = threading.Lock()
+        # Callbacks receiving each raw game state payload as soon as it has been
+        # received
+        self.listeners = []
+        # Optional server-sent events stream of the received game states
+        self.stream = None
+        # Stream the game states to clients if requested
+        if stream_path is not None:
+            # Publish each received game state to the stream
+            self.stream = GSIStream()
+            self.add_listener(self.stream.publish)
 
         # Server thread running Flask in the background
         def server():
             # Setup flask http service
             _server = Flask(__name__)
+            # Limit the size of request bodies, including those without
+            # content length header
+            _server.config["MAX_CONTENT_LENGTH"] = self.max_size
+
+            # Rejects a request with the status code without further processing
+            def reject(status, reason):
+                # Count the rejected request
+                with self.lock:
+                    self.rejected[status] = self.rejected.get(status, 0) + 1
+                # Short plain text response
+                return Response(reason, status=status, mimetype="text/plain")
+
+            # Tests whether the raw body is a duplicate of the previous one,
+            # counting the suppressed duplicates
+            def duplicate(body):
+                # Hash the raw body without the timestamps
+                fingerprint = hash(TIMESTAMP.sub(b"", body))
+                # Lock access to the fingerprint
+                with self.lock:
+                    # Same as the previous payload: Count as suppressed
+                    if fingerprint == self.fingerprint:
+                        self.suppressed += 1
+                        return True
+                    # Remember the fingerprint of the new payload
+                    self.fingerprint = fingerprint
+                    return False
 
             # Handle HTTP POST request to the specified path
             @_server.route(path, methods=['POST'])
             def post():
-                # Lock access to the game state
-                with self.lock:
-                    # Interpret request as json and write to wrapping object
-                    self.state = request.get_json()
+                # Reject oversized requests by their header before reading
+                if self.max_size is not None and (
+                        request.content_length or 0
+                ) > self.max_size:
+                    return reject(413, "Payload Too Large")
+                # Raw body of the request
+                body = request.get_data(cache=False)
+                # Decompress gzip or deflate encoded bodies
+                encoding = request.content_encoding
+                if encoding:
+                    # Only gzip and deflate are supported
+                    if encoding not in ENCODINGS:
+                        return reject(415, "Unsupported Media Type")
+                    # Corrupt compressed bodies are not acceptable
+                    try:
+                        body = decompress(body, encoding, self.max_size)
+                    except zlib.error:
+                        return reject(400, "Bad Request")
+                    # Reject bodies which decompress beyond the maximum size
+                    if body is None:
+                        return reject(413, "Payload Too Large")
+                # Detect duplicates before parsing the payload, unless the
+                # payload needs to be authenticated first
+                if self.deduplicate and self.token is None and duplicate(body):
+                    # Send response without parsing or notifying
+                    return 'OK'
+                # Interpret request as json, reject anything else
+                try:
+                    payload = json.loads(body)
+                except ValueError:
+                    return reject(400, "Bad Request")
+                # Game states are JSON objects, forwarders send batches of game
+                # states as JSON lists
+                payloads = payload if isinstance(payload, list) else [payload]
+                # Anything else is not a game state
+                if not payloads or not all(
+                        isinstance(p, dict) for p in payloads
+                ):
+                    return reject(400, "Bad Request")
+                # Validate the authentication token of each game state
+                if self.token is not None:
+                    # Remove the authentication section of each game state, the
+                    # token is not passed on to the listeners and readers
+                    tokens = [p.pop("auth", None) for p in payloads]
+                    # Each game state of a batch must carry the token
+                    if not all(authorized(t, self.token) for t in tokens):
+                        return reject(401, "Unauthorized")
+                    # Only authenticated payloads may count as duplicates
+                    if self.deduplicate and duplicate(body):
+                        return 'OK'
+                # Deliver the game states in order
+                for payload in payloads:
+                    # Lock access to the game state
+                    with self.lock:
+                        # Write to wrapping object
+                        self.state = payload
+                    # Notify all listeners of the new game state
+                    for listener in self.listeners:
+                        # Listeners run in the server thread, before the game
+                        # receives the response
+                        try:
+                            listener(payload)
+                        # A failing listener, e.g., failing to decode an
+                        # unexpected payload, must neither fail the request
+                        # nor keep the other listeners from being notified
+                        except Exception:  # noqa: Any listener error
+                            # Count and report the failure
+                            with self.lock:
+                                self.failed += 1
+                            logger.exception("Listener %r failed", listener)
+                # The game does not send again before the response, delay it
+                # while the consumers fall behind
+                if self.backpressure is not None:
+                    delay = self.backpressure.delay()
+                    if delay > 0:
+                        time.sleep(delay)
                 # Send response
                 return 'OK'
 
+            # Handle HTTP GET request of clients subscribing to the stream
+            if self.stream is not None:
+                # Register the stream under the specified path
+                @_server.route(stream_path, methods=['GET'])
+                def stream():
+                    # Optionally send merge patches of the changes
+                    delta = request.args.get("delta", "0") not in {"0", ""}
+                    # Stream server-sent events until the client disconnects
+                    return Response(
+                        self.stream.events(delta=delta),
+                        mimetype="text/event-stream",
+                        headers={"Cache-Control": "no-cache"}
+                    )
+
             # Run the flask service listening on the specified port
             _server.run(port=port)
 
         # Create and start server thread
         threading.Thread(target=server, daemon=True).start()
 
+    # Registers a callback to be notified of each received game state
+    def add_listener(self, listener):
+        """
+        Registers a callback receiving each raw game state payload.
+        :param listener: Callable receiving the raw JSON payload dictionary,
+            called in the server thread before responding to the game,
+            exceptions are logged and counted in failed but do not fail the
+            request
+        """
+        # Append to the list of listeners notified by the server thread
+        self.listeners.append(listener)
+
     # Reads the current game state if available
-    def read(self, reset=False, block=False):
+    def read(self, reset=False, block=False, decode=True):
         """
         Reads the current game state.
         :param reset: Reset the state to None after the access
         :param block: Block while there is no game state
-        :return: Returns the current game state as a GameState object
+        :param decode: Decode the raw JSON payload into a GameState object
+        :return: Returns the current game state as a GameState object or as
+            the raw JSON payload dictionary if decoding is disabled
         """
         # Wait for new current state
         while block and not self.state:
@@ -70,5 +297,8 @@ class GSIServer:
             self.state = None
             # Release access to the game state
             self.lock.release()
+        # Optionally skip decoding and return the raw payload
+        if not decode:
+            return state
         # Return the current state
-        return GameState(**state)
+        return self.decoder.decode(state)
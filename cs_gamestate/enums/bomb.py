@@ -1,9 +1,9 @@
-# Generic enumeration types
-from enum import Enum
+# Enumeration of string values
+from cs_gamestate.enums.utils import StrEnum
 
 
 # Known bomb states and their string representation
-class BombState(Enum):
+class BombState(StrEnum):
     CARRIED = "carried"
     DROPPED = "dropped"
     PLANTING = "planting"
@@ -1,9 +1,9 @@
-# Generic enumeration types
-from enum import Enum
+# Enumeration of string values
+from cs_gamestate.enums.utils import StrEnum
 
 
 # Known internal weapon names and their string representation
-class WeaponName(Enum):
+class WeaponName(StrEnum):
     C4 = "weapon_c4"
     KNIFE = "weapon_knife"
     KNIFE_T = "weapon_knife_t"
@@ -56,7 +56,7 @@ class WeaponName(Enum):
 
 
 # Weapon types and their string representation
-class WeaponType(Enum):
+class WeaponType(StrEnum):
     PISTOL = "Pistol"
     KNIFE = "Knife"
     RIFLE = "Rifle"
@@ -70,14 +70,14 @@ class WeaponType(Enum):
 
 
 # Possible weapon states
-class WeaponState(Enum):
+class WeaponState(StrEnum):
     ACTIVE = "active"
     HOLSTERED = "holstered"
     RELOADING = "reloading"
 
 
 # Known grenade types and their string representation
-class GrenadeType(Enum):
+class GrenadeType(StrEnum):
     DECOY = "decoy"
     HEGRENADE = "frag"
     FLASHBANG = "flashbang"
@@ -1,9 +1,9 @@
-# Generic enumeration types
-from enum import Enum
+# Enumeration of string values
+from cs_gamestate.enums.utils import StrEnum
 
 
 # Known map phases and their string representation
-class MapPhase(Enum):
+class MapPhase(StrEnum):
     WARMUP = "warmup"
     LIVE = "live"
     INTERMISSION = "intermission"
@@ -11,7 +11,7 @@ class MapPhase(Enum):
 
 
 # Known game modes and their string representation
-class GameMode(Enum):
+class GameMode(StrEnum):
     COMPETITIVE = "competitive"
     CASUAL = "casual"
     DEATHMATCH = "deathmatch"
@@ -19,7 +19,7 @@ class GameMode(Enum):
 
 
 # Known round winning conditions and their string representation
-class RoundWinCondition(Enum):
+class RoundWinCondition(StrEnum):
     CT_WIN_ELIMINATION = "ct_win_elimination"
     T_WIN_ELIMINATION = "t_win_elimination"
     CT_WIN_DEFUSE = "ct_win_defuse"
@@ -1,9 +1,9 @@
-# Generic enumeration types
-from enum import Enum
+# Enumeration of string values
+from cs_gamestate.enums.utils import StrEnum
 
 
 # Known phases and their string representation
-class Phase(Enum):
+class Phase(StrEnum):
     FREEZETIME = "freezetime"
     LIVE = "live"
     OVER = "over"
@@ -1,9 +1,9 @@
-# Generic enumeration types
-from enum import Enum
+# Enumeration of string values
+from cs_gamestate.enums.utils import StrEnum
 
 
 # Known player activities and their string represnetation
-class PlayerActivity(Enum):
+class PlayerActivity(StrEnum):
     PLAYING = "playing"
     MENU = "menu"
     TEXTINPUT = "textinput"
@@ -1,9 +1,9 @@
-# Generic enumeration types
-from enum import Enum
+# Enumeration of string values
+from cs_gamestate.enums.utils import StrEnum
 
 
 # Known round phases and their string representation
-class RoundPhase(Enum):
+class RoundPhase(StrEnum):
     FREEZETIME = "freezetime"
     LIVE = "live"
     OVER = "over"
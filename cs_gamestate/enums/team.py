@@ -1,8 +1,8 @@
-# Generic enumeration types
-from enum import Enum
+# Enumeration of string values
+from cs_gamestate.enums.utils import StrEnum
 
 
 # Teams and their string represnetation
-class TeamName(Enum):
+class TeamName(StrEnum):
     T = "T"
     CT = "CT"
@@ -0,0 +1,11 @@
+# Generic enumeration types
+from enum import Enum
+
+
+# Enumeration of string values, where members are strings themselves, i.e., they
+# compare, hash, format and serialize exactly like their value
+#   Note: Similar to enum.StrEnum which is only available since python 3.11
+class StrEnum(str, Enum):
+    # Format and convert to string as the plain value
+    __str__ = str.__str__
+    __format__ = str.__format__
@@ -0,0 +1,142 @@
+"""
+Counter-Strike Game State Integration Process Pool Decoding
+"""
+
+# Parse raw JSON text within the worker processes
+import json
+# Keep the pending decoding results of each feed in order
+from collections import defaultdict, deque
+# Distribute decoding and verification over multiple processes
+from concurrent.futures import ProcessPoolExecutor
+# Bind the same options to each of the mapped game states
+from itertools import repeat
+
+# Top-Level Game State Structure
+from cs_gamestate.structs.gamestate import GameState
+
+
+# Decodes and optionally verifies a single raw game state within a worker
+#   Note: Must be a module level function to be pickled to the workers
+def decode(payload, verify=False, states=True):
+    """
+    Decodes and optionally verifies a raw game state.
+    :param payload: Raw JSON payload as dictionary or as JSON text
+    :param verify: Verify the game state and return the messages
+    :param states: Return the decoded game state, otherwise only the
+        verification messages are returned to the calling process
+    :return: Returns a tuple of the GameState (or None) and the list of
+        verification messages (or None)
+    """
+    # Raw JSON text is parsed within the worker as well
+    if isinstance(payload, (str, bytes, bytearray)):
+        payload = json.loads(payload)
+    # Decode the game state structure
+    state = GameState(**payload)
+    # Optionally verify the game state
+    messages = state.verify() if verify else None
+    # Only send back what has been requested, transferring the game state back
+    # to the calling process is expensive
+    return state if states else None, messages
+
+
+# Pool of worker processes decoding game states of multiple feeds in parallel
+class DecodePool:
+    """
+    Distributes decoding and verification of game states received from
+    multiple feeds over a pool of worker processes, delivering the results of
+    each feed in the order the game states have been submitted.
+    """
+
+    # Configures the worker processes
+    def __init__(self, workers=None, verify=False, states=True):
+        """
+        Initializes the process pool.
+        :param workers: Number of worker processes, defaults to the number of
+            processors
+        :param verify: Verify each game state
+        :param states: Return the decoded game states, disable to only receive
+            verification messages which is much cheaper to transfer
+        """
+        # Pool of worker processes
+        self.executor = ProcessPoolExecutor(workers)
+        # Options passed to each decoding task
+        self.verify, self.states = verify, states
+        # Queue of pending futures of each feed in submission order
+        self.pending = defaultdict(deque)
+
+    # Attaches the pool to an endpoint server feeding game states
+    def attach(self, server, feed):
+        """
+        Submits each game state received by the server to the pool.
+        :param server: GSIServer receiving the game states of the feed
+        :param feed: Identifier of the feed to read the results from
+        """
+        # Submit each raw payload received by the server
+        server.add_listener(lambda payload: self.submit(feed, payload))
+
+    # Submits a game state of a feed for decoding
+    def submit(self, feed, payload):
+        """
+        Submits a raw game state to be decoded by a worker.
+        :param feed: Identifier of the feed the game state belongs to
+        :param payload: Raw JSON payload as dictionary or as JSON text, the
+            latter being cheaper to transfer to the workers
+        :return: Returns the future of the decoding result
+        """
+        # Schedule the decoding task on the pool
+        future = self.executor.submit(decode, payload, self.verify, self.states)
+        # Keep the future in submission order of the feed
+        self.pending[feed].append(future)
+        # Return the future to optionally wait on
+        return future
+
+    # Collects the finished results of a feed in submission order
+    def results(self, feed, block=False):
+        """
+        Collects the results of a feed which are ready, in submission order.
+        :param feed: Identifier of the feed
+        :param block: Wait for all pending game states of the feed
+        :return: Returns a list of (GameState, messages) tuples, stops at the
+            first result not ready yet to preserve the order
+        """
+        # Pending futures of the feed
+        pending = self.pending[feed]
+        # Collect the results in order
+        results = []
+        # Take results from the front as long as they are done
+        while pending and (block or pending[0].done()):
+            results.append(pending.popleft().result())
+        # Return the ordered results
+        return results
+
+    # Decodes a batch of game states, e.g., from a recording
+    def map(self, payloads, chunksize=64):
+        """
+        Decodes a batch of raw game states in parallel.
+        :param payloads: Iterable of raw JSON payloads
+        :param chunksize: Number of game states sent to a worker at once,
+            amortizing the communication overhead
+        :return: Returns an iterator of (GameState, messages) tuples in input
+            order
+        """
+        # Distribute the payloads in chunks over the workers, binding the
+        # options to each of the payloads
+        return self.executor.map(
+            decode, payloads, repeat(self.verify), repeat(self.states),
+            chunksize=chunksize
+        )
+
+    # Shuts down the worker processes
+    def close(self):
+        """
+        Waits for pending tasks and shuts down the worker processes.
+        """
+        self.executor.shutdown()
+
+    # Enter context, the pool is already started
+    def __enter__(self):
+        return self
+
+    # Exit context shutting down the pool
+    def __exit__(self, *args):
+        self.close()
@@ -0,0 +1,523 @@
+"""
+Counter-Strike Game State Integration Compressing Relay and Batching Forwarder
+"""
+
+# Compress the forwarded game states
+import gzip
+import zlib
+# HTTP connection to the remote endpoint, reused if kept alive
+import http.client
+# Serialize the forwarded game states
+import json
+# Spool undelivered batches to disk
+import os
+# Run the forwarding in a separate thread
+import threading
+# Measure the forwarding rates
+import time
+# Bounded queue dropping the oldest game states if the remote is too slow
+from collections import deque
+# Split the remote address into host, port and path
+from urllib.parse import urlsplit
+
+
+# Compresses a raw body with the content encoding
+def compress(body: bytes, encoding: str, level: int = 6) -> bytes:
+    # Gzip without timestamp to produce the same output for the same input
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=level, mtime=0)
+    # Deflate as zlib stream
+    if encoding == "deflate":
+        return zlib.compress(body, level)
+    # No encoding: Send the raw body
+    return body
+
+
+# Whether the remote accepted a body by the status code of the response, None
+# if the remote could not be reached
+def accepted(status) -> bool:
+    return status is not None and status < 400
+
+
+# Whether a body not accepted might be accepted later: Connection failures and
+# server errors are temporary, client errors, e.g., 413 Payload Too Large,
+# reject the body for good
+def temporary(status) -> bool:
+    return status is None or status >= 500
+
+
+# Parses the number of game states, the raw size and the content encoding from
+# the file name of a spooled batch, None if not the name of a spooled batch,
+# e.g., temporary, rejected or foreign files
+def parse_spooled(name: str) -> tuple[int, int, str] | None:
+    # Names are made of the time, the count, the size and the encoding
+    try:
+        stem, encoding = name.split(".")
+        _, count, size = stem.split("-")
+        count, size = int(count), int(size)
+    except ValueError:
+        return None
+    # Only content encodings written by the forwarder
+    if encoding not in {"gzip", "deflate", "identity"}:
+        return None
+    # Return the information encoded in the name
+    return count, size, encoding
+
+
+# HTTP connection posting to a remote endpoint, reused as long as the remote
+# keeps it alive, reconnecting if the connection breaks
+class _Remote:
+    # Sets up the connection parameters, connects lazily
+    def __init__(self, url, timeout):
+        # Address of the remote endpoint
+        parts = urlsplit(url)
+        # Secure connections if requested by the address
+        self.cls = (
+            http.client.HTTPSConnection if parts.scheme == "https"
+            else http.client.HTTPConnection
+        )
+        # Host, port and path of the remote endpoint
+        self.host, self.port = parts.hostname, parts.port
+        self.path = parts.path or "/"
+        # Timeout of connecting and each request
+        self.timeout = timeout
+        # Connection reused for all requests, None if not connected
+        self.connection = None
+
+    # Posts a body to the remote endpoint and returns the status code
+    def post(self, body: bytes, headers: dict) -> int:
+        # A reused connection broken before the request went out is retried
+        # once on a new connection
+        for attempt in range(2):
+            # Connect if there is no connection yet
+            if self.connection is None:
+                self.connection = self.cls(
+                    self.host, self.port, timeout=self.timeout
+                )
+            # Send the request
+            try:
+                self.connection.request("POST", self.path, body, headers)
+            # Connection broken, refused or timed out before the remote could
+            # have received the request
+            except (OSError, http.client.HTTPException):
+                # Drop the connection to reconnect on the next attempt
+                self.close()
+                # Give up after the second attempt
+                if attempt:
+                    raise
+                continue
+            # Read the complete response to be able to reuse the connection,
+            # never resend once the request went out, the remote might have
+            # received it already and the post is not idempotent
+            try:
+                response = self.connection.getresponse()
+                response.read()
+            # Connection broken or timed out waiting for the response
+            except (OSError, http.client.HTTPException):
+                self.close()
+                raise
+            # The remote closes the connection after this response
+            if response.will_close:
+                self.close()
+            # Return the status code of the response
+            return response.status
+        # Not reached, the loop either returns or raises
+        raise ConnectionError("Failed to post to the remote endpoint")
+
+    # Closes the connection, if connected
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+
+# Relays the game states received by an endpoint server to a remote endpoint,
+# compressing each game state
+class GSIRelay:
+    """
+    Forwards each game state received by a local endpoint server to a remote
+    endpoint, compressing the request bodies to save bandwidth, e.g., when
+    the endpoint is not on the game machine.
+    """
+
+    # Sets up the connection and starts forwarding in the background
+    def __init__(
+            self, url, server=None, encoding="gzip", level=6, token=None,
+            maxsize=16, timeout=5.0
+    ):
+        """
+        Initializes the relay.
+        :param url: Address of the remote endpoint including port and path
+        :param server: Optional endpoint server to forward the game states of
+        :param encoding: Content encoding of the forwarded game states: "gzip",
+            "deflate" or None to not compress at all
+        :param level: Compression level from 1 (fastest) to 9 (smallest)
+        :param token: Authentication token to insert into each forwarded game
+            state, e.g., if the local server removed it
+        :param maxsize: Maximum number of game states waiting to be forwarded,
+            the oldest are dropped if the remote cannot keep up
+        :param timeout: Timeout in seconds of the requests to the remote
+        """
+        # Compression options
+        self.encoding, self.level = encoding, level
+        # Authentication section inserted into the game states
+        self.auth = {"token": token} if token is not None else None
+        # Connection to the remote endpoint
+        self.remote = _Remote(url, timeout)
+        # Bounded queue of game states not forwarded yet
+        self.payloads = deque(maxlen=maxsize)
+        # Condition to wait for new game states
+        self.condition = threading.Condition()
+        # Flag indicating whether the relay is still running
+        self.running = True
+        # Start of the measurement of the forwarding rates
+        self.start = time.monotonic()
+        # Number of game states forwarded, failed, dropped and rejected by the
+        # remote for good
+        self.sent, self.failed, self.dropped, self.rejected = 0, 0, 0, 0
+        # Number of bytes before and after compression of the forwarded game
+        # states
+        self.raw_bytes, self.sent_bytes = 0, 0
+        # Forward each game state received by the server
+        if server is not None:
+            server.add_listener(self.publish)
+        # Forward in the background to never block the server
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    # Enqueues a raw game state payload to be forwarded
+    def publish(self, payload: dict):
+        """
+        Enqueues the game state to be forwarded, never blocks.
+        :param payload: Raw JSON payload dictionary
+        """
+        # Lock access to the queue and wake up the forwarding thread
+        with self.condition:
+            # Count the oldest game state dropped by appending to a full queue
+            if len(self.payloads) == self.payloads.maxlen:
+                self.dropped += 1
+            self.payloads.append(payload)
+            self.condition.notify()
+
+    # Serializes and compresses a payload into the request body
+    def encode(self, payload) -> tuple[bytes, bytes]:
+        """
+        Serializes and compresses the payload.
+        :param payload: JSON serializable payload
+        :return: Tuple of the raw and the compressed body
+        """
+        # Compact JSON, the game itself sends indented JSON
+        raw = json.dumps(payload, separators=(",", ":")).encode()
+        # Compress according to the content encoding
+        return raw, compress(raw, self.encoding, self.level)
+
+    # Sends a request body to the remote endpoint
+    def send(
+            self, body: bytes, size: int, count: int = 1,
+            encoding: str = None, count_failed: bool = True
+    ) -> int | None:
+        """
+        Posts the compressed body to the remote endpoint.
+        :param body: Compressed body
+        :param size: Size of the raw body, only to account for the bytes saved
+        :param count: Number of game states contained in the body
+        :param encoding: Content encoding of the body if it differs from the
+            configured encoding, e.g., of spooled bodies, "identity" if not
+            compressed at all
+        :param count_failed: Whether to count the game states as failed if the
+            remote does not accept the body temporarily, e.g., not for retries
+        :return: Status code of the response, None if the remote could not be
+            reached
+        """
+        # Content encoding of the body, the configured one by default
+        encoding = encoding or self.encoding
+        # Headers announcing the JSON content and its encoding
+        headers = {"Content-Type": "application/json"}
+        if encoding not in {None, "identity"}:
+            headers["Content-Encoding"] = encoding
+        # Post the body, connection failures are counted as failures as well
+        try:
+            status = self.remote.post(body, headers)
+        except (OSError, http.client.HTTPException):
+            status = None
+        # Account for the forwarded bytes
+        if accepted(status):
+            self.sent += count
+            self.raw_bytes += size
+            self.sent_bytes += len(body)
+        # Count the game states failed temporarily
+        elif temporary(status):
+            if count_failed:
+                self.failed += count
+        # Count the game states rejected for good
+        else:
+            self.rejected += count
+        # Return the status code of the response
+        return status
+
+    # Forwards the queued game states until closed
+    def run(self):
+        # Forward until the relay is closed
+        while self.running:
+            # Wait for the next game state
+            with self.condition:
+                self.condition.wait_for(
+                    lambda: self.payloads or not self.running
+                )
+                # Closed while waiting
+                if not self.payloads:
+                    break
+                payload = self.payloads.popleft()
+            # Insert the authentication section
+            if self.auth is not None:
+                payload = {**payload, "auth": self.auth}
+            # Compress and forward the game state
+            raw, body = self.encode(payload)
+            self.send(body, len(raw))
+        # Release the connection
+        self.remote.close()
+
+    # Summarizes the forwarding rates since the start
+    def stats(self) -> dict:
+        """
+        Summarizes the forwarded game states and bytes.
+        :return: Dictionary of the counts, the raw and sent bytes per second
+            and the ratio of the bytes saved by compression
+        """
+        # Time since the start of the measurement
+        elapsed = max(time.monotonic() - self.start, 1e-9)
+        # Collect the statistics
+        return {
+            "sent": self.sent, "failed": self.failed, "dropped": self.dropped,
+            "rejected": self.rejected, "raw_rate": self.raw_bytes / elapsed,
+            "sent_rate": self.sent_bytes / elapsed,
+            "saved": 1 - self.sent_bytes / self.raw_bytes
+            if self.raw_bytes else 0.0,
+        }
+
+    # Stops forwarding
+    def close(self):
+        """
+        Stops the forwarding thread after the game state currently forwarded.
+        """
+        # Wake up the forwarding thread to terminate
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+        # Wait for the forwarding thread to release the connection
+        self.thread.join()
+
+
+# Forwards the game states received by an endpoint server to a remote collector
+# in compressed batches, spooling batches to disk while the collector is down
+class GSIForwarder(GSIRelay):
+    """
+    Forwards the game states received by a local endpoint server to a remote
+    collector endpoint in batches, i.e., JSON lists of game states, reducing
+    the requests from one per game state to one per batch. Batches failing to
+    be delivered are spooled to disk and delivered in order once the collector
+    is reachable again, batches rejected by the collector for good are not
+    retried but kept aside in the spool directory.
+    """
+
+    # Sets up batching and spooling and starts forwarding in the background
+    def __init__(
+            self, url, server=None, batch_size=32, window=1.0, spool=None,
+            encoding="gzip", level=6, token=None, maxsize=1024, timeout=5.0,
+            batch_bytes=1 << 20
+    ):
+        """
+        Initializes the forwarder.
+        :param url: Address of the remote collector including port and path
+        :param server: Optional endpoint server to forward the game states of
+        :param batch_size: Maximum number of game states per batch
+        :param window: Maximum time in seconds to wait for a batch to fill up
+            after its first game state has been received
+        :param spool: Directory to spool undelivered batches to, None drops
+            undelivered batches
+        :param encoding: Content encoding of the batches: "gzip", "deflate" or
+            None to not compress at all
+        :param level: Compression level from 1 (fastest) to 9 (smallest)
+        :param token: Authentication token to insert into each forwarded game
+            state
+        :param maxsize: Maximum number of game states waiting to be batched,
+            the oldest are dropped if forwarding cannot keep up
+        :param timeout: Timeout in seconds of the requests to the collector
+        :param batch_bytes: Maximum size of the uncompressed batches in bytes,
+            should not exceed the max_size of the collector, larger batches are
+            split
+        """
+        # Batching options, set before the forwarding thread starts
+        self.batch_size, self.window = batch_size, window
+        self.batch_bytes = batch_bytes
+        # Directory of the spooled batches, created if not present
+        self.spool = spool
+        if spool is not None:
+            os.makedirs(spool, exist_ok=True)
+        # Number of batches delivered and currently spooled, including those
+        # left over from before
+        self.batches, self.spooled = 0, 0
+        if spool is not None:
+            self.spooled = sum(
+                parse_spooled(name) is not None for name in os.listdir(spool)
+            )
+        # Set up the connection and start forwarding
+        super().__init__(url, server, encoding, level, token, maxsize, timeout)
+
+    # Takes the next batch of game states from the queue
+    def collect(self) -> list[dict]:
+        # Lock access to the queue
+        with self.condition:
+            # Wait for the first game state of the batch
+            self.condition.wait_for(lambda: self.payloads or not self.running)
+            # Closed while waiting without anything left to forward
+            if not self.payloads:
+                return []
+            # Wait for the batch to fill up until the window closes
+            deadline = time.monotonic() + self.window
+            while len(self.payloads) < self.batch_size and self.running:
+                # Time left until the window closes
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                # Woken up by each new game state
+                self.condition.wait(remaining)
+            # Take up to one batch from the queue
+            count = min(len(self.payloads), self.batch_size)
+            return [self.payloads.popleft() for _ in range(count)]
+
+    # Serializes and compresses a batch, split into parts not exceeding the
+    # maximum size
+    def split(self, batch: list[dict]):
+        """
+        Serializes and compresses the batch, halving it until the parts do not
+        exceed the maximum size, a single oversized game state is not split.
+        :param batch: List of game state payloads
+        :return: Generator of the number of game states, the raw and the
+            compressed body of each part, in order
+        """
+        # Compact JSON of the whole batch
+        raw = json.dumps(batch, separators=(",", ":")).encode()
+        # Split oversized batches in halves, the collector would reject them
+        if len(raw) > self.batch_bytes and len(batch) > 1:
+            half = len(batch) // 2
+            yield from self.split(batch[:half])
+            yield from self.split(batch[half:])
+        # Compress according to the content encoding
+        else:
+            yield len(batch), raw, compress(raw, self.encoding, self.level)
+
+    # Writes an undelivered batch to the spool directory
+    def store(self, body: bytes, size: int, count: int, rejected=False):
+        """
+        Spools a batch to be delivered later or keeps aside a rejected batch.
+        :param body: Compressed body of the batch
+        :param size: Size of the raw body
+        :param count: Number of game states contained in the batch
+        :param rejected: Whether the collector rejected the batch for good,
+            kept aside with the suffix ".rejected" and never retried
+        """
+        # Count the game states as failed once, retries of the spooled batch
+        # are not counted again, rejected ones have been counted by send
+        if not rejected:
+            self.failed += count
+        # Nothing to store without spool directory: The batch is lost
+        if self.spool is None:
+            return
+        # File names sort in the order of the batches and carry the number of
+        # game states and the raw size for accounting and the content encoding
+        # of the batch as suffix
+        encoding = self.encoding or "identity"
+        name = f"{time.time_ns():020d}-{count}-{size}.{encoding}"
+        # Rejected batches are kept aside for inspection
+        if rejected:
+            name += ".rejected"
+        # Write to a temporary file first, never leave partial batches behind
+        path = os.path.join(self.spool, name)
+        with open(path + ".tmp", "wb") as file:
+            file.write(body)
+        os.replace(path + ".tmp", path)
+        # Count the spooled batch
+        if not rejected:
+            self.spooled += 1
+
+    # Delivers the spooled batches in order
+    def flush(self) -> bool:
+        """
+        Delivers the spooled batches, oldest first.
+        :return: True if all spooled batches have been delivered
+        """
+        # Nothing spooled without spool directory
+        if self.spool is None:
+            return True
+        # Deliver each spooled batch in order
+        for name in sorted(os.listdir(self.spool)):
+            # Number of game states, raw size and content encoding encoded in
+            # the file name, the batch may have been spooled with another
+            # encoding than the current one
+            spooled = parse_spooled(name)
+            # Skip temporary, rejected and foreign files
+            if spooled is None:
+                continue
+            count, size, encoding = spooled
+            # Read the compressed batch
+            path = os.path.join(self.spool, name)
+            with open(path, "rb") as file:
+                body = file.read()
+            # Its game states have been counted as failed when spooled
+            status = self.send(body, size, count, encoding, False)
+            # Stop at the first batch failing again, keeping the order
+            if temporary(status):
+                return False
+            # Delivered: Remove from the spool
+            if accepted(status):
+                os.remove(path)
+                self.batches += 1
+            # Rejected for good: Keep aside, never retry
+            else:
+                os.replace(path, path + ".rejected")
+            self.spooled -= 1
+        # All spooled batches have been delivered
+        return True
+
+    # Forwards the queued game states in batches until closed
+    def run(self):
+        # Forward until closed and nothing is left to forward
+        while True:
+            # Take the next batch, empty if closed
+            batch = self.collect()
+            if not batch:
+                break
+            # Insert the authentication section into each game state
+            if self.auth is not None:
+                batch = [{**payload, "auth": self.auth} for payload in batch]
+            # Serialize and compress the batch as JSON lists not exceeding the
+            # maximum size
+            for count, raw, body in self.split(batch):
+                # Deliver the spooled batches first to keep the order, then
+                # this batch
+                status = self.send(
+                    body, len(raw), count, count_failed=False
+                ) if self.flush() else None
+                # Delivered
+                if accepted(status):
+                    self.batches += 1
+                # Spool the batch if anything failed, counting it as failed,
+                # or keep it aside if rejected for good
+                else:
+                    self.store(body, len(raw), count, not temporary(status))
+        # Release the connection
+        self.remote.close()
+
+    # Summarizes the forwarding rates and the batches since the start
+    def stats(self) -> dict:
+        """
+        Summarizes the forwarded game states, batches and bytes.
+        :return: Dictionary of the counts, including the delivered and the
+            currently spooled batches, the raw and sent bytes per second and
+            the ratio of the bytes saved by compression
+        """
+        return {
+            **super().stats(), "batches": self.batches,
+            "spooled": self.spooled,
+        }
@@ -0,0 +1,160 @@
+"""
+Counter-Strike Game State Integration Server-Sent Events Stream
+"""
+
+# Serialize the game states for the clients
+import json
+# Synchronize the publishing and the streaming threads
+import threading
+
+
+# Computes the JSON merge patch (RFC 7386) of fields changed in this game state
+# according to the "previously" and "added" change information
+def merge_patch(payload, previously, added):
+    # Collect the patch into a new dictionary
+    patch = {}
+    # Run over the fields changed or added in this game state
+    for key in {*(previously or {}), *(added or {})}:
+        # Change information of this field
+        before = (previously or {}).get(key)
+        after = (added or {}).get(key)
+        # The field has been removed in this game state
+        if key not in payload:
+            patch[key] = None
+        # Change information of nested structures is resolved recursively
+        elif isinstance(payload[key], dict) and (
+                isinstance(before, dict) or isinstance(after, dict)
+        ):
+            patch[key] = merge_patch(
+                payload[key],
+                before if isinstance(before, dict) else None,
+                after if isinstance(after, dict) else None
+            )
+        # Anything else is replaced by the current value
+        else:
+            patch[key] = payload[key]
+    # Return the merge patch
+    return patch
+
+
+# Single update published to the stream, serialized lazily and only once for
+# all clients
+class _Update:
+    # Keeps the raw payload of the update
+    def __init__(self, version, payload):
+        # Sequence number of the update
+        self.version = version
+        # Raw game state payload
+        self.payload = payload
+        # Lazily serialized events, shared by all clients
+        self.events = {}
+        # Lock to serialize each event only once
+        self.lock = threading.Lock()
+
+    # Serializes the update as a server-sent event, either the full state or
+    # the merge patch relative to the previous update
+    def event(self, kind):
+        # Serialize only once, the first client doing so wins
+        with self.lock:
+            # Event not serialized yet
+            if kind not in self.events:
+                # The delta is the merge patch of the changes, stripped of the
+                # change information itself
+                if kind == "delta":
+                    data = merge_patch(
+                        self.payload, self.payload.get("previously"),
+                        self.payload.get("added")
+                    )
+                # The full state is the complete payload
+                else:
+                    data = self.payload
+                # Format as server-sent event with compact JSON data
+                self.events[kind] = (
+                    f"id: {self.version}\nevent: {kind}\n"
+                    f"data: {json.dumps(data, separators=(',', ':'))}\n\n"
+                )
+            # Return the serialized event
+            return self.events[kind]
+
+
+# Server-sent events stream of the game states received by the endpoint
+class GSIStream:
+    """
+    Pushes the game states received by the endpoint server to any number of
+    connected clients as server-sent events, coalescing updates for clients
+    which cannot keep up.
+    """
+
+    # Sets up the latest update and the condition to wait for the next one
+    def __init__(self, keepalive=15.0):
+        """
+        Initializes the stream without any update.
+        :param keepalive: Interval in seconds of keepalive comments sent to
+            clients while there are no updates
+        """
+        # Latest published update, clients only ever see the latest one
+        self.latest = None
+        # Condition to wait for new updates
+        self.condition = threading.Condition()
+        # Interval of keepalive comments
+        self.keepalive = keepalive
+        # Number of currently connected clients
+        self.clients = 0
+
+    # Publishes a raw game state payload to all clients
+    def publish(self, payload: dict):
+        """
+        Replaces the latest update and wakes up all clients, never blocks on
+        the clients.
+        :param payload: Raw JSON payload dictionary
+        """
+        # Replace the latest update and wake up waiting clients
+        with self.condition:
+            # Continue the sequence of versions
+            version = self.latest.version + 1 if self.latest else 0
+            # Wrap the payload to be serialized lazily
+            self.latest = _Update(version, payload)
+            # Wake up the clients
+            self.condition.notify_all()
+
+    # Generates the server-sent events of a single client
+    def events(self, delta=False):
+        """
+        Generates the stream of server-sent events for a single client.
+        :param delta: Send merge patches of the changes instead of full states
+            after the first update, full states are sent whenever the client
+            skipped an update due to falling behind
+        :return: Yields the server-sent events as strings
+        """
+        # Version of the last update sent to this client
+        last = None
+        # Count the connected client
+        with self.condition:
+            self.clients += 1
+        # Stream until the client disconnects, which closes the generator
+        try:
+            while True:
+                # Wait for an update newer than the last one sent
+                with self.condition:
+                    self.condition.wait_for(
+                        lambda: self.latest and self.latest.version != last,
+                        self.keepalive
+                    )
+                    update = self.latest
+                # Timeout without new update: Keep the connection alive
+                if update is None or update.version == last:
+                    yield ": keepalive\n\n"
+                    continue
+                # Consecutive updates can be sent as delta, skipped updates
+                # require sending the full state
+                consecutive = last is not None and update.version == last + 1
+                # Send the update to the client
+                yield update.event(
+                    "delta" if delta and consecutive else "state"
+                )
+                # Remember the update sent last
+                last = update.version
+        # Uncount the disconnected client
+        finally:
+            with self.condition:
+                self.clients -= 1
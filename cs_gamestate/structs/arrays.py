@@ -0,0 +1,153 @@
+# Postponed evaluation of annotations, allows to type-hint methods with their
+# own enclosing class type
+from __future__ import annotations
+# Use dataclasses to represent the columns of many game states
+from dataclasses import dataclass
+
+# Columns of numbers are stored as NumPy arrays
+import numpy as np
+
+
+# Parses a single coordinate string, NaN if malformed
+def parse_vector(string: str) -> tuple[float, float, float]:
+    try:
+        return tuple(float(value) for value in string.split(","))
+    except ValueError:
+        return (np.nan,) * 3
+
+
+# Parses many coordinate strings at once into an array of 3-vectors
+def parse_vectors(strings: list[str]) -> np.ndarray:
+    """
+    Parses coordinate strings of three comma separated numbers in a single pass
+    over all of them.
+    :param strings: List of coordinate strings with two commas each
+    :return: N x 3 array of the coordinates, NaN for malformed coordinates
+    """
+    # Nothing to parse
+    if not strings:
+        return np.empty((0, 3))
+    # Join all strings and let NumPy convert all numbers at once
+    try:
+        return np.array(
+            ",".join(strings).split(","), dtype=float
+        ).reshape(-1, 3)
+    # Some strings are malformed: Parse one by one to not fail all of them
+    except ValueError:
+        return np.array([parse_vector(string) for string in strings])
+
+
+# Struct-of-arrays representation of many game states, i.e., one column per
+# field instead of one object per game state
+#   Note: Covers the fields commonly needed to analyze recorded matches, rows
+#       are the game states, player columns are ordered by steam ID
+@dataclass
+class GameStateArrays:
+    # Steam IDs of the players in the order of the player columns
+    steamids: list[str]
+    # Provider timestamp of each game state, NaN if missing
+    timestamp: np.ndarray
+    # Round number of the map and phase of the round of each game state
+    round: np.ndarray
+    round_phase: np.ndarray
+    # Team of each player in each game state, None if missing
+    team: np.ndarray
+    # Position and forward vector of each player in each game state as
+    # N x P x 3 arrays, NaN if missing
+    position: np.ndarray
+    forward: np.ndarray
+    # State of each player in each game state as N x P arrays, NaN if missing
+    health: np.ndarray
+    armor: np.ndarray
+    money: np.ndarray
+    equip_value: np.ndarray
+
+    # Number of game states
+    def __len__(self):
+        return len(self.timestamp)
+
+    # Builds the columns directly from the raw payloads
+    @staticmethod
+    def from_payloads(payloads) -> GameStateArrays:
+        """
+        Collects the columns from raw payloads without decoding them into game
+        state structures, parsing all coordinates in a single pass.
+        :param payloads: List of raw JSON payload dictionaries
+        :return: Returns the struct-of-arrays representation
+        """
+        # Column of each player by steam ID, in order of first appearance
+        columns = {}
+        for payload in payloads:
+            # Only players given as dictionary carry information, anything
+            # else counts as missing
+            players = payload.get("allplayers")
+            if isinstance(players, dict):
+                for steamid in players:
+                    columns.setdefault(steamid, len(columns))
+        # Number of game states and players
+        n, p = len(payloads), len(columns)
+
+        # Allocates a column of numbers, NaN marks missing values
+        def numbers(*shape):
+            return np.full(shape, np.nan)
+
+        # Preallocate all columns
+        timestamp, number = numbers(n), numbers(n)
+        phase = np.full(n, None, dtype=object)
+        team = np.full((n, p), None, dtype=object)
+        position, forward = numbers(n, p, 3), numbers(n, p, 3)
+        state = {
+            key: numbers(n, p)
+            for key in ("health", "armor", "money", "equip_value")
+        }
+        # Row and column indices and strings of all coordinates to parse at
+        # once, separately for positions and forward vectors
+        vectors = {"position": ([], [], []), "forward": ([], [], [])}
+        # Run over all game states
+        for row, payload in enumerate(payloads):
+            # Timestamp of the provider
+            provider = payload.get("provider")
+            if isinstance(provider, dict):
+                timestamp[row] = provider.get("timestamp", np.nan)
+            # Round number of the map
+            game_map = payload.get("map")
+            if isinstance(game_map, dict) and "round" in game_map:
+                number[row] = game_map["round"]
+            # Phase of the round
+            game_round = payload.get("round")
+            if isinstance(game_round, dict):
+                phase[row] = game_round.get("phase")
+            # Run over all players, if given as dictionary
+            players = payload.get("allplayers")
+            if not isinstance(players, dict):
+                continue
+            for steamid, player in players.items():
+                # Only players given as dictionaries carry information
+                if not isinstance(player, dict):
+                    continue
+                # Column of the player
+                column = columns[steamid]
+                # Team of the player
+                team[row, column] = player.get("team")
+                # Numeric state of the player
+                player_state = player.get("state")
+                if isinstance(player_state, dict):
+                    for key, values in state.items():
+                        if key in player_state:
+                            values[row, column] = player_state[key]
+                # Collect the well-formed coordinate strings
+                for key, (rows, cols, strings) in vectors.items():
+                    value = player.get(key)
+                    if isinstance(value, str) and value.count(",") == 2:
+                        rows.append(row)
+                        cols.append(column)
+                        strings.append(value)
+        # Parse all coordinates in one go and scatter them into the columns
+        for key, target in (("position", position), ("forward", forward)):
+            rows, cols, strings = vectors[key]
+            target[rows, cols] = parse_vectors(strings)
+        # Collect the columns
+        return GameStateArrays(
+            list(columns), timestamp, number, phase, team, position, forward,
+            **state
+        )
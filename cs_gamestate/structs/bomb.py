@@ -5,7 +5,9 @@ from __future__ import annotations
 from dataclasses import dataclass
 
 # Game state structures verification utils
-from cs_gamestate.structs.verify import VerifiedSubstructures, verify_attribute
+from cs_gamestate.structs.verify import VerifiedSubstructures
+# Enumerations of the known values of the verified fields
+from cs_gamestate.enums.bomb import BombState
 # Utility functions for initializing the game state structures
 from cs_gamestate.structs.utils import none_or_isinstance
 
@@ -27,17 +29,8 @@ class Bomb(VerifiedSubstructures):
     #   Note: This can be the carrier, the planter or the defuser
     player: str = None
 
-    # Tries to verify the validity of the component producing a list of messages
-    # if something is not right
-    def verify(self):
-        # Start collecting messages in list, automate verification of
-        # substructures
-        messages = super().verify()
-        # Verify the current bomb state against the enum of known states
-        from cs_gamestate.enums.bomb import BombState
-        messages.extend(verify_attribute(self, BombState, "state"))
-        # Return the collected verification messages
-        return messages
+    # Fields verified against the enums of their known values
+    ENUMS = {"state": BombState}
 
     # Post-init the dataclass to sanitize not correctly imported substructures
     def __post_init__(self):
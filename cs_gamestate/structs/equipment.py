@@ -5,7 +5,11 @@ from __future__ import annotations
 from dataclasses import dataclass
 
 # Game state structures verification utils
-from cs_gamestate.structs.verify import VerifiedSubstructures, verify_attribute
+from cs_gamestate.structs.verify import VerifiedSubstructures
+# Enumerations of the known values of the verified fields
+from cs_gamestate.enums.equipment import (
+    WeaponName, WeaponType, WeaponState, GrenadeType
+)
 # Utility functions for initializing the game state structures
 from cs_gamestate.structs.utils import none_or_isinstance
 
@@ -29,23 +33,8 @@ class Weapon(VerifiedSubstructures):
     # Current state of the weapon: "active" or "holstered"
     state: str = None
 
-    # Tries to verify the validity of the component producing a list of messages
-    # if something is not right
-    def verify(self):
-        # Start collecting messages in list, automate verification of
-        # substructures
-        messages = super().verify()
-        # Verify the weapon is one of the known weapons
-        from cs_gamestate.enums.equipment import WeaponName
-        messages.extend(verify_attribute(self, WeaponName, "name"))
-        # Verify the weapon type is one of the known types
-        from cs_gamestate.enums.equipment import WeaponType
-        messages.extend(verify_attribute(self, WeaponType, "type"))
-        # Verify the weapon state is one of the known valid states
-        from cs_gamestate.enums.equipment import WeaponState
-        messages.extend(verify_attribute(self, WeaponState, "state"))
-        # Return the collected verification messages
-        return messages
+    # Fields verified against the enums of their known values
+    ENUMS = {"name": WeaponName, "type": WeaponType, "state": WeaponState}
 
 
 # Structure holding information on an active grenade effect
@@ -70,17 +59,8 @@ class ActiveGrenade(VerifiedSubstructures):
     # Note: A dictionary of some flame piece identifier and a coordinate tuple
     flames: dict[str, tuple[float, ...]] = None
 
-    # Tries to verify the validity of the component producing a list of messages
-    # if something is not right
-    def verify(self):
-        # Start collecting messages in list, automate verification of
-        # substructures
-        messages = super().verify()
-        # Verify the grenade type is one of the known types
-        from cs_gamestate.enums.equipment import GrenadeType
-        messages.extend(verify_attribute(self, GrenadeType, "type"))
-        # Return the collected verification messages
-        return messages
+    # Fields verified against the enums of their known values
+    ENUMS = {"type": GrenadeType}
 
     # Post-init the dataclass to sanitize not correctly imported substructures
     def __post_init__(self):
@@ -114,6 +94,9 @@ class ActiveGrenade(VerifiedSubstructures):
         if self.flames is not None:
             # If it ist a dictionary, this can be unpacked to initialize
             if isinstance(self.flames, dict):
+                # Collect the validated flames into a new dictionary, leaving
+                # the raw payload unchanged
+                flames = {}
                 # Validate each flame piece
                 for key, flame in self.flames.items():
                     # If the flame is not coordinate tuple yet
@@ -130,7 +113,9 @@ class ActiveGrenade(VerifiedSubstructures):
                             # Cannot really handle this, treat as "not present"
                             flame = None  # noqa
                     # Reinitialize the flame with key guaranteed to be a string
-                    self.flames[str(key)] = flame
+                    flames[str(key)] = flame
+                # Replace the raw dictionary by the validated one
+                self.flames = flames
             # Sometimes the client seems to provide just a boolean for
             # this field (other types possible as well?)
             else:
@@ -141,21 +126,22 @@ class ActiveGrenade(VerifiedSubstructures):
 # Structure describing the player's equipment, which is a mapping of weapon
 # slots to Weapons
 class Equipment(dict[str, Weapon], VerifiedSubstructures):
-    # Tries to verify the validity of the component producing a list of messages
-    # if something is not right
-    def verify(self):
-        # Start collecting messages in list, automate verification of
+    # Tries to verify the validity of the component producing a list of
+    # violations if something is not right
+    def violations(self):
+        # Start collecting violations in list, automate verification of
         # substructures
-        messages = super().verify()
+        violations = super().violations()
         # Verifying the player's equipment cannot be automated as it is of type
         # dict
         for slot, weapon in self.items():
-            # Verify each weapon using its method and collecting the messages
-            messages.extend(
-                [f"{self}: {slot}: {msg}" for msg in weapon.verify()]
+            # Verify each weapon using its method and collecting the
+            # violations
+            violations.extend(
+                [v.prefixed(self, slot) for v in weapon.violations()]
             )
-        # Return the collected verification messages
-        return messages
+        # Return the collected violations
+        return violations
 
     # Iterates all weapons in the equipment container
     def __iter__(self):
@@ -0,0 +1,276 @@
+# Postponed evaluation of annotations, allows to type-hint methods with their
+# own enclosing class type
+from __future__ import annotations
+# Read-only mapping interface of the frozen dictionaries
+from collections.abc import Mapping
+# Derive the frozen variants from the fields of the game state structures
+from dataclasses import fields, is_dataclass, make_dataclass, field
+
+# The mutable game state structures to derive the frozen variants from
+from cs_gamestate.structs.gamestate import GameState
+from cs_gamestate.structs.provider import Provider
+from cs_gamestate.structs.player import Player
+from cs_gamestate.structs.bomb import Bomb
+from cs_gamestate.structs.round import Round
+from cs_gamestate.structs.phase import PhaseCountdowns
+from cs_gamestate.structs.map import Map
+from cs_gamestate.structs.equipment import Weapon, ActiveGrenade, Equipment
+
+
+# Immutable, hashable dictionary with the hash computed only once
+class FrozenDict(Mapping):
+    # Wraps a private copy of the dictionary
+    def __init__(self, *args, **kwargs):
+        # Private dictionary, never modified after construction
+        self._dict = dict(*args, **kwargs)
+        # Hash computed on first use
+        self._hash = None
+
+    # Gets the value of a key
+    def __getitem__(self, key):
+        return self._dict[key]
+
+    # Iterates the keys
+    def __iter__(self):
+        return iter(self._dict)
+
+    # Number of keys
+    def __len__(self):
+        return len(self._dict)
+
+    # Hash of the items, computed only once
+    def __hash__(self):
+        # Compute the hash on first use, the items never change
+        if self._hash is None:
+            self._hash = hash(frozenset(self._dict.items()))
+        # Return the cached hash
+        return self._hash
+
+    # Equal to any mapping with the same items
+    def __eq__(self, other):
+        # Identical objects are always equal, unequal hashes never are
+        if self is other:
+            return True
+        if isinstance(other, FrozenDict) and hash(self) != hash(other):
+            return False
+        # Compare the items like dictionaries
+        return isinstance(other, Mapping) and self._dict == dict(other.items())
+
+    # Represent like a dictionary
+    def __repr__(self):
+        return f"{type(self).__name__}({self._dict!r})"
+
+
+# Immutable, hashable variant of the player's equipment
+class FrozenEquipment(FrozenDict):
+    # Iterates all weapons in the equipment container
+    def __iter__(self):
+        # Generator dropping the key from the slots
+        return (weapon for (_, weapon) in self.items())
+
+    # Iterates the slots as keys, the Mapping mixin methods rely on this
+    def keys(self):
+        return self._dict.keys()
+
+    # Iterates slot and weapon pairs
+    def items(self):
+        return self._dict.items()
+
+    # Iterates the weapons
+    def values(self):
+        return self._dict.values()
+
+    # Gets the weapon at the specified slot by index
+    def slot(self, index: int) -> FrozenWeapon | None:
+        # Check whether the slot is occupied
+        return self._dict.get(f"weapon_{index}")
+
+    # Get the currently active equipment or weapon
+    @property
+    def active(self) -> FrozenWeapon | None:
+        # Iterate all players equipped weapons
+        for weapon in self.values():
+            # Detect the active item
+            if weapon is not None and weapon.state == "active":
+                # There is always at most one active weapon
+                return weapon
+        # No weapon is active
+        return None
+
+    # Select the subset of grenades from the equipment
+    @property
+    def grenades(self) -> FrozenEquipment:
+        # Filter equipment by weapon type
+        return FrozenEquipment({
+            k: v for (k, v) in self.items()
+            if v is not None and v.type == "Grenade"
+        })
+
+
+# Hash of a frozen structure over all of its fields, computed only once
+def _cached_hash(self):
+    # Compute the hash on first use, the fields never change
+    if "_hash" not in self.__dict__:
+        # Frozen dataclasses do not allow setting attributes the normal way
+        values = tuple(getattr(self, f.name) for f in fields(self))
+        object.__setattr__(self, "_hash", hash(values))
+    # Return the cached hash
+    return self.__dict__["_hash"]
+
+
+# Equality of frozen structures, comparing the cached hashes first
+def _eq(self, other):
+    # Identical objects are always equal
+    if self is other:
+        return True
+    # Only structures of the same type can be equal
+    if type(self) is not type(other):
+        return NotImplemented
+    # Unequal hashes are never equal, equal hashes need to compare the fields
+    return hash(self) == hash(other) and all(
+        getattr(self, f.name) == getattr(other, f.name) for f in fields(self)
+    )
+
+
+# Derives the frozen variant of a game state structure with the same fields
+def _frozen(cls, name):
+    # Create a frozen dataclass with the same field names, types and defaults
+    frozen = make_dataclass(
+        name,
+        [(f.name, f.type, field(default=f.default)) for f in fields(cls)],
+        namespace={"__hash__": _cached_hash, "__eq__": _eq},
+        frozen=True, eq=False
+    )
+    # Place the class in this module to be found when pickling
+    frozen.__module__ = __name__
+    # Return the derived frozen structure
+    return frozen
+
+
+# Frozen variants of the substructures
+FrozenProvider = _frozen(Provider, "FrozenProvider")
+FrozenBomb = _frozen(Bomb, "FrozenBomb")
+FrozenRound = _frozen(Round, "FrozenRound")
+FrozenPhaseCountdowns = _frozen(PhaseCountdowns, "FrozenPhaseCountdowns")
+FrozenMap = _frozen(Map, "FrozenMap")
+FrozenMap.Team = _frozen(Map.Team, "Team")
+FrozenMap.Team.__qualname__ = "FrozenMap.Team"
+FrozenWeapon = _frozen(Weapon, "FrozenWeapon")
+FrozenActiveGrenade = _frozen(ActiveGrenade, "FrozenActiveGrenade")
+FrozenPlayer = _frozen(Player, "FrozenPlayer")
+FrozenPlayer.State = _frozen(Player.State, "State")
+FrozenPlayer.State.__qualname__ = "FrozenPlayer.State"
+FrozenPlayer.Stats = _frozen(Player.Stats, "Stats")
+FrozenPlayer.Stats.__qualname__ = "FrozenPlayer.Stats"
+FrozenGameState = _frozen(GameState, "FrozenGameState")
+
+# Mapping of the mutable structures to their frozen variants
+FROZEN = {
+    GameState: FrozenGameState,
+    Provider: FrozenProvider,
+    Player: FrozenPlayer,
+    Player.State: FrozenPlayer.State,
+    Player.Stats: FrozenPlayer.Stats,
+    Bomb: FrozenBomb,
+    Round: FrozenRound,
+    PhaseCountdowns: FrozenPhaseCountdowns,
+    Map: FrozenMap,
+    Map.Team: FrozenMap.Team,
+    Weapon: FrozenWeapon,
+    ActiveGrenade: FrozenActiveGrenade,
+    Equipment: FrozenEquipment,
+}
+# Mapping of the frozen variants back to the mutable structures
+THAWED = {frozen: cls for cls, frozen in FROZEN.items()}
+
+
+# Converts a game state or any of its substructures into the frozen variant
+#   Note: The memo dictionary maps the id of already frozen objects to the
+#       original and frozen object, pass the same dictionary to reuse frozen
+#       objects shared by multiple game states
+def freeze(obj, memo=None):
+    # Start a new memo if none is given
+    memo = {} if memo is None else memo
+    # Reuse the object frozen before if it is the same original
+    if id(obj) in memo:
+        return memo[id(obj)][1]
+    # Game state structures are converted to their frozen variant
+    if type(obj) in FROZEN and is_dataclass(obj):
+        frozen = FROZEN[type(obj)](**{
+            f.name: freeze(getattr(obj, f.name), memo) for f in fields(obj)
+        })
+    # The equipment is converted to its frozen container
+    elif isinstance(obj, Equipment):
+        frozen = FrozenEquipment({k: freeze(v, memo) for k, v in obj.items()})
+    # Any other dictionary is converted into a frozen dictionary
+    elif isinstance(obj, dict):
+        frozen = FrozenDict({k: freeze(v, memo) for k, v in obj.items()})
+    # Lists are converted to tuples
+    elif isinstance(obj, list):
+        frozen = tuple(freeze(v, memo) for v in obj)
+    # Anything else is already immutable
+    else:
+        return obj
+    # Remember the frozen object, keeping the original alive to not reuse its id
+    memo[id(obj)] = (obj, frozen)
+    # Return the frozen variant
+    return frozen
+
+
+# Converts a frozen game state or any of its substructures back to the mutable
+# structures, e.g., to verify it
+def thaw(obj):
+    # Frozen equipment is converted back to the equipment container
+    if isinstance(obj, FrozenEquipment):
+        return Equipment({k: thaw(v) for k, v in obj.items()})
+    # Frozen dictionaries are converted back to dictionaries
+    if isinstance(obj, FrozenDict):
+        return {k: thaw(v) for k, v in obj.items()}
+    # Frozen structures are converted back to the mutable structures
+    if type(obj) in THAWED:
+        return THAWED[type(obj)](**{
+            f.name: thaw(getattr(obj, f.name)) for f in fields(obj)
+        })
+    # Anything else is kept as is
+    return obj
+
+
+# Freezes consecutive game states, reusing the frozen substructures of the
+# previous game state which are shared, e.g., via the decoder's share option
+class Freezer:
+    # Starts without any previously frozen game state
+    def __init__(self):
+        # Memo of the objects frozen for the previous game state
+        self.memo = {}
+
+    # Freezes the next game state
+    def __call__(self, state: GameState) -> FrozenGameState:
+        # Frozen objects of the previous state are available for reuse, the
+        # new memo only keeps those still in use
+        previous, self.memo = self.memo, {}
+        # Freeze the game state, consulting the previous memo first
+        return freeze(state, _Memo(previous, self.memo))
+
+
+# Memo looking up the previous memo while collecting the current one
+class _Memo(dict):
+    # Wraps the memo of the previous and the current game state
+    def __init__(self, previous, current):
+        super().__init__()
+        self.previous, self.current = previous, current
+
+    # Looks up the current memo first, then the previous one
+    def __contains__(self, key):
+        # Move entries of the previous memo still in use to the current one
+        if key not in self.current and key in self.previous:
+            self.current[key] = self.previous[key]
+        # Only the current memo is consulted for the result
+        return key in self.current
+
+    # Gets the entry from the current memo
+    def __getitem__(self, key):
+        return self.current[key]
+
+    # Inserts the entry into the current memo
+    def __setitem__(self, key, value):
+        self.current[key] = value
@@ -44,35 +44,27 @@ class GameState(VerifiedSubstructures):
     grenades: dict[str, ActiveGrenade] = None
     # Information an all players in the game
     allplayers: dict[str, Player] = None
+    # Authentication information configured for the service, e.g., the token
+    #   Note: The endpoint removes this after validating the token
+    auth: dict = None
 
-    # Tries to verify the validity of the component producing a list of messages
-    # if something is not right
-    def verify(self):
-        # Start collecting messages in list, automate verification of
-        # substructures
-        messages = super().verify()
-        # The "allplayers" field must be verified separately if it is present
-        if self.allplayers is not None:
-            # Verifying the "allplayers" field cannot be automated as it is of
-            # type dict
-            for name, player in self.allplayers.items():
-                # Verify each player using its method and collecting the
-                # messages
-                messages.extend(
-                    [f"allplayers: {name}: {msg}" for msg in player.verify()]
-                )
-        # The "grenades" field must be verified separately if it is present
-        if self.grenades is not None:
-            # Verifying the "grenades" field cannot be automated as it is of
-            # type dict
-            for name, grenade in self.grenades.items():
-                # Verify each grenade using its method and collecting the
-                # messages
-                messages.extend(
-                    [f"grenades: {name}: {msg}" for msg in grenade.verify()]
-                )
-        # Return the collected verification messages
-        return messages
+    # Decodes many raw payloads at once, e.g., a recorded match
+    @staticmethod
+    def from_many(payloads, share=False, arrays=False, pause_gc=False):
+        """
+        Decodes a batch of raw game state payloads, see Decoder.decode_batch.
+        :param payloads: Iterable of raw JSON payload dictionaries
+        :param share: Reuse unchanged substructures of consecutive game states
+            Note: The shared substructures must not be modified
+        :param arrays: Return the struct-of-arrays representation instead
+        :param pause_gc: Disable the garbage collector of the whole process
+            while decoding, only for offline batches
+        :return: Returns the list of game states or the GameStateArrays
+        """
+        # Import locally as the decoder depends on the game state structure
+        from cs_gamestate.decoder import Decoder
+        # Decode the batch with only the sharing option
+        return Decoder(share=share).decode_batch(payloads, arrays, pause_gc)
 
     # Post-init the structure to sanitize not correctly imported substructures
     def __post_init__(self):
@@ -181,6 +173,9 @@ class GameState(VerifiedSubstructures):
         if self.allplayers is not None:
             # If it ist a dictionary, this can be unpacked to initialize
             if isinstance(self.allplayers, dict):
+                # Collect the validated slots into a new dictionary, leaving the
+                # raw payload unchanged
+                allplayers = {}
                 # Validate each allplayers slot
                 for key, player in self.allplayers.items():
                     # If the player is not an instance of the Player structure,
@@ -199,7 +194,9 @@ class GameState(VerifiedSubstructures):
                             player = None  # noqa
                     # Reinitialize the player slot with key guaranteed to be a
                     # string
-                    self.allplayers[str(key)] = player
+                    allplayers[str(key)] = player
+                # Replace the raw dictionary by the validated one
+                self.allplayers = allplayers
             # Sometimes the client seems to provide just a boolean for
             # this field (other types possible as well?)
             else:
@@ -210,6 +207,9 @@ class GameState(VerifiedSubstructures):
         if self.grenades is not None:
             # If it ist a dictionary, this can be unpacked to initialize
             if isinstance(self.grenades, dict):
+                # Collect the validated slots into a new dictionary, leaving the
+                # raw payload unchanged
+                grenades = {}
                 # Validate each grenades slot
                 for key, grenade in self.grenades.items():
                     # If the grenade is not an instance of the ActiveGrenade
@@ -228,7 +228,9 @@ class GameState(VerifiedSubstructures):
                             grenade = None  # noqa
                     # Reinitialize the grenade with key guaranteed to be a
                     # string
-                    self.grenades[str(key)] = grenade
+                    grenades[str(key)] = grenade
+                # Replace the raw dictionary by the validated one
+                self.grenades = grenades
             # Sometimes the client seems to provide just a boolean for
             # this field (other types possible as well?)
             else:
@@ -5,7 +5,9 @@ from __future__ import annotations
 from dataclasses import dataclass
 
 # Game state structures verification utils
-from cs_gamestate.structs.verify import VerifiedSubstructures, verify_attribute
+from cs_gamestate.structs.verify import VerifiedSubstructures, Violation
+# Enumerations of the known values of the verified fields
+from cs_gamestate.enums.map import MapPhase, GameMode, RoundWinCondition
 # Utility functions for initializing the game state structures
 from cs_gamestate.structs.utils import none_or_isinstance
 
@@ -52,21 +54,17 @@ class Map(VerifiedSubstructures):
     #   Note: Probably only relevant during tournaments
     souvenirs_total: int = None
 
-    # Tries to verify the validity of the component producing a list of messages
-    # if something is not right
-    def verify(self):
-        # Start collecting messages in list, automate verification of
-        # substructures
-        messages = super().verify()
-        # Verify the current phase against the enum of known phases
-        from cs_gamestate.enums.map import MapPhase
-        messages.extend(verify_attribute(self, MapPhase, "phase"))
-        # Verify the game mode against the enum of known modes
-        from cs_gamestate.enums.map import GameMode
-        messages.extend(verify_attribute(self, GameMode, "mode"))
+    # Fields verified against the enums of their known values
+    ENUMS = {"phase": MapPhase, "mode": GameMode}
+
+    # Tries to verify the validity of the component producing a list of
+    # violations if something is not right
+    def violations(self):
+        # Start collecting violations in list, automate verification of
+        # substructures and the fields with known values
+        violations = super().violations()
         # Verify each round winning condition against the known conditions
-        from cs_gamestate.enums.map import RoundWinCondition
-        # If there is a history of round wins
+        # if there is a history of round wins
         if self.round_wins is not None:
             # Run over all round number - condition pairs from the history
             for round, condition in self.round_wins.items():  # noqa: Shadows
@@ -78,14 +76,12 @@ class Map(VerifiedSubstructures):
                 # Failing to initialize the enum from the attribute value will
                 # be signaled by raising a ValueError
                 except ValueError:
-                    # Verification failed, return list containing a message
-                    # explaining the cause:
-                    messages.extend([
-                        f"{self}: 'round_wins': {round}: '{condition}' not in"
-                        f" {[x.value for x in RoundWinCondition]}"
-                    ])
-        # Return the collected verification messages
-        return messages
+                    # Verification failed, add the violation of this item
+                    violations.append(Violation(
+                        self, "round_wins", condition, RoundWinCondition, round
+                    ))
+        # Return the collected violations
+        return violations
 
     # Post-init the dataclass to sanitize not correctly imported substructures
     def __post_init__(self):
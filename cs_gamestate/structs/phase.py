@@ -5,7 +5,9 @@ from __future__ import annotations
 from dataclasses import dataclass
 
 # Game state structures verification utils
-from cs_gamestate.structs.verify import VerifiedSubstructures, verify_attribute
+from cs_gamestate.structs.verify import VerifiedSubstructures
+# Enumerations of the known values of the verified fields
+from cs_gamestate.enums.phase import Phase
 
 
 # Structure describing the phase countdowns of a round
@@ -20,14 +22,5 @@ class PhaseCountdowns(VerifiedSubstructures):
     # been planted and the phase is "bomb"
     phase_ends_in: float = None
 
-    # Tries to verify the validity of the component producing a list of messages
-    # if something is not right
-    def verify(self):
-        # Start collecting messages in list, automate verification of
-        # substructures
-        messages = super().verify()
-        # Verify the current phase against the enum of known phases
-        from cs_gamestate.enums.phase import Phase
-        messages.extend(verify_attribute(self, Phase, "phase"))
-        # Return the collected verification messages
-        return messages
+    # Fields verified against the enums of their known values
+    ENUMS = {"phase": Phase}
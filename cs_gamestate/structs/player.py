@@ -7,7 +7,10 @@ from dataclasses import dataclass
 # A player holds equipment and weapons as substructures
 from cs_gamestate.structs.equipment import Weapon, Equipment
 # Game state structures verification utils
-from cs_gamestate.structs.verify import VerifiedSubstructures, verify_attribute
+from cs_gamestate.structs.verify import VerifiedSubstructures
+# Enumerations of the known values of the verified fields
+from cs_gamestate.enums.player import PlayerActivity
+from cs_gamestate.enums.team import TeamName
 # Utility functions for initializing the game state structures
 from cs_gamestate.structs.utils import none_or_isinstance
 
@@ -94,20 +97,8 @@ class Player(VerifiedSubstructures):
     # Weapons equipped by the player
     weapons: Equipment = None
 
-    # Tries to verify the validity of the component producing a list of messages
-    # if something is not right
-    def verify(self):
-        # Start collecting messages in list, automate verification of
-        # substructures
-        messages = super().verify()
-        # Verify the player's team against the enum of known teams
-        from cs_gamestate.enums.team import TeamName
-        messages.extend(verify_attribute(self, TeamName, "team"))
-        # Verify the player's activity against the enum of known activities
-        from cs_gamestate.enums.player import PlayerActivity
-        messages.extend(verify_attribute(self, PlayerActivity, "activity"))
-        # Return the collected verification messages
-        return messages
+    # Fields verified against the enums of their known values
+    ENUMS = {"team": TeamName, "activity": PlayerActivity}
 
     # Post-init the dataclass to sanitize not correctly imported substructures
     def __post_init__(self):
@@ -142,6 +133,9 @@ class Player(VerifiedSubstructures):
         if not none_or_isinstance(self.weapons, Equipment):
             # If it ist a dictionary, this can be unpacked to initialize
             if isinstance(self.weapons, dict):
+                # Collect the validated slots into a new container, leaving the
+                # raw payload unchanged
+                weapons = Equipment()
                 # Validate each weapon slot
                 for key, weapon in self.weapons.items():
                     # If the weapon is not an instance of the Weapon structure,
@@ -160,10 +154,10 @@ class Player(VerifiedSubstructures):
                             weapon = None  # noqa
                     # Reinitialize the weapon slot with key guaranteed to be a
                     # string
-                    self.weapons[str(key)] = weapon
-                # Reinterpret the weapons dictionary as the Equipment container,
-                # which is derived from dictionary
-                self.weapons = Equipment(self.weapons)
+                    weapons[str(key)] = weapon
+                # Replace the raw dictionary by the Equipment container, which
+                # is derived from dictionary
+                self.weapons = weapons
 
         # If the position has not yet been parsed
         if not none_or_isinstance(self.position, tuple):  # noqa Duplicate
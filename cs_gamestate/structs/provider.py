@@ -5,7 +5,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 
 # Game state structures verification utils
-from cs_gamestate.structs.verify import VerifiedSubstructures
+from cs_gamestate.structs.verify import VerifiedSubstructures, Violation
 
 
 # Game state structure describing provider information
@@ -26,15 +26,17 @@ class Provider(VerifiedSubstructures):
     # Unis timestamp when this game state has been produced
     timestamp: int = None
 
-    # Tries to verify the validity of the component producing a list of messages
-    # if something is not right
-    def verify(self):
-        # Start collecting messages in list, automate verification of
+    # Tries to verify the validity of the component producing a list of
+    # violations if something is not right
+    def violations(self):
+        # Start collecting violations in list, automate verification of
         # substructures
-        messages = super().verify()
+        violations = super().violations()
         # Counter-Strike should always have the appid 730
         if self.appid != 730:
-            # Add verification failure message
-            messages.extend([f"{self}: appid is not 730: {self.appid}"])
-        # Return the collected verification messages
-        return messages
+            # Add verification failure
+            violations.append(
+                Violation(self, "appid", self.appid, expected=730)
+            )
+        # Return the collected violations
+        return violations
@@ -5,7 +5,11 @@ from __future__ import annotations
 from dataclasses import dataclass
 
 # Game state structures verification utils
-from cs_gamestate.structs.verify import VerifiedSubstructures, verify_attribute
+from cs_gamestate.structs.verify import VerifiedSubstructures
+# Enumerations of the known values of the verified fields
+from cs_gamestate.enums.bomb import BombState
+from cs_gamestate.enums.phase import Phase
+from cs_gamestate.enums.team import TeamName
 
 
 # Structure describing the current state of the round
@@ -20,20 +24,5 @@ class Round(VerifiedSubstructures):
     # Current state of the bomb, only present if the bomb has been planted
     bomb: str = None
 
-    # Tries to verify the validity of the component producing a list of messages
-    # if something is not right
-    def verify(self):
-        # Start collecting messages in list, automate verification of
-        # substructures
-        messages = super().verify()
-        # Verify the round phase string against the enum
-        from cs_gamestate.enums.phase import Phase
-        messages.extend(verify_attribute(self, Phase, "phase"))
-        # Verify the winning team against the enum of known teams
-        from cs_gamestate.enums.team import TeamName
-        messages.extend(verify_attribute(self, TeamName, "win_team"))
-        # Verify the current bomb state against the enum of known states
-        from cs_gamestate.enums.bomb import BombState
-        messages.extend(verify_attribute(self, BombState, "bomb"))
-        # Return the collected verification messages
-        return messages
+    # Fields verified against the enums of their known values
+    ENUMS = {"phase": Phase, "win_team": TeamName, "bomb": BombState}
@@ -1,17 +1,101 @@
+# Postponed evaluation of annotations, allows to type-hint methods with their
+# own enclosing class type
+from __future__ import annotations
+# Use dataclasses to represent the aggregated violations, the fields of the
+# structures make up their verification plans
+from dataclasses import dataclass, fields, is_dataclass
+# Resolve the postponed annotations of the fields to their types
+import typing
+# Time of seeing the violations
+import time
+
+
+# Single verification failure of an attribute of a game state structure
+#   Note: The message is only formatted when converted to string, formatting
+#       the representation of the structures is expensive
+class Violation:
+    # Violations are created for every game state, keep them small
+    __slots__ = ("obj", "attr", "value", "enum", "item", "expected", "path")
+
+    # Records the failing attribute without formatting anything yet
+    def __init__(
+            self, obj, attr, value=None, enum=None, item=None, expected=None,
+            path=()
+    ):
+        # Structure and name of the failing attribute
+        self.obj, self.attr = obj, attr
+        # Value of the failing attribute, missing attributes have none
+        self.value = value
+        # Enumeration of valid values the value is not part of, if any
+        self.enum = enum
+        # Key of the failing item if the attribute is a dictionary, if any
+        self.item = item
+        # Expected value the value is not equal to, if any
+        self.expected = expected
+        # Path of the structure within the game state, attribute names and
+        # dictionary keys interleaved with the containers to be formatted
+        self.path = path
+
+    # Prepends segments to the path of the violation
+    def prefixed(self, *segments) -> Violation:
+        return Violation(
+            self.obj, self.attr, self.value, self.enum, self.item,
+            self.expected, (*segments, *self.path)
+        )
+
+    # Identifies violations of the same field with the same value
+    @property
+    def key(self) -> tuple:
+        # Only the names of the path, not the containers, identify the field
+        names = tuple(s for s in self.path if isinstance(s, str))
+        # Unhashable values are identified by their representation
+        value = self.value if self.value.__hash__ else repr(self.value)
+        # Path, structure type, attribute and value identify the violation
+        return names, type(self.obj).__name__, self.attr, value
+
+    # Formats the verification message
+    def __str__(self):
+        # Prefix of the path within the game state
+        prefix = "".join(f"{segment}: " for segment in self.path)
+        # The attribute is not present at all
+        if self.enum is None and self.expected is None:
+            return f"{prefix}{self.obj}: Attribute '{self.attr}' not present"
+        # The attribute does not have the expected value
+        if self.enum is None:
+            return (
+                f"{prefix}{self.obj}: {self.attr} is not {self.expected}:"
+                f" {self.value}"
+            )
+        # The item of the attribute is not a valid value of the enumeration
+        if self.item is not None:
+            return (
+                f"{prefix}{self.obj}: '{self.attr}': {self.item}:"
+                f" '{self.value}' not in {[x.value for x in self.enum]}"
+            )
+        # The attribute is not a valid value of the enumeration
+        return (
+            f"{prefix}{self.obj}: '{self.attr}': '{self.value}' not in"
+            f" {[x.value for x in self.enum]}"
+        )
+
+    # Represent by the verification message
+    def __repr__(self):
+        return f"Violation({str(self)!r})"
+
+
 # Verifies an object's attribute being a valid value of the enumerator
-def verify_attribute(obj, enum, attr, allow_none=True):
+def attribute_violations(obj, enum, attr, allow_none=True) -> list[Violation]:
     # The attribute must at least be present
     if not hasattr(obj, attr):
-        # Verification failed,return list containing a message explaining the
-        # cause:
-        return [f"{obj}: Attribute '{attr}' not present"]
+        # Verification failed, return list containing the violation
+        return [Violation(obj, attr)]
     # Get the attribute value out of the object
     #   Note: Might be none
     value = getattr(obj, attr)
     # Optionally allows attributes to be not set
     if allow_none and value is None:
         # Return empty list to be compatible with collecting list of
-        # verification messages
+        # violations
         return []
     # Verify by detecting failure of initializing the enum from the attribute
     try:
@@ -20,31 +104,187 @@ def verify_attribute(obj, enum, attr, allow_none=True):
     # Failing to initialize the enum from the attribute value will be signaled
     # by raising a ValueError
     except ValueError:
-        # Verification failed, return list containing a message explaining the
-        # cause:
-        return [f"{obj}: '{attr}': '{value}' not in {[x.value for x in enum]}"]
-    # Return empty list to be compatible with collecting list of verification
-    # messages
+        # Verification failed, return list containing the violation
+        return [Violation(obj, attr, value, enum)]
+    # Return empty list to be compatible with collecting list of violations
     return []
 
 
+# Verifies an object's attribute being a valid value of the enumerator
+def verify_attribute(obj, enum, attr, allow_none=True):
+    # Format the messages of the violations
+    return [str(v) for v in attribute_violations(obj, enum, attr, allow_none)]
+
+
+# Precomputed verification steps of a structure type
+@dataclass
+class VerificationPlan:
+    # Names of the fields holding a substructure
+    substructures: tuple[str, ...] = ()
+    # Names of the fields holding a dictionary of substructures
+    mappings: tuple[str, ...] = ()
+    # Names of the fields verified against an enumeration, with the enumeration
+    # and the set of its valid values
+    enums: tuple[tuple[str, type, frozenset], ...] = ()
+
+
+# Verification plans by structure type, computed once per type
+_PLANS: dict[type, VerificationPlan] = {}
+
+
+# Gets the verification plan of a structure type
+def verification_plan(cls) -> VerificationPlan:
+    # Plans are computed only once per type
+    if cls in _PLANS:
+        return _PLANS[cls]
+    # Only dataclasses have fields to verify
+    if not is_dataclass(cls):
+        _PLANS[cls] = VerificationPlan()
+        return _PLANS[cls]
+    # Resolve the annotations, nested types are looked up within the class
+    hints = typing.get_type_hints(cls, localns=dict(vars(cls)))
+    # Collect the fields holding substructures or dictionaries of them
+    substructures, mappings = [], []
+    for field in fields(cls):
+        # Resolved type of the field
+        hint = hints.get(field.name)
+        # The field holds a single substructure
+        if isinstance(hint, type) and issubclass(hint, VerifiedSubstructures):
+            substructures.append(field.name)
+        # The field holds a dictionary of substructures
+        elif typing.get_origin(hint) is dict:
+            # Type of the values of the dictionary
+            _, value = typing.get_args(hint)
+            if isinstance(value, type) and issubclass(
+                    value, VerifiedSubstructures
+            ):
+                mappings.append(field.name)
+    # Fields with known values with the valid values of their enumerations
+    enums = tuple(
+        (attr, enum, frozenset(member.value for member in enum))
+        for attr, enum in getattr(cls, "ENUMS", {}).items()
+    )
+    # Remember the plan of this type
+    _PLANS[cls] = VerificationPlan(tuple(substructures), tuple(mappings), enums)
+    # Return the new plan
+    return _PLANS[cls]
+
+
 # Base class to be inherited from to enable automated verification of
-# substructures which provide the "verify" method
+# substructures which provide the "violations" method
+#   Note: Fields holding one of the known values of an enumeration are declared
+#       via an "ENUMS" class attribute mapping the field names to the enums
 class VerifiedSubstructures:
+    # Tries to verify the validity of the component producing a list of
+    # violations if something is not right
+    def violations(self) -> list[Violation]:
+        # Precomputed verification steps of this type of structure
+        plan = verification_plan(type(self))
+        # Start collecting violations in list
+        violations = []
+        # Verify all substructures using their methods and collect the
+        # violations
+        for attr in plan.substructures:
+            # The substructure might not be present
+            value = getattr(self, attr)
+            if isinstance(value, VerifiedSubstructures):
+                violations.extend(
+                    [v.prefixed(attr) for v in value.violations()]
+                )
+        # Verify each substructure of all dictionaries of substructures
+        for attr in plan.mappings:
+            # The dictionary might not be present
+            value = getattr(self, attr)
+            if isinstance(value, dict):
+                for key, item in value.items():
+                    violations.extend(
+                        [v.prefixed(attr, key) for v in item.violations()]
+                    )
+        # Verify the fields with known values against the valid values
+        for attr, enum, values in plan.enums:
+            # Fields are allowed to be not set
+            value = getattr(self, attr)
+            if value is None:
+                continue
+            # Unhashable values cannot be valid either
+            try:
+                valid = value in values
+            except TypeError:
+                valid = False
+            # Verification failed, add the violation of this field
+            if not valid:
+                violations.append(Violation(self, attr, value, enum))
+        # Return the collected violations
+        return violations
+
     # Tries to verify the validity of the component producing a list of messages
     # if something is not right
     def verify(self):
-        # Start collecting messages in list
-        messages = []
-        # Automate the verification of all substructures
-        for attr in self.__dict__:
-            # If the attribute has a verify method, this substructure needs to
-            # be verified
-            if hasattr(self.__dict__[attr], "verify"):
-                # Verify the substructure using its method and collecting the
-                # messages
-                messages.extend(
-                    [f"{attr}: {msg}" for msg in getattr(self, attr).verify()]
-                )
-        # Return the collected verification messages
-        return messages
+        # Format the messages of the violations
+        return [str(v) for v in self.violations()]
+
+
+# Aggregated occurrences of a unique violation
+@dataclass
+class ViolationCount:
+    # First occurrence of the violation, formatted only when reported
+    violation: Violation
+    # Number of occurrences
+    count: int
+    # Time the violation has been seen first and last
+    first: float
+    last: float
+
+    # Formats the aggregated violation
+    def __str__(self):
+        return (
+            f"{self.count}x from {time.ctime(self.first)} to"
+            f" {time.ctime(self.last)}: {self.violation}"
+        )
+
+
+# Aggregates the violations of a stream of game states into unique violations
+class ViolationAggregator:
+    # Starts without any violations
+    def __init__(self):
+        # Aggregated occurrences of each unique violation by key
+        self.violations: dict[tuple, ViolationCount] = {}
+
+    # Adds the violations of the next game state
+    def add(self, violations, t: float = None) -> list[Violation]:
+        """
+        Counts the violations, e.g., of a game state.
+        :param violations: Iterable of violations
+        :param t: Time the violations have been seen, defaults to now
+        :return: Returns the list of violations not seen before
+        """
+        # Time defaults to now
+        t = time.time() if t is None else t
+        # Collect the violations not seen before
+        new = []
+        # Run over all violations
+        for violation in violations:
+            # Key identifying the unique violation
+            key = violation.key
+            # Count violations seen before
+            if key in self.violations:
+                self.violations[key].count += 1
+                self.violations[key].last = t
+            # Start counting new violations
+            else:
+                self.violations[key] = ViolationCount(violation, 1, t, t)
+                new.append(violation)
+        # Return the new violations
+        return new
+
+    # Formats a report of all unique violations
+    def report(self) -> list[str]:
+        """
+        Formats the aggregated violations, most frequent first.
+        :return: List of messages, one per unique violation
+        """
+        return [
+            str(c) for c in sorted(
+                self.violations.values(), key=lambda c: c.count, reverse=True
+            )
+        ]
@@ -0,0 +1,331 @@
+# Use the argparse library to set up a command line interface
+import argparse
+# Use json to load recorded and measure serialized game states
+import json
+# Rounding precisions to the number of decimal places
+import math
+# High resolution timer to measure the decoding time
+import time
+# Use dataclasses to represent the measured cost of components
+from dataclasses import dataclass, replace
+
+# Structure game state integration service configuration
+from cs_gamestate.config import GSIConfig
+# Game state components and the fields they provide
+from cs_gamestate.components import COMPONENTS, component_paths, compile_paths
+from cs_gamestate.components import select
+# Top-Level Game State Structure
+from cs_gamestate.structs.gamestate import GameState
+
+# Steps of precision to which the position and vector outputs can be coarsened
+#   Note: Vectors are of unit length, coarser than 0.1 renders them useless
+PRECISION_STEPS = {
+    "precision_position": (0.01, 0.1, 1.0, 10.0),
+    "precision_vector": (0.001, 0.01, 0.1),
+}
+# Game state fields containing positions or vectors as coordinate strings
+POSITION_FIELDS = {"position"}
+VECTOR_FIELDS = {"forward", "velocity"}
+
+
+# Average cost of a game state component per update
+@dataclass
+class ComponentCost:
+    # Number of bytes of the component as transmitted by the game
+    bytes: float = 0.0
+    # Time in seconds to parse and decode the component
+    seconds: float = 0.0
+
+
+# Loads a recording of raw game state payloads from a JSON lines file, e.g., as
+# produced by the logger utility with the "--raw" option
+def load_recording(file):
+    # Read each non-empty line as one JSON payload
+    with open(file, encoding="utf-8") as lines:
+        return [json.loads(line) for line in lines if line.strip()]
+
+
+# Serializes a payload similar to the game, i.e., indented by tabs
+def serialize(payload):
+    return json.dumps(payload, indent="\t")
+
+
+# Measures the time to parse and decode a serialized payload
+def decode_time(text):
+    # Start the timer right before parsing the JSON
+    start = time.perf_counter()
+    # Parse and decode the payload into the game state structure
+    GameState(**json.loads(text))
+    # Time elapsed since start
+    return time.perf_counter() - start
+
+
+# Measures the average cost per update of each component of a recorded stream
+#   Note: The "overhead" entry collects everything not attributed to any of the
+#       components, e.g., the enclosing braces of the structure
+def measure(payloads, components=tuple(COMPONENTS)):
+    # Compile the field paths of each component once
+    trees = {
+        name: compile_paths(component_paths([name])) for name in components
+    }
+    # Start accumulating the cost of each component at zero
+    costs = {name: ComponentCost() for name in [*components, "overhead"]}
+    # Decoding an empty payload is the baseline not attributed to components
+    #   Note: Take the median of repeated measurements as this is very short
+    baseline = sorted(decode_time("{}") for _ in range(101))[50]
+    # Accumulate the cost over all recorded payloads
+    for payload in payloads:
+        # Serialize the complete payload to get the total cost
+        text = serialize(payload)
+        # Start the overhead with the total cost and subtract each component
+        overhead = ComponentCost(len(text), decode_time(text))
+        # Measure each component separately
+        for name, tree in trees.items():
+            # Serialize just the part of the payload provided by the component
+            part = serialize(select(payload, tree))
+            # Cost of the component in isolation minus the cost of the empty
+            # payload structure
+            cost = ComponentCost(
+                len(part) - 2, max(decode_time(part) - baseline, 0.0)
+            )
+            # Accumulate the cost of the component
+            costs[name].bytes += cost.bytes
+            costs[name].seconds += cost.seconds
+            # Remove the part attributed to the component from the overhead
+            overhead.bytes -= cost.bytes
+            overhead.seconds -= cost.seconds
+        # Accumulate the remaining overhead
+        costs["overhead"].bytes += max(overhead.bytes, 0)
+        costs["overhead"].seconds += max(overhead.seconds, 0.0)
+    # Average the accumulated costs over the number of updates
+    for cost in costs.values():
+        cost.bytes /= max(len(payloads), 1)
+        cost.seconds /= max(len(payloads), 1)
+    # Return the average cost per component
+    return costs
+
+
+# Number of decimal places used to represent the precision
+def decimals(precision):
+    return max(0, -math.floor(math.log10(precision)))
+
+
+# Rounds a coordinate string to the specified precision
+def round_coordinates(value, precision):
+    # Anything not a coordinate string is left unchanged
+    if not isinstance(value, str):
+        return value
+    # Round each of the comma separated numbers to the precision
+    return ", ".join(
+        f"{round(float(x) / precision) * precision:.{decimals(precision)}f}"
+        for x in value.split(",")
+    )
+
+
+# Rounds all positions and vectors of a payload as if the game was configured
+# with coarser output precision
+def coarsen(payload, precision_position, precision_vector):
+    # Only dictionaries contain fields to be coarsened
+    if not isinstance(payload, dict):
+        return payload
+    # Collect the coarsened fields into a new dictionary
+    coarsened = {}
+    # Run over all fields of the payload
+    for key, value in payload.items():
+        # Positions are rounded to the position precision
+        if key in POSITION_FIELDS:
+            coarsened[key] = round_coordinates(value, precision_position)
+        # Vectors are rounded to the vector precision
+        elif key in VECTOR_FIELDS:
+            coarsened[key] = round_coordinates(value, precision_vector)
+        # Flames are dictionaries of flame piece positions
+        elif key == "flames" and isinstance(value, dict):
+            coarsened[key] = {
+                k: round_coordinates(v, precision_position)
+                for k, v in value.items()
+            }
+        # Descend into all other fields
+        else:
+            coarsened[key] = coarsen(
+                value, precision_position, precision_vector
+            )
+    # Return the coarsened copy of the payload
+    return coarsened
+
+
+# Maximum rate of updates per second the game sends with the configuration
+#   Note: This assumes the game state changes constantly, i.e., during an
+#       active round, which is the worst case
+def update_rate(config: GSIConfig):
+    return 1.0 / max(config.buffer + config.throttle, 1e-3)
+
+
+# Total cost per update of the components enabled in the configuration
+def total_cost(costs, config: GSIConfig):
+    # Start with the overhead which is always present
+    total = replace(costs["overhead"])
+    # Add the cost of each enabled component
+    for name, cost in costs.items():
+        # The overhead is already included, and disabled components are not
+        # transmitted at all
+        if name != "overhead" and getattr(config, name):
+            total.bytes += cost.bytes
+            total.seconds += cost.seconds
+    # Return the total cost per update
+    return total
+
+
+# Tests whether the configuration exceeds the bandwidth (bytes per second) or
+# CPU (seconds per second) budget
+def exceeds(costs, config, bandwidth=None, cpu=None):
+    # Total cost per update of the configuration
+    total = total_cost(costs, config)
+    # Rate of updates sent with the configuration
+    rate = update_rate(config)
+    # Exceeds the budget if any of the specified limits is exceeded
+    return bool(
+        (bandwidth is not None and total.bytes * rate > bandwidth)
+        or (cpu is not None and total.seconds * rate > cpu)
+    )
+
+
+# Recommends a configuration meeting the bandwidth and/or CPU budget based on a
+# recorded stream
+#   Note: Tries, in this order, to coarsen the position and vector precision,
+#       to drop the droppable components starting with the most expensive one
+#       and finally to throttle the rate of updates
+def advise(payloads, config: GSIConfig, bandwidth=None, cpu=None, droppable=()):
+    # Only positive budgets can be met by throttling the rate of updates
+    for name, budget in [("bandwidth", bandwidth), ("cpu", cpu)]:
+        if budget is not None and budget <= 0:
+            raise ValueError(f"The {name} budget must be positive: {budget}")
+    # Work on a copy of the configuration
+    config = replace(config)
+    # Measure the cost of the stream as recorded
+    costs = measure(payloads)
+    # Coarsen the precision of positions and vectors one step at a time
+    for name, steps in PRECISION_STEPS.items():
+        # Steps coarser than the currently configured precision
+        steps = [p for p in steps if p > getattr(config, name)]
+        # Try each step until the budget is met
+        for step in steps:
+            # Stop as soon as the configuration meets the budget
+            if not exceeds(costs, config, bandwidth, cpu):
+                break
+            # Coarsen the precision and measure the cost of the stream as if it
+            # was recorded with this precision
+            config = replace(config, **{name: step})
+            costs = measure([
+                coarsen(p, config.precision_position, config.precision_vector)
+                for p in payloads
+            ])
+    # Drop the droppable components starting with the most expensive one
+    for name in sorted(
+            droppable, key=lambda c: costs[c].bytes, reverse=True
+    ):
+        # Stop as soon as the configuration meets the budget
+        if not exceeds(costs, config, bandwidth, cpu):
+            break
+        # Unsubscribe from the component
+        config = replace(config, **{name: False})
+    # Finally, throttle the rate of updates to meet the budget
+    if exceeds(costs, config, bandwidth, cpu):
+        # Total cost of a single update
+        total = total_cost(costs, config)
+        # Collect the maximum rates allowed by each of the limits
+        rates = []
+        # Rate limited by the bandwidth budget
+        if bandwidth is not None and total.bytes > 0:
+            rates.append(bandwidth / total.bytes)
+        # Rate limited by the CPU budget
+        if cpu is not None and total.seconds > 0:
+            rates.append(cpu / total.seconds)
+        # Throttle such that the buffer plus the throttle period corresponds
+        # to the smallest of the rates, rounded up to not exceed the budget
+        #   Note: Without any rates, nothing in the updates costs anything
+        if rates:
+            config.throttle = math.ceil(100 * max(
+                config.throttle, 1.0 / min(rates) - config.buffer
+            )) / 100
+    # Return the recommended configuration and the cost of the stream under
+    # this configuration
+    return config, costs
+
+
+# Script entrypoint for command line execution
+if __name__ == "__main__":
+    # Create a new command line parser
+    parser = argparse.ArgumentParser()
+    # Mandatory arguments to configure the recording, name and address of the
+    # service
+    parser.add_argument(
+        "recording", type=str, help="JSON lines file of raw game states"
+    )
+    parser.add_argument(
+        "name", type=str, help="Unique name to identify the service"
+    )
+    parser.add_argument(
+        "uri", type=str, help="Address of the endpoint including port and path"
+    )
+    # Budget to be met by the recommended configuration
+    budget = parser.add_argument_group("Budget")
+    budget.add_argument(
+        "--bandwidth", type=float, default=None, help="Bytes per second"
+    )
+    budget.add_argument(
+        "--cpu", type=float, default=None, help="Decoding seconds per second"
+    )
+    # Components which may be unsubscribed to meet the budget
+    parser.add_argument(
+        "--droppable", nargs="*", default=[], choices=list(COMPONENTS),
+        help="Components which may be dropped to meet the budget"
+    )
+    # Rate configuration the recording has been made with
+    parser.add_argument("--timeout", type=float, default=1.1)
+    parser.add_argument("--buffer", type=float, default=0.1)
+    parser.add_argument("--throttle", type=float, default=0.1)
+    parser.add_argument("--heartbeat", type=float, default=30.0)
+    parser.add_argument("--precision_position", type=float, default=0.1)
+    parser.add_argument("--precision_vector", type=float, default=0.1)
+
+    # Collect and parse the arguments supplied via command line
+    args = parser.parse_args()
+    # Reject budgets which cannot be met before loading the recording
+    for option in ["bandwidth", "cpu"]:
+        if getattr(args, option) is not None and getattr(args, option) <= 0:
+            parser.error(f"--{option} must be positive")
+    # Load the recording of raw game states
+    recording = load_recording(args.recording)
+    # Start from the configuration the recording has been made with
+    initial = GSIConfig(
+        name=args.name, uri=args.uri, timeout=args.timeout, buffer=args.buffer,
+        throttle=args.throttle, heartbeat=args.heartbeat,
+        precision_position=args.precision_position,
+        precision_vector=args.precision_vector
+    )
+    # Derive the recommended configuration meeting the budget
+    recommended, measured = advise(
+        recording, initial, args.bandwidth, args.cpu, args.droppable
+    )
+    # Print the generated configuration file
+    print(recommended.generate_cfg())
+    # Print the measured cost of each component as comments
+    print("// Average cost per update of each component:")
+    # One line per component, disabled components are marked as such
+    for component, c in measured.items():
+        # Components unsubscribed by the recommendation
+        dropped = component != "overhead" and not getattr(
+            recommended, component
+        )
+        # Format bytes and decoding time in milliseconds
+        print(
+            f"//   {component}: {c.bytes:.0f} bytes, {1e3 * c.seconds:.3f} ms"
+            f"{' (dropped)' if dropped else ''}"
+        )
+    # Print the estimated total cost per second of the recommendation
+    estimate = total_cost(measured, recommended)
+    print(
+        f"// Estimated at most {update_rate(recommended):.1f} updates/s:"
+        f" {estimate.bytes * update_rate(recommended):.0f} bytes/s,"
+        f" {estimate.seconds * update_rate(recommended):.4f} CPU s/s"
+    )
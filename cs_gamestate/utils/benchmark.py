@@ -0,0 +1,157 @@
+# Use the argparse library to set up a command line interface
+import argparse
+# Use json to serialize the synthesized game states
+import json
+# Number of processors available to scale to
+import os
+# High resolution timer to measure the throughput
+import time
+
+# Top-Level Game State Structure decoded per record or in batches
+from cs_gamestate.structs.gamestate import GameState
+# Pool of worker processes decoding game states
+from cs_gamestate.pool import DecodePool, decode
+# Realistic game state streams for benchmarking
+from cs_gamestate.utils.synthetic import synthesize
+
+
+# Measures the decoding throughput of a pool with the given number of workers
+def bench_pool(texts, feeds, workers, verify, states):
+    # Start the pool outside the timed section, spawning processes is slow
+    with DecodePool(workers, verify=verify, states=states) as pool:
+        # Warm up the workers by decoding one game state each
+        list(pool.map(texts[:workers], chunksize=1))
+        # Start the timer right before submitting the first game state
+        start = time.perf_counter()
+        # Interleave the game states of all feeds as they would arrive
+        for index, text in enumerate(texts):
+            pool.submit(index % feeds, text)
+        # Wait for all results of all feeds in order
+        count = sum(
+            len(pool.results(feed, block=True)) for feed in range(feeds)
+        )
+        # Game states decoded per second
+        return count / (time.perf_counter() - start)
+
+
+# Measures the decoding throughput within the calling process
+def bench_serial(texts, verify, states):
+    # Start the timer right before decoding the first game state
+    start = time.perf_counter()
+    # Decode all game states one after another
+    for text in texts:
+        decode(text, verify, states)
+    # Game states decoded per second
+    return len(texts) / (time.perf_counter() - start)
+
+
+# Measures decoding the records one by one against decoding them in batches
+def bench_batch(payloads, chunk):
+    # Ways of decoding a chunk of records, one by one as baseline
+    ways = {
+        "record": lambda records: [GameState(**record) for record in records],
+        "batch": lambda records: GameState.from_many(records),
+        "paused": lambda records: GameState.from_many(records, pause_gc=True),
+        "shared": lambda records: GameState.from_many(records, share=True),
+        "arrays": lambda records: GameState.from_many(records, arrays=True),
+    }
+    # Rates of each way of decoding in records per second
+    rates = {}
+    for name, way in ways.items():
+        # Warm up outside the timed section, e.g., for lazy imports
+        way(payloads[:1])
+        # Start the timer right before decoding the first chunk
+        start = time.perf_counter()
+        # Decode all records chunk by chunk
+        for offset in range(0, len(payloads), chunk):
+            way(payloads[offset:offset + chunk])
+        # Records decoded per second
+        rates[name] = len(payloads) / (time.perf_counter() - start)
+    # Return the rates of all ways of decoding
+    return rates
+
+
+# Script entrypoint for command line execution
+if __name__ == "__main__":
+    # Create a new command line parser
+    parser = argparse.ArgumentParser()
+    # Each benchmark is a separate sub-command
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    # Benchmark of decoding multiple feeds via the process pool
+    pool_parser = commands.add_parser(
+        "pool", help="Scaling of process pool decoding with workers"
+    )
+    pool_parser.add_argument(
+        "--count", type=int, default=2000, help="Number of game states"
+    )
+    pool_parser.add_argument(
+        "--feeds", type=int, default=20, help="Number of simultaneous feeds"
+    )
+    pool_parser.add_argument(
+        "--workers", type=int, nargs="*", default=None,
+        help="Numbers of worker processes to measure"
+    )
+    pool_parser.add_argument(
+        "--verify", action="store_true", help="Verify each game state"
+    )
+    pool_parser.add_argument(
+        "--no-states", action="store_true",
+        help="Do not transfer decoded game states back, only verification"
+    )
+
+    # Benchmark of decoding offline datasets per record and in batches
+    batch_parser = commands.add_parser(
+        "batch", help="Per record against batch decoding of datasets"
+    )
+    batch_parser.add_argument(
+        "--count", type=int, default=100000,
+        help="Number of synthetic game states if no file is given"
+    )
+    batch_parser.add_argument(
+        "--file", type=str, default=None,
+        help="JSON lines file of recorded game states to decode instead"
+    )
+    batch_parser.add_argument(
+        "--chunk", type=int, default=10000,
+        help="Number of game states decoded per batch"
+    )
+
+    # Collect and parse the arguments supplied via command line
+    args = parser.parse_args()
+
+    # Benchmark of decoding multiple feeds via the process pool
+    if args.command == "pool":
+        # Synthesize the raw JSON text of the game states once
+        payloads = [json.dumps(p) for p in synthesize(args.count)]
+        # Measure up to the number of processors by default
+        workers = args.workers or sorted({1, 2, 4, 8, os.cpu_count() or 1})
+        # Baseline throughput of decoding in the calling process
+        serial = bench_serial(payloads, args.verify, not args.no_states)
+        print(f"serial: {serial:.0f} states/s")
+        # Measure each pool size
+        for n in workers:
+            # Throughput of the pool of this size
+            rate = bench_pool(
+                payloads, args.feeds, n, args.verify, not args.no_states
+            )
+            # Report the throughput and speedup relative to serial decoding
+            print(f"{n} workers: {rate:.0f} states/s ({rate / serial:.2f}x)")
+
+    # Benchmark of decoding offline datasets per record and in batches
+    if args.command == "batch":
+        # Read the recorded game states from file if specified
+        if args.file is not None:
+            with open(args.file) as file:
+                payloads = [json.loads(line) for line in file if line.strip()]
+        # Synthesize the game states otherwise
+        else:
+            payloads = list(synthesize(args.count))
+        # Measure all ways of decoding the same game states
+        rates = bench_batch(payloads, args.chunk)
+        # Report the throughput and speedup relative to per record decoding
+        for name, rate in rates.items():
+            print(
+                f"{name}: {rate:.0f} states/s"
+                f" ({rate / rates['record']:.2f}x)"
+            )
@@ -0,0 +1,206 @@
+# Use the argparse library to set up a command line interface
+import argparse
+# HTTP connection of each simulated game client, reused if kept alive
+import http.client
+# Use json to serialize the synthesized game states
+import json
+# Seeded random numbers deciding whether the game state changed
+import random
+# Detect the game waiting for the response in vain
+import socket
+# Run each simulated game client in a separate thread
+import threading
+# High resolution timer to measure the latencies
+import time
+# Collect the measurements of each simulated game client
+from dataclasses import dataclass, field
+# Split the endpoint address into host, port and path
+from urllib.parse import urlsplit
+
+# Latency percentiles over all requests
+import numpy as np
+
+# Structure game state integration service configuration, providing the rates
+from cs_gamestate.config import GSIConfig
+# Realistic game state streams to post
+from cs_gamestate.utils.synthetic import synthesize
+
+
+# Measurements of a single simulated game client
+@dataclass
+class ClientResults:
+    # Latencies of the requests answered with "OK", in seconds
+    latencies: list[float] = field(default_factory=list)
+    # Number of requests sent
+    sent: int = 0
+    # Number of requests not answered within the timeout of the game
+    timeouts: int = 0
+    # Number of requests answered with any other status than 200
+    rejected: int = 0
+    # Number of requests failed due to connection errors
+    errors: int = 0
+
+
+# Simulates a game posting game states at the configured rates until stopped
+def client(url, config: GSIConfig, bodies, activity, seed, stop, results):
+    # Address of the endpoint
+    parts = urlsplit(url)
+    # Seeded random numbers making the changes reproducible
+    rng = random.Random(seed)
+    # Connection reused for all requests, None if not connected
+    connection = None
+    # Index of the next changed game state and the body sent last
+    index, body = 0, bodies[0]
+    # Time of the last request, the first one is sent right away
+    last = -float("inf")
+    # Run until stopped
+    while not stop.is_set():
+        # The game collects events for the buffer period before sending
+        if stop.wait(config.buffer):
+            break
+        # Something changed during the buffer period with the activity as
+        # probability, e.g., players moving during a live round
+        if rng.random() < activity:
+            # Send the next game state
+            body, index = bodies[index % len(bodies)], index + 1
+        # Nothing changed and no heartbeat due: Keep collecting events
+        elif time.monotonic() - last < config.heartbeat:
+            continue
+        # Connect if there is no connection yet
+        if connection is None:
+            connection = http.client.HTTPConnection(
+                parts.hostname, parts.port, timeout=config.timeout
+            )
+        # Post the game state and wait for the response like the game does
+        last = time.monotonic()
+        start = time.perf_counter()
+        results.sent += 1
+        try:
+            connection.request(
+                "POST", parts.path or "/", body,
+                {"Content-Type": "application/json"}
+            )
+            response = connection.getresponse()
+            response.read()
+            # Only "OK" responses count as delivered
+            if response.status == 200:
+                results.latencies.append(time.perf_counter() - start)
+            else:
+                results.rejected += 1
+            # The endpoint closes the connection after this response
+            if response.will_close:
+                connection.close()
+                connection = None
+        # The endpoint did not respond within the timeout of the game
+        except socket.timeout:
+            results.timeouts += 1
+            connection.close()
+            connection = None
+        # Connection broken or refused, wait before trying again
+        except (OSError, http.client.HTTPException):
+            results.errors += 1
+            connection.close()
+            connection = None
+            stop.wait(config.timeout)
+            continue
+        # The game does not send again within the throttle period
+        stop.wait(config.throttle)
+    # Disconnect when stopped
+    if connection is not None:
+        connection.close()
+
+
+# Script entrypoint for command line execution
+if __name__ == "__main__":
+    # Create a new command line parser
+    parser = argparse.ArgumentParser()
+    # Mandatory argument configuring the endpoint under load
+    parser.add_argument(
+        "url", type=str, help="Address of the endpoint including port and path"
+    )
+    # Optional arguments configuring the simulated game clients
+    parser.add_argument(
+        "--clients", type=int, default=10,
+        help="Number of simulated game clients posting simultaneously"
+    )
+    parser.add_argument(
+        "--duration", type=float, default=30.0,
+        help="Seconds to run the load for"
+    )
+    parser.add_argument(
+        "--activity", type=float, default=1.0,
+        help="Probability of the game state changing within a buffer period"
+    )
+    parser.add_argument(
+        "--states", type=int, default=100,
+        help="Number of distinct game states synthesized per client"
+    )
+    parser.add_argument(
+        "--token", type=str, default=None,
+        help="Authentication token sent with each game state"
+    )
+    # Rate and timeout of each client as configured for the game
+    rates = parser.add_argument_group("Rate and timeout")
+    rates.add_argument("--timeout", type=float, default=1.1)
+    rates.add_argument("--buffer", type=float, default=0.1)
+    rates.add_argument("--throttle", type=float, default=0.1)
+    rates.add_argument("--heartbeat", type=float, default=30.0)
+    # Collect and parse the arguments supplied via command line
+    args = parser.parse_args()
+
+    # Configuration of the game clients
+    config = GSIConfig(
+        "loadgen", args.url, timeout=args.timeout, buffer=args.buffer,
+        throttle=args.throttle, heartbeat=args.heartbeat, token=args.token
+    )
+    # Signals the clients to stop
+    stop = threading.Event()
+    # Measurements and threads of each client
+    results, threads = [], []
+    # Set up each client with its own stream of game states
+    for seed in range(args.clients):
+        # Synthesize the raw JSON bodies once, outside the measurement
+        payloads = list(synthesize(args.states, seed=seed))
+        # Authenticate each game state if configured
+        if config.token is not None:
+            for payload in payloads:
+                payload["auth"] = {"token": config.token}
+        bodies = [json.dumps(payload).encode() for payload in payloads]
+        # Measurements of this client
+        results.append(ClientResults())
+        threads.append(threading.Thread(
+            target=client, daemon=True, args=(
+                args.url, config, bodies, args.activity, seed, stop,
+                results[-1]
+            )
+        ))
+    # Run all clients for the duration
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    time.sleep(args.duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    # Sum up the measurements of all clients
+    sent = sum(r.sent for r in results)
+    timeouts = sum(r.timeouts for r in results)
+    rejected = sum(r.rejected for r in results)
+    errors = sum(r.errors for r in results)
+    # Latencies of all delivered game states in milliseconds
+    latencies = 1e3 * np.array([t for r in results for t in r.latencies])
+    # Report the throughput and the failures
+    print(
+        f"clients: {args.clients}, sent: {sent}, ok: {len(latencies)},"
+        f" timeouts: {timeouts}, rejected: {rejected}, errors: {errors}"
+    )
+    print(f"throughput: {len(latencies) / elapsed:.1f} states/s")
+    # Report the latency percentiles if anything has been delivered
+    if len(latencies):
+        p50, p90, p99 = np.percentile(latencies, [50, 90, 99])
+        print(
+            f"latency: p50 {p50:.1f} ms, p90 {p90:.1f} ms, p99 {p99:.1f} ms,"
+            f" max {latencies.max():.1f} ms"
+        )
@@ -9,6 +9,8 @@ from dataclasses import asdict
 
 # Game state integration endpoint server
 from cs_gamestate.endpoint import GSIServer
+# Aggregates the verification failures into unique violations
+from cs_gamestate.structs.verify import ViolationAggregator
 
 # Script entrypoint for command line execution
 if __name__ == "__main__":
@@ -25,9 +27,25 @@ if __name__ == "__main__":
     parser.add_argument(
         "--json", action="store_true", help="Format output as JSON"
     )
+    # Optional argument specifying raw payload output, e.g., for recording
+    parser.add_argument(
+        "--raw", action="store_true", help="Output the raw JSON payload"
+    )
+    # Optional argument suppressing unchanged game states, e.g., heartbeats
+    parser.add_argument(
+        "--deduplicate", action="store_true",
+        help="Ignore game states identical to the previous one"
+    )
+    # Optional argument rejecting requests without the authentication token
+    parser.add_argument(
+        "--token", type=str, default=None,
+        help="Reject game states not carrying this authentication token"
+    )
     # Optional argument specifying game state verification output
     parser.add_argument(
-        "--verify", action="store_true", help="Verifies each gamestate"
+        "--verify", action="store_true",
+        help="Verifies each gamestate, reporting each unique violation once"
+        " and a summary of all violations with their counts on exit"
     )
     # Collect and parse the arguments supplied via command line
     args = parser.parse_args()  # @formatter:off Inserts too many newlines here
@@ -41,15 +59,41 @@ if __name__ == "__main__":
     # @formatter:on
 
     # Create an endpoint listening on the specified path and port
-    server = GSIServer(path=args.path, port=args.port)
+    server = GSIServer(
+        path=args.path, port=args.port, deduplicate=args.deduplicate,
+        token=args.token
+    )
+    # Counts the violations to report each unique violation only once
+    aggregator = ViolationAggregator()
     # Log until terminated, e.g., via CTRL+C
-    while True:
-        # Read the next game state received by the server
-        #   Reset the state buffer and block to only receive unique new states
-        state = server.read(reset=True, block=True)
-        # Optionally verify the gema state
-        if args.verify:
-            # Print verification to standard error
-            print("\n".join(state.verify()), file=sys.stderr)
-        # Log the state as string representation to the console output
-        print(maybe_json(state))
+    try:
+        while True:
+            # Raw output skips decoding and verification of the game state
+            if args.raw:
+                # Print the received payload as a single line of JSON
+                print(json.dumps(
+                    server.read(reset=True, block=True, decode=False)
+                ))
+                # Continue with the next game state
+                continue
+            # Read the next game state received by the server
+            #   Reset the state buffer and block to only receive unique new
+            #   states
+            state = server.read(reset=True, block=True)
+            # Optionally verify the gema state
+            if args.verify:
+                # Print violations not seen before to standard error
+                for violation in aggregator.add(state.violations()):
+                    print(violation, file=sys.stderr)
+            # Log the state as string representation to the console output
+            print(maybe_json(state))
+    # Terminated via CTRL+C: Exit quietly after the summary
+    except KeyboardInterrupt:
+        pass
+    # Summarize the violations with their counts and first and last seen
+    # game state when terminated
+    finally:
+        if args.verify and aggregator.violations:
+            print("Violations:", file=sys.stderr)
+            for line in aggregator.report():
+                print(line, file=sys.stderr)
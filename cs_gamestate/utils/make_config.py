@@ -42,6 +42,11 @@ if __name__ == "__main__":
     continuous.add_argument("--precision_time", type=float, default=0.01)
     continuous.add_argument("--precision_position", type=float, default=0.1)
     continuous.add_argument("--precision_vector", type=float, default=0.1)
+    # Optional token authenticating the game at the endpoint
+    parser.add_argument(
+        "--token", type=str, default=None,
+        help="Token sent with each game state to authenticate at the endpoint"
+    )
     # Discrete flags subscribing to specific information components
     discrete = parser.add_argument_group(
         "Game state components to subscribe to"
@@ -0,0 +1,93 @@
+# Use the argparse library to set up a command line interface
+import argparse
+# Wait between the reports of the forwarding rates
+import time
+
+# Game state integration endpoint server
+from cs_gamestate.endpoint import GSIServer
+# Compressing relay forwarding the game states to a remote endpoint, either
+# one by one or in batches
+from cs_gamestate.relay import GSIRelay, GSIForwarder
+
+# Script entrypoint for command line execution
+if __name__ == "__main__":
+    # Create a new command line parser
+    parser = argparse.ArgumentParser()
+    # Mandatory arguments to configure the address to listen on
+    parser.add_argument(
+        "path", type=str, help="Path component of the endpoint address"
+    )
+    parser.add_argument(
+        "port", type=int, help="Port on which the server listens"
+    )
+    # Mandatory argument configuring the remote endpoint to forward to
+    parser.add_argument(
+        "url", type=str, help="Address of the remote endpoint to forward to"
+    )
+    # Optional arguments configuring the compression
+    parser.add_argument(
+        "--encoding", type=str, default="gzip",
+        choices=["gzip", "deflate", "none"], help="Content encoding"
+    )
+    parser.add_argument(
+        "--level", type=int, default=6, help="Compression level from 1 to 9"
+    )
+    # Optional argument rejecting requests without the authentication token
+    # and inserting it into the forwarded game states
+    parser.add_argument(
+        "--token", type=str, default=None,
+        help="Authentication token expected from the game and forwarded"
+    )
+    # Optional arguments forwarding batches of game states to a collector
+    parser.add_argument(
+        "--batch-size", type=int, default=None,
+        help="Forward batches of up to this many game states to a collector"
+    )
+    parser.add_argument(
+        "--window", type=float, default=1.0,
+        help="Seconds to wait for a batch to fill up"
+    )
+    parser.add_argument(
+        "--spool", type=str, default=None,
+        help="Directory to spool batches to while the collector is down"
+    )
+    parser.add_argument(
+        "--batch-bytes", type=int, default=1 << 20,
+        help="Split batches larger than this many bytes, uncompressed"
+    )
+    # Optional argument setting the interval of the reports
+    parser.add_argument(
+        "--interval", type=float, default=10.0,
+        help="Seconds between the reports of the forwarding rates"
+    )
+    # Collect and parse the arguments supplied via command line
+    args = parser.parse_args()
+
+    # Create an endpoint listening on the specified path and port
+    server = GSIServer(path=args.path, port=args.port, token=args.token)
+    # Content encoding of the forwarded game states
+    encoding = None if args.encoding == "none" else args.encoding
+    # Forward batches of the received game states to the remote collector
+    if args.batch_size is not None:
+        relay = GSIForwarder(
+            args.url, server, args.batch_size, args.window, args.spool,
+            encoding, args.level, args.token, batch_bytes=args.batch_bytes
+        )
+    # Forward each received game state to the remote endpoint
+    else:
+        relay = GSIRelay(args.url, server, encoding, args.level, args.token)
+    # Report the forwarding rates until terminated, e.g., via CTRL+C
+    while True:
+        # Wait for the next report
+        time.sleep(args.interval)
+        # Forwarding rates since the start
+        stats = relay.stats()
+        # Print the rates and the bandwidth saved by compression
+        print(
+            f"sent: {stats['sent']}, failed: {stats['failed']},"
+            f" dropped: {stats['dropped']}, rejected: {stats['rejected']},"
+            f" raw: {stats['raw_rate']:.0f} B/s,"
+            f" compressed: {stats['sent_rate']:.0f} B/s,"
+            f" saved: {100 * stats['saved']:.1f}%"
+            + (f", spooled: {stats['spooled']}" if "spooled" in stats else "")
+        )
@@ -0,0 +1,245 @@
+# Copy the evolving game state for each produced game state
+import copy
+# Seeded random numbers to produce reproducible streams
+import random
+# Time stamps of the produced game states
+import time
+
+# Weapons typically carried by the players, grouped into loadouts by team
+LOADOUTS = {
+    "CT": [
+        ("weapon_knife", "Knife", None),
+        ("weapon_usp_silencer", "Pistol", (12, 24)),
+        ("weapon_m4a1_silencer", "Rifle", (20, 80)),
+        ("weapon_smokegrenade", "Grenade", None),
+        ("weapon_flashbang", "Grenade", None),
+    ],
+    "T": [
+        ("weapon_knife_t", "Knife", None),
+        ("weapon_glock", "Pistol", (20, 120)),
+        ("weapon_ak47", "Rifle", (30, 90)),
+        ("weapon_molotov", "Grenade", None),
+        ("weapon_hegrenade", "Grenade", None),
+    ],
+}
+
+
+# Formats a coordinate tuple as the game does
+def coordinates(*values):
+    return ", ".join(f"{v:.2f}" for v in values)
+
+
+# Parses a coordinate string produced by coordinates
+def parse(value):
+    return [float(v) for v in value.split(",")]
+
+
+# Collects the changes between two game states as the game reports them, i.e.,
+# the previous values of changed or removed fields and the added fields
+def changes(old, new):
+    # Previous values of changed fields and the fields added since
+    previously, added = {}, {}
+    # Run over the fields of the old game state
+    for key, value in old.items():
+        # Removed fields are reported with their previous value
+        if key not in new:
+            previously[key] = value
+        # Changed substructures are reported by their changed fields
+        elif isinstance(value, dict) and isinstance(new[key], dict):
+            p, a = changes(value, new[key])
+            if p:
+                previously[key] = p
+            if a:
+                added[key] = a
+        # Changed values are reported with their previous value
+        elif value != new[key]:
+            previously[key] = value
+    # Added fields are only flagged
+    for key in new:
+        if key not in old:
+            added[key] = True
+    # Return both parts of the change information
+    return previously, added
+
+
+# Produces the weapons of a player
+def weapons(team, rng):
+    # Collect the weapon slots into a dictionary
+    slots = {}
+    # Run over the loadout of the team
+    for index, (name, kind, ammo) in enumerate(LOADOUTS[team]):
+        # Every weapon has a name, skin and type
+        weapon = {"name": name, "paintkit": "default", "type": kind}
+        # Firearms have ammunition
+        if ammo is not None:
+            weapon["ammo_clip"] = rng.randint(0, ammo[0])
+            weapon["ammo_clip_max"] = ammo[0]
+            weapon["ammo_reserve"] = ammo[1]
+        # The rifle is the active weapon
+        weapon["state"] = "active" if kind == "Rifle" else "holstered"
+        # Insert the weapon at its slot
+        slots[f"weapon_{index}"] = weapon
+    # Return the weapon slots
+    return slots
+
+
+# Produces the information on a single player
+def player(slot, team, rng):
+    return {
+        "name": f"Player {slot}",
+        "observer_slot": slot,
+        "team": team,
+        "state": {
+            "health": 100, "armor": 100,
+            "helmet": True, "flashed": 0, "smoked": 0, "burning": 0,
+            "money": rng.randrange(0, 16000, 50), "round_kills": 0,
+            "round_killhs": 0, "round_totaldmg": 0, "equip_value": 4700
+        },
+        "match_stats": {
+            "kills": rng.randint(0, 20), "assists": rng.randint(0, 10),
+            "deaths": rng.randint(0, 20), "mvps": rng.randint(0, 5),
+            "score": rng.randint(0, 50)
+        },
+        "weapons": weapons(team, rng),
+        "position": coordinates(
+            rng.uniform(-2000, 2000), rng.uniform(-2000, 2000), 0
+        ),
+        "forward": coordinates(rng.uniform(-1, 1), rng.uniform(-1, 1), 0),
+    }
+
+
+# Advances the game state by one update during an active round: Alive players
+# move and look around, now and then a player fires or takes damage, burning
+# grenades age and the round timer runs down
+def advance(state, rng):
+    # Run over all players
+    for steamid, info in state["allplayers"].items():
+        # Dead players do not move
+        if not info["state"]["health"]:
+            continue
+        # Move a few units and turn a bit
+        x, y, z = parse(info["position"])
+        info["position"] = coordinates(
+            x + rng.uniform(-20, 20), y + rng.uniform(-20, 20), z
+        )
+        dx, dy, _ = parse(info["forward"])
+        info["forward"] = coordinates(
+            dx + rng.uniform(-0.1, 0.1), dy + rng.uniform(-0.1, 0.1), 0
+        )
+        # Now and then the player fires the active weapon
+        if rng.random() < 0.05:
+            for weapon in info["weapons"].values():
+                if weapon["state"] == "active" and weapon.get("ammo_clip"):
+                    weapon["ammo_clip"] -= 1
+        # Rarely the player takes damage
+        if rng.random() < 0.002:
+            player_state = info["state"]
+            damage = rng.randint(1, 60)
+            player_state["health"] = max(player_state["health"] - damage, 0)
+            player_state["armor"] = max(player_state["armor"] - damage // 2, 0)
+            player_state["round_totaldmg"] += damage
+    # Burning grenades age
+    for grenade in state["grenades"].values():
+        grenade["lifetime"] = f"{float(grenade['lifetime']) + 0.1:.1f}"
+    # The round timer runs down
+    countdowns = state["phase_countdowns"]
+    countdowns["phase_ends_in"] = (
+        f"{max(float(countdowns['phase_ends_in']) - 0.1, 0):.1f}"
+    )
+
+
+# Produces a stream of observer game states similar to those sent by the game
+# during an active round with everything subscribed, each game state evolving
+# from the previous one with the change information reporting exactly what
+# changed
+def synthesize(count, seed=0, grenades=3, flames=20):
+    # Seeded random number generator making the stream reproducible
+    rng = random.Random(seed)
+    # Steam IDs of the ten players, the first five are counter-terrorists
+    steamids = [f"765611980000000{i:02d}" for i in range(10)]
+    # Time of the first game state
+    start = time.time()
+    # Game state evolving over the stream, without provider information as it
+    # is not covered by the change information
+    state = {
+        "map": {
+            "mode": "competitive", "name": "de_mirage", "phase": "live",
+            "round": 12,
+            "team_ct": {
+                "score": 7, "consecutive_round_losses": 0,
+                "timeouts_remaining": 1, "matches_won_this_series": 0
+            },
+            "team_t": {
+                "score": 4, "consecutive_round_losses": 2,
+                "timeouts_remaining": 1, "matches_won_this_series": 0
+            },
+            "num_matches_to_win_series": 0, "current_spectators": 0,
+            "souvenirs_total": 0,
+            "round_wins": {
+                str(r): rng.choice(["ct_win_elimination", "t_win_bomb"])
+                for r in range(1, 12)
+            },
+        },
+        "round": {"phase": "live"},
+        # Information on all players keyed by steam ID
+        "allplayers": {
+            steamid: player(slot, "CT" if slot < 5 else "T", rng)
+            for slot, steamid in enumerate(steamids)
+        },
+        "grenades": {
+            str(100 + g): {
+                "owner": rng.choice(steamids),
+                "position": coordinates(rng.uniform(-2000, 2000), 0, 0),
+                "velocity": coordinates(0, 0, 0),
+                "lifetime": f"{rng.uniform(0, 7):.1f}",
+                "type": "inferno",
+                "flames": {
+                    f"flame_{g}_{f}": coordinates(
+                        rng.uniform(-2000, 2000), 0, 0
+                    )
+                    for f in range(flames)
+                },
+            }
+            for g in range(grenades)
+        },
+        "bomb": {
+            "state": "carried", "position": coordinates(0, 0, 0),
+            "player": steamids[5]
+        },
+        "phase_countdowns": {"phase": "live", "phase_ends_in": "115.0"},
+    }
+    # Game state produced last, nothing changed before the first one
+    last = None
+    # Produce the requested number of game states
+    for index in range(count):
+        # Advance all but the first game state
+        if index:
+            advance(state, rng)
+        # The observer is spectating one of the players
+        spectated = steamids[index // 50 % 10]
+        state["player"] = {
+            "steamid": spectated, "spectarget": spectated,
+            **state["allplayers"][spectated]
+        }
+        # Independent copy of the game state, the consumers may modify it
+        current = copy.deepcopy(state)
+        # Change information relative to the game state produced last
+        previously, added = changes(last, current) if last else ({}, {})
+        last = copy.deepcopy(current)
+        # Provider information of the game, updates are sent about ten times
+        # per second
+        current = {
+            "provider": {
+                "name": "Counter-Strike: Global Offensive", "appid": 730,
+                "version": 13800, "steamid": "76561198999999999",
+                "timestamp": int(start + index / 10)
+            },
+            **current
+        }
+        # Attach the change information if anything changed
+        if previously:
+            current["previously"] = previously
+        if added:
+            current["added"] = added
+        # Yield the complete game state
+        yield current
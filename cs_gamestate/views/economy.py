@@ -0,0 +1,208 @@
+# Postponed evaluation of annotations, allows to type-hint methods with their
+# own enclosing class type
+from __future__ import annotations
+# Use dataclasses to represent the economy of each team
+from dataclasses import dataclass
+
+# Enumeration of string values
+from cs_gamestate.enums.utils import StrEnum
+# Top-Level Game State Structure
+from cs_gamestate.structs.gamestate import GameState
+# Player information substructure of the game state
+from cs_gamestate.structs.player import Player
+
+# Maximum amount of money a player can have
+MAX_MONEY = 16000
+# Money awarded to each player of the losing team, depending on the number of
+# consecutive round losses (capped at the last value)
+LOSS_BONUS = (1400, 1900, 2400, 2900, 3400)
+# Average equipment value per player from which a buy is considered a force buy
+# or a full buy
+FORCE_BUY_VALUE = 1500
+FULL_BUY_VALUE = 3500
+# Weapon types counted as primary weapons
+PRIMARY_TYPES = {
+    "Rifle", "SniperRifle", "Submachine Gun", "Shotgun", "Machine Gun"
+}
+
+
+# Classification of the buy of a team
+class BuyType(StrEnum):
+    ECO = "eco"
+    FORCE = "force"
+    FULL = "full"
+
+
+# Money awarded to each player after losing the next round
+def loss_bonus(consecutive_round_losses: int) -> int:
+    return LOSS_BONUS[min(consecutive_round_losses, len(LOSS_BONUS) - 1)]
+
+
+# Economy of a single team, maintained incrementally from the players
+@dataclass
+class TeamEconomy:
+    # Total money of all players of the team
+    bank: int = 0
+    # Total value of the equipment of all players of the team
+    equip_value: int = 0
+    # Number of players of the team
+    players: int = 0
+    # Number of players carrying a primary weapon
+    primaries: int = 0
+    # Money awarded to each player after losing the next round
+    loss_bonus: int = LOSS_BONUS[0]
+    # Predicted minimum total money of the team in the next round, i.e., if the
+    # team loses and nobody spends anything
+    minimum_next: int = 0
+
+    # Classification of the current buy from the average equipment value
+    @property
+    def buy(self) -> BuyType | None:
+        # Nothing to classify without players
+        if not self.players:
+            return None
+        # Average equipment value per player
+        average = self.equip_value / self.players
+        # Below the force buy value, the team is saving
+        if average < FORCE_BUY_VALUE:
+            return BuyType.ECO
+        # Below the full buy value, the team is forcing
+        if average < FULL_BUY_VALUE:
+            return BuyType.FORCE
+        # Otherwise the team is fully equipped
+        return BuyType.FULL
+
+
+# Contribution of a single player to the economy of the team
+@dataclass
+class _Contribution:
+    # Team the player belongs to
+    team: str
+    # Money of the player
+    money: int
+    # Value of the equipment of the player
+    equip_value: int
+    # Whether the player carries a primary weapon
+    primary: bool
+
+    # Derives the contribution from the player information
+    @staticmethod
+    def of(player: Player) -> _Contribution | None:
+        # Players without team or state do not contribute
+        if player is None or player.team is None or player.state is None:
+            return None
+        # Weapons carried by the player, if any
+        weapons = player.weapons if isinstance(player.weapons, dict) else {}
+        # Types of the weapons carried by the player
+        types = {w.type for w in weapons.values() if w is not None}
+        # Collect the contribution of the player
+        return _Contribution(
+            str(player.team), player.state.money or 0,
+            player.state.equip_value or 0, bool(types & PRIMARY_TYPES)
+        )
+
+
+# Tracks the economy of both teams incrementally from the game states
+class EconomyTracker:
+    # Starts with empty teams
+    def __init__(self):
+        # Economy of each team by team name
+        self.teams = {"T": TeamEconomy(), "CT": TeamEconomy()}
+        # Contribution of each player by steam ID, None for players present
+        # but not contributing, e.g., without team
+        self.players: dict[str, _Contribution | None] = {}
+        # Player information each contribution has been derived from, to skip
+        # unchanged players by identity, e.g., with Decoder(share=True)
+        self.sources: dict[str, Player] = {}
+
+    # Adds or removes the contribution of a player to the team economy
+    def _apply(self, c: _Contribution | None, sign: int):
+        # Non-contributing players and teams other than T and CT are not
+        # tracked
+        if c is None or c.team not in self.teams:
+            return
+        # Economy of the team of the player
+        team = self.teams[c.team]
+        # Add or subtract the contribution
+        team.bank += sign * c.money
+        team.equip_value += sign * c.equip_value
+        team.players += sign
+        team.primaries += sign * c.primary
+        team.minimum_next += sign * min(MAX_MONEY, c.money + team.loss_bonus)
+
+    # Steam IDs of the players which changed in this game state
+    def changed(self, state: GameState):
+        # Without information on all players nothing can change
+        if state.allplayers is None:
+            return []
+        # Players which left since the last game state
+        changed = {key for key in self.players if key not in state.allplayers}
+        # Players which joined or whose information is not the same object
+        # as last time
+        #   Note: The change information of the game is not relied upon, a
+        #       missed game state, e.g., dropped by a full subscription, would
+        #       leave the economy wrong until the players change again
+        changed.update(
+            key for key, player in state.allplayers.items()
+            if key not in self.sources or player is not self.sources[key]
+        )
+        # Return the steam IDs of the changed players
+        return changed
+
+    # Updates the economy from the next game state
+    def update(self, state: GameState) -> dict[str, TeamEconomy]:
+        """
+        Updates the team economies from the players which changed, i.e.,
+        whose contribution differs from the last game state, missed game
+        states do not leave the economies wrong.
+        :param state: Next game state, needs "allplayers" information
+        :return: Returns the economy of each team by team name
+        """
+        # Update the loss bonus from the consecutive round losses of each team
+        if state.map is not None:
+            # Run over both teams of the map
+            teams = [("T", state.map.team_t), ("CT", state.map.team_ct)]
+            for name, team in teams:
+                # Skip teams without information on the losses
+                if team is None or team.consecutive_round_losses is None:
+                    continue
+                # Loss bonus of the team in the next round
+                bonus = loss_bonus(team.consecutive_round_losses)
+                # Changing the loss bonus changes the prediction of each player
+                if bonus != self.teams[name].loss_bonus:
+                    # Remove the players of the team with the old bonus
+                    players = [
+                        c for c in self.players.values()
+                        if c is not None and c.team == name
+                    ]
+                    for c in players:
+                        self._apply(c, -1)
+                    # Re-add the players with the new bonus
+                    self.teams[name].loss_bonus = bonus
+                    for c in players:
+                        self._apply(c, +1)
+        # Update the contribution of each changed player
+        for steamid in self.changed(state):
+            # Whether the player is still present and its current information
+            present = steamid in state.allplayers
+            player = state.allplayers.get(steamid)
+            # Contribution of the player, might be None
+            c = _Contribution.of(player)
+            # Unchanged contribution, e.g., only the position changed
+            if present and steamid in self.players and c == self.players[
+                steamid
+            ]:
+                self.sources[steamid] = player
+                continue
+            # Remove the previous contribution of the player
+            if steamid in self.players:
+                self._apply(self.players.pop(steamid), -1)
+                self.sources.pop(steamid)
+            # Add the current contribution of the player, if still present
+            if present:
+                # Remember and apply the contribution
+                self.players[steamid] = c
+                self.sources[steamid] = player
+                self._apply(c, +1)
+        # Return the economy of each team
+        return self.teams
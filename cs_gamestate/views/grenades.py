@@ -0,0 +1,226 @@
+# Postponed evaluation of annotations, allows to type-hint methods with their
+# own enclosing class type
+from __future__ import annotations
+# Compact growable storage of the samples while a grenade is active
+from array import array
+# Use dataclasses to represent the grenade events and histories
+from dataclasses import dataclass, field
+# Default time of the samples if not given by the caller
+import time
+
+# Compact storage of the finished grenade histories
+import numpy as np
+
+# Top-Level Game State Structure
+from cs_gamestate.structs.gamestate import GameState
+# Active grenade substructure of the game state
+from cs_gamestate.structs.equipment import ActiveGrenade
+# Coordinate tuples as vectors with NaN marking missing coordinates
+from cs_gamestate.views.utils import vector
+
+
+# Converts the lifetime of a grenade to seconds, the game sends it as string
+def _seconds(value) -> float:
+    # Try to interpret the value as number of seconds
+    try:
+        return float(value)
+    # Anything else is treated as "not present"
+    except (TypeError, ValueError):
+        return 0.0
+
+
+# Area of the convex hull of the flame pieces on the ground plane
+def hull_area(points: np.ndarray) -> float:
+    """
+    Computes the area of the convex hull of points projected onto the x-y
+    plane via the monotone chain algorithm and the shoelace formula.
+    :param points: N x 3 array of coordinates
+    :return: Area in squared game units, zero for less than three points
+    """
+    # Project onto the ground plane and sort lexicographically
+    xy = sorted({(float(x), float(y)) for x, y, _ in points})
+    # Less than three distinct points do not span any area
+    if len(xy) < 3:
+        return 0.0
+
+    # Cross product of the vectors o->a and o->b
+    def cross(o, a, b):
+        return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+    # Builds one half of the hull from the sorted points
+    def chain(ordered):
+        hull = []
+        for p in ordered:
+            # Remove points which do not make a counter-clockwise turn
+            while len(hull) >= 2 and cross(hull[-2], hull[-1], p) <= 0:
+                hull.pop()
+            hull.append(p)
+        # The last point is the first point of the other half
+        return hull[:-1]
+
+    # Lower and upper half of the hull in counter-clockwise order
+    hull = np.array(chain(xy) + chain(reversed(xy)))
+    # Shoelace formula over the hull vertices
+    x, y = hull[:, 0], hull[:, 1]
+    return float(abs(np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1))) / 2)
+
+
+# Start or end of a grenade effect
+@dataclass
+class GrenadeEvent:
+    # Kind of the event: "start" or "end"
+    kind: str
+    # Key of the grenade in the "grenades" information
+    grenade: str
+    # Type of the grenade, e.g., "smoke" or "inferno"
+    type: str
+    # Steam ID of the player owning the grenade
+    owner: str
+    # Time of the event in seconds
+    time: float
+
+
+# History of a single grenade from throw to expiry
+@dataclass
+class GrenadeHistory:
+    # Key of the grenade in the "grenades" information
+    grenade: str
+    # Type of the grenade, e.g., "smoke" or "inferno"
+    type: str
+    # Steam ID of the player owning the grenade
+    owner: str
+    # Time the grenade became active, derived from its lifetime when first seen
+    start: float
+    # Time the grenade has been seen last, None while still active
+    end: float = None
+    # Time of each sample
+    times: np.ndarray = field(default=None, repr=False)
+    # Position and velocity at each sample as N x 3 arrays
+    positions: np.ndarray = field(default=None, repr=False)
+    velocities: np.ndarray = field(default=None, repr=False)
+    # Number of flame pieces and area covered by the flames at each sample,
+    # zero for grenades other than infernos
+    flames: np.ndarray = field(default=None, repr=False)
+    areas: np.ndarray = field(default=None, repr=False)
+
+    # Duration of the grenade effect in seconds, None while still active
+    @property
+    def duration(self) -> float | None:
+        return None if self.end is None else self.end - self.start
+
+
+# Samples of a grenade collected while it is active
+class _Active:
+    # Starts collecting the samples of a newly seen grenade
+    def __init__(self, key: str, grenade: ActiveGrenade, t: float):
+        # Identity of the grenade, changing the type or owner of a key means
+        # the key has been reused for another grenade
+        self.key, self.type, self.owner = key, grenade.type, grenade.owner
+        # The grenade might have been active for some time already
+        self.start = t - _seconds(grenade.lifetime)
+        # Compact storage of the samples, times in double precision to resolve
+        # sub-second differences of epoch timestamps, vectors and areas in
+        # single precision
+        self.times = array("d")
+        self.positions, self.velocities = array("f"), array("f")
+        self.flames, self.areas = array("H"), array("f")
+
+    # Appends a sample of the grenade
+    def append(self, grenade: ActiveGrenade, t: float):
+        # Time, position and velocity of the grenade
+        self.times.append(t)
+        self.positions.extend(vector(grenade.position))
+        self.velocities.extend(vector(grenade.velocity))
+        # Flame pieces of infernos, if any
+        flames = [
+            f for f in (grenade.flames or {}).values()
+            if isinstance(f, tuple) and len(f) == 3
+        ]
+        self.flames.append(min(len(flames), 0xFFFF))
+        self.areas.append(hull_area(np.array(flames)) if flames else 0.0)
+
+    # Converts the collected samples into the finished history
+    def finish(self, end: float) -> GrenadeHistory:
+        return GrenadeHistory(
+            self.key, self.type, self.owner, self.start, end,
+            np.frombuffer(self.times, dtype=np.float64),
+            np.frombuffer(self.positions, dtype=np.float32).reshape(-1, 3),
+            np.frombuffer(self.velocities, dtype=np.float32).reshape(-1, 3),
+            np.frombuffer(self.flames, dtype=np.uint16),
+            np.frombuffer(self.areas, dtype=np.float32)
+        )
+
+
+# Tracks the lifecycle of all grenades across the game states
+class GrenadeTracker:
+    # Starts without any grenades
+    def __init__(self):
+        # Samples of the currently active grenades by key
+        self.active: dict[str, _Active] = {}
+        # Finished histories of all expired grenades in order of expiry
+        self.history: list[GrenadeHistory] = []
+
+    # Ends the grenade of a key, recording its history
+    def _end(self, key: str, t: float) -> GrenadeEvent:
+        # Stop collecting samples of the grenade
+        active = self.active.pop(key)
+        # The grenade has been seen last at its latest sample
+        end = active.times[-1] if active.times else t
+        # Record the finished history
+        self.history.append(active.finish(end))
+        # Announce the end of the grenade
+        return GrenadeEvent("end", key, active.type, active.owner, end)
+
+    # Updates the active grenades from the next game state
+    def update(self, state: GameState, t: float = None) -> list[GrenadeEvent]:
+        """
+        Updates the active grenades, starting newly seen and ending vanished
+        grenades.
+        :param state: Next game state, needs "grenades" information
+        :param t: Time the game state has been received in seconds, defaults
+            to now
+        :return: Returns the list of start and end events of this game state
+        """
+        # Receiving time defaults to now
+        t = time.time() if t is None else t
+        # Grenades of this game state, none if there are no active grenades
+        grenades = {
+            key: grenade for key, grenade in (state.grenades or {}).items()
+            if grenade is not None
+        }
+        # Collect the events of this game state
+        events = []
+        # End the grenades which vanished or whose key has been reused
+        for key in list(self.active):
+            # Active grenade and grenade of this game state with the same key
+            active, grenade = self.active[key], grenades.get(key)
+            # End if vanished or belonging to another grenade now
+            if grenade is None or (grenade.type, grenade.owner) != (
+                    active.type, active.owner
+            ):
+                events.append(self._end(key, t))
+        # Run over all grenades of this game state
+        for key, grenade in grenades.items():
+            # Start newly seen grenades
+            if key not in self.active:
+                self.active[key] = _Active(key, grenade, t)
+                events.append(GrenadeEvent(
+                    "start", key, grenade.type, grenade.owner,
+                    self.active[key].start
+                ))
+            # Append the sample to the grenade
+            self.active[key].append(grenade, t)
+        # Return the events of this game state
+        return events
+
+    # Ends all active grenades, e.g., at the end of the recording
+    def close(self, t: float = None) -> list[GrenadeEvent]:
+        """
+        Ends all active grenades.
+        :param t: Time to end grenades without samples at, defaults to now
+        :return: Returns the list of end events
+        """
+        # Time defaults to now
+        t = time.time() if t is None else t
+        # End each active grenade
+        return [self._end(key, t) for key in list(self.active)]
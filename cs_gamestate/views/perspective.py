@@ -0,0 +1,178 @@
+# Postponed evaluation of annotations, allows to type-hint methods with their
+# own enclosing class type
+from __future__ import annotations
+# Bounded history of the active weapons of each player
+from collections import deque
+# Use dataclasses to represent the cached view of each player
+from dataclasses import dataclass, field, fields, replace
+
+# Top-Level Game State Structure
+from cs_gamestate.structs.gamestate import GameState
+# Player information substructure of the game state
+from cs_gamestate.structs.player import Player
+# Container of the weapons of a player
+from cs_gamestate.structs.equipment import Equipment
+
+
+# Merges the information on the spectated player into the information on all
+# players, fields present in the overlay take precedence
+def merge(base: Player | None, overlay: Player | None) -> Player | None:
+    # Nothing to merge if only one of them is present
+    if overlay is None:
+        return base
+    if base is None:
+        return overlay
+    # Copy of the base with the fields present in the overlay replaced
+    return replace(base, **{
+        f.name: getattr(overlay, f.name) for f in fields(overlay)
+        if getattr(overlay, f.name) is not None
+    })
+
+
+# Cached view of a single player merged from the spectated player and all
+# players information
+@dataclass
+class PlayerView:
+    # Steam ID of the player
+    steamid: str
+    # Merged player information, replaced only when the merged information
+    # changed
+    player: Player = None
+    # Names of the active weapons with the number of the game state in which
+    # the player switched to them, most recent last
+    weapons: deque = field(default_factory=lambda: deque(maxlen=32))
+    # Number of game states in which the merged information changed
+    updates: int = 0
+    # Number of the game state which last carried information on the player
+    seen: int = 0
+    # Source player information the merged view has been built from, the
+    # overlay is the last spectated information, kept when the camera moves
+    # away from the player
+    base: Player = field(default=None, repr=False)
+    overlay: Player = field(default=None, repr=False)
+
+    # Refreshes the view from the sources of the next game state
+    def refresh(self, base: Player | None, overlay: Player | None, index: int):
+        """
+        Rebuilds the merged player information if one of the sources changed
+        and counts an update only if the merged information changed, i.e., not
+        if just the camera switched to or away from the player.
+        :param base: Information on the player from all players, if any
+        :param overlay: Information on the player as the spectated player, if
+            the player is spectated
+        :param index: Number of the game state
+        """
+        # The player is present in this game state
+        self.seen = index
+        # The camera moved away: Keep the last spectated information, the
+        # fresh information on all players takes precedence over it
+        spectated = overlay is not None
+        if not spectated:
+            overlay = self.overlay
+        # Unchanged sources keep the merged information, shared substructures
+        # are compared by identity first
+        if (base is self.base or base == self.base) and (
+                overlay is self.overlay or overlay == self.overlay
+        ):
+            # Keep the current objects to compare by identity next time
+            self.base, self.overlay = base, overlay
+            return
+        # Rebuild the merged information from the changed sources
+        self.base, self.overlay = base, overlay
+        player = merge(base, overlay) if spectated else merge(overlay, base)
+        # Keep the current object if the merged information did not change,
+        # e.g., when the camera switched to or away from the player
+        if player == self.player:
+            return
+        self.player = player
+        self.updates += 1
+        # Name of the active weapon, if known
+        name = None
+        if self.player is not None and isinstance(
+                self.player.weapons, Equipment
+        ):
+            active = self.player.weapons.active
+            name = active.name if active is not None else None
+        # Record switching to another active weapon
+        if name is not None and (
+                not self.weapons or self.weapons[-1][1] != name
+        ):
+            self.weapons.append((index, name))
+
+
+# Tracks the spectated player of an observer feed and keeps a cached view of
+# each player across camera switches
+class PerspectiveTracker:
+    # Starts without any players
+    def __init__(self, history: int = 32):
+        """
+        Initializes an empty tracker.
+        :param history: Number of active weapon switches kept per player
+        """
+        # Number of active weapon switches kept per player
+        self.history = history
+        # Cached view of each player by steam ID, kept when players leave
+        self.views: dict[str, PlayerView] = {}
+        # Steam ID of the currently spectated player, None if unknown
+        self.spectated: str | None = None
+        # Number of camera switches between players so far
+        self.switches = 0
+        # Number of game states seen so far
+        self.count = 0
+
+    # View of the currently spectated player
+    @property
+    def current(self) -> PlayerView | None:
+        return self.views.get(self.spectated)
+
+    # View of a player by steam ID
+    def view(self, steamid: str) -> PlayerView | None:
+        """
+        Looks up the cached view of a player.
+        :param steamid: Steam ID of the player
+        :return: Returns the view of the player, None if never seen
+        """
+        return self.views.get(steamid)
+
+    # Updates the views from the next game state
+    def update(self, state: GameState) -> PlayerView | None:
+        """
+        Refreshes the views of the players present in the game state and
+        follows the camera to the spectated player.
+        :param state: Next game state, "player" and/or "allplayers"
+            information
+        :return: Returns the view of the spectated player
+        """
+        # Count the game states to timestamp the views
+        self.count += 1
+        # The spectated player, only identifiable with its steam ID
+        spectated = state.player
+        if spectated is not None and not spectated.steamid:
+            spectated = None
+        # Sources of each player present in the game state by steam ID
+        sources = {
+            steamid: [player, None]
+            for steamid, player in (state.allplayers or {}).items()
+            if player is not None
+        }
+        # The spectated player overlays its information on all players
+        if spectated is not None:
+            sources.setdefault(spectated.steamid, [None, None])[1] = spectated
+        # Refresh the view of each present player
+        for steamid, (base, overlay) in sources.items():
+            # Create views of players seen for the first time
+            if steamid not in self.views:
+                self.views[steamid] = PlayerView(
+                    steamid, weapons=deque(maxlen=self.history)
+                )
+            # Rebuild only if the sources changed
+            self.views[steamid].refresh(base, overlay, self.count)
+        # Follow the camera to the spectated player
+        steamid = spectated.steamid if spectated is not None else None
+        if steamid != self.spectated:
+            # Only switching from one player to another counts
+            if steamid is not None and self.spectated is not None:
+                self.switches += 1
+            self.spectated = steamid
+        # Return the view of the spectated player
+        return self.current
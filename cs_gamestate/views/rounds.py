@@ -0,0 +1,167 @@
+# Postponed evaluation of annotations, allows to type-hint methods with their
+# own enclosing class type
+from __future__ import annotations
+# Use dataclasses to represent the span of each round
+from dataclasses import dataclass
+
+# Top-Level Game State Structure
+from cs_gamestate.structs.gamestate import GameState
+
+
+# Span of game states belonging to a single round with pointers to the key
+# snapshots, all given as indices into the stream of game states
+@dataclass
+class RoundSpan:
+    # Round number as reported by the map, i.e., the number of rounds played
+    # before this round
+    number: int
+    # Index of the first game state of the round
+    start: int
+    # Index one past the last game state of the round, None while still open
+    stop: int = None
+    # Index of the first game state after the freeze time ended
+    freeze_end: int = None
+    # Index of the first game state with the bomb planted
+    bomb_plant: int = None
+    # Index of the first game state after the round ended
+    round_end: int = None
+    # Team winning the round, None if not over yet
+    win_team: str = None
+
+    # Indices of all game states of the round
+    @property
+    def indices(self) -> range | None:
+        return None if self.stop is None else range(self.start, self.stop)
+
+
+# Segments a stream of game states into rounds, indexing the key snapshots
+class RoundSegmenter:
+    # Starts without any rounds
+    def __init__(self, keep: bool = True):
+        """
+        Creates an empty segmenter.
+        :param keep: Keep the game states to look up snapshots by round, set to
+            False to only index a stream stored elsewhere, e.g., a recording
+        """
+        # Whether to keep the game states
+        self.keep = keep
+        # Game states of the stream, if kept
+        self.states: list[GameState] = []
+        # Number of game states seen so far, i.e., index of the next one
+        self.count = 0
+        # All spans in order of the stream
+        self.spans: list[RoundSpan] = []
+        # Latest span of each round number, e.g., after a restart of the match
+        self.rounds: dict[int, RoundSpan] = {}
+        # Phase of the previous game state
+        self.phase = None
+
+    # Currently open span, if any
+    @property
+    def current(self) -> RoundSpan | None:
+        # Only the last span can be open
+        if self.spans and self.spans[-1].stop is None:
+            return self.spans[-1]
+        # No round is open
+        return None
+
+    # Closes the currently open span
+    def _close(self, index: int):
+        # Close the span before the game state at the index
+        if self.current is not None:
+            self.current.stop = index
+
+    # Appends the next game state to the stream
+    def update(self, state: GameState) -> RoundSpan | None:
+        """
+        Assigns the game state to a round, starting a new one at the beginning
+        of the freeze time or when the round number changes.
+        :param state: Next game state, needs "round" and "map" information,
+            "phase_countdowns" information improves detecting the bomb plant
+        :return: Returns the span of the round the game state belongs to, None
+            if not belonging to any round, e.g., during warmup
+        """
+        # Index of this game state in the stream
+        index, self.count = self.count, self.count + 1
+        # Keep the game state to look up snapshots
+        if self.keep:
+            self.states.append(state)
+        # Phases of the round and of the countdown, if any
+        phase = state.round.phase if state.round else None
+        countdown = (
+            state.phase_countdowns.phase if state.phase_countdowns else None
+        )
+        # Round number reported by the map, if any
+        number = state.map.round if state.map else None
+        # Game states outside of rounds, e.g., warmup or in the menu, close the
+        # current round
+        if phase is None or number is None or state.map.phase == "warmup":
+            self._close(index)
+            self.phase = None
+            return None
+        # The current round, if any
+        span = self.current
+        # Start a new round when the freeze time starts or the number changes,
+        # except for the number changing after the end of the round
+        freezetime = phase == "freezetime" and self.phase != "freezetime"
+        if span is None or freezetime or (
+                phase != "over" and number != span.number
+        ):
+            # Close the previous round
+            self._close(index)
+            # Open and index the new round
+            span = RoundSpan(number, index)
+            self.spans.append(span)
+            self.rounds[number] = span
+        # Remember the phase to detect the start of the freeze time
+        self.phase = phase
+        # The freeze time ended with the first game state after it
+        if span.freeze_end is None and phase in {"live", "over"}:
+            span.freeze_end = index
+        # The bomb has been planted with the first game state reporting so
+        if span.bomb_plant is None and (
+                state.round.bomb == "planted"
+                or countdown in {"bomb", "defuse"}
+        ):
+            span.bomb_plant = index
+        # The round ended with the first game state after it
+        if span.round_end is None and phase == "over":
+            span.round_end = index
+        # Remember the winner of the round once known
+        if state.round.win_team is not None:
+            span.win_team = state.round.win_team
+        # Return the span of the round of this game state
+        return span
+
+    # Looks up a key snapshot of a round
+    def snapshot(self, number: int, key: str = "freeze_end"):
+        """
+        Looks up a key snapshot of the round in constant time.
+        :param number: Round number as reported by the map
+        :param key: Key snapshot: "start", "freeze_end", "bomb_plant" or
+            "round_end"
+        :return: Game state at the snapshot if kept, otherwise its index, None
+            if the round or snapshot is unknown
+        """
+        # Index of the snapshot, if known
+        index = getattr(self.rounds.get(number), key, None)
+        # Return the game state if kept, the index otherwise
+        if index is not None and self.keep:
+            return self.states[index]
+        return index
+
+    # Game states of a round
+    def round(self, number: int) -> list[GameState] | None:
+        """
+        Gets all game states of the round, including those of an open round.
+        :param number: Round number as reported by the map
+        :return: List of the game states, None if the round is unknown or the
+            game states are not kept
+        """
+        # Unknown rounds or game states not kept cannot be looked up
+        if number not in self.rounds or not self.keep:
+            return None
+        # Span of the round
+        span = self.rounds[number]
+        # Slice of the game states, open rounds extend to the latest state
+        return self.states[span.start:span.stop]
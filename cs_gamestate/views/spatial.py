@@ -0,0 +1,201 @@
+# Postponed evaluation of annotations, allows to type-hint methods with their
+# own enclosing class type
+from __future__ import annotations
+
+# Vectorized distance computations over all players at once
+import numpy as np
+
+# Top-Level Game State Structure
+from cs_gamestate.structs.gamestate import GameState
+# Coordinate conversion shared by the views
+from cs_gamestate.views.utils import vector
+
+# Approximate radius around each flame piece of a molotov/incendiary grenade
+# within which players are burning, in game units
+FLAME_RADIUS = 60.0
+# Approximate radius of the cloud of a smoke grenade, in game units
+SMOKE_RADIUS = 144.0
+
+
+# Converts a coordinate tuple to a 3-dimensional point, None if missing or
+# malformed, i.e., not indexed
+def _point(coordinates) -> tuple[float, float, float] | None:
+    # Convert like all other views, missing coordinates are NaN
+    point = vector(coordinates)
+    # Points with missing coordinates cannot be located
+    return None if np.isnan(point).any() else point
+
+
+# Spatial index over the positions of all players and grenade effects of a
+# single game state
+#   Note: With at most ten players, vectorized brute force over a NumPy array
+#       outperforms any grid or tree which would need to be rebuilt for each
+#       game state anyway
+class SpatialIndex:
+    # Builds the index from the decoded coordinates of the game state
+    def __init__(self, state: GameState):
+        """
+        Collects the positions of all players and grenade effects into arrays.
+        :param state: Game state with "allplayers" and "grenades" information,
+            players without position are not indexed
+        """
+        # Steam IDs, teams, positions and whether alive of the indexed players
+        steamids, teams, positions, alive = [], [], [], []
+        # Run over all players, if there is information on them
+        for steamid, player in (state.allplayers or {}).items():
+            # Skip players without valid position
+            point = _point(player.position) if player is not None else None
+            if point is None:
+                continue
+            # Collect the player into the index
+            steamids.append(steamid)
+            teams.append(str(player.team) if player.team else None)
+            positions.append(point)
+            # Players without state information are assumed to be alive
+            alive.append(
+                player.state is None or (player.state.health or 0) > 0
+            )
+        # Steam IDs in the order of the rows of the arrays
+        self.steamids = steamids
+        # Team of each player as object array to compare against team names
+        self.teams = np.array(teams, dtype=object)
+        # Positions of all players as N x 3 array
+        self.positions = np.array(positions, dtype=float).reshape(-1, 3)
+        # Whether each player is alive, dead players are excluded by default
+        self.alive = np.array(alive, dtype=bool)
+        # Row of each player in the arrays by steam ID
+        self.rows = {steamid: row for row, steamid in enumerate(steamids)}
+        # Positions of the active grenades and the flame pieces of infernos
+        self.grenades, self.flames = {}, {}
+        # Run over all active grenades, if there is information on them
+        for key, grenade in (state.grenades or {}).items():
+            # Grenade effects without position cannot be located
+            if grenade is None:
+                continue
+            # Position of the grenade itself, if valid
+            point = _point(grenade.position)
+            if point is not None:
+                self.grenades[key] = np.array(point, dtype=float)
+            # Positions of the flame pieces as M x 3 array, if any
+            if isinstance(grenade.flames, dict):
+                flames = [
+                    f for f in grenade.flames.values() if _point(f) is not None
+                ]
+                self.flames[key] = np.array(flames, dtype=float).reshape(-1, 3)
+
+    # Boolean mask of the players to consider in a query
+    def _mask(self, team: str | None, alive: bool) -> np.ndarray:
+        # Start from all players
+        mask = np.ones(len(self.steamids), dtype=bool)
+        # Restrict to a single team
+        if team is not None:
+            mask &= self.teams == str(team)
+        # Restrict to living players
+        if alive:
+            mask &= self.alive
+        # Return the combined mask
+        return mask
+
+    # Distances of all players to a single point
+    def distances(self, point) -> np.ndarray:
+        """
+        Computes the euclidean distance of each indexed player to a point.
+        :param point: Coordinate tuple of three numbers
+        :return: Array of distances in the order of the steamids attribute
+        """
+        # Vectorized over all rows of the position array
+        return np.linalg.norm(self.positions - np.asarray(point), axis=1)
+
+    # Selects the players within a radius around a point
+    def players_within(
+            self, radius: float, point, team: str = None, alive: bool = True
+    ) -> list[str]:
+        """
+        Selects the players within the radius around the point.
+        :param radius: Radius around the point in game units
+        :param point: Coordinate tuple of three numbers
+        :param team: Only select players of this team, e.g., "T" or "CT"
+        :param alive: Only select players which are alive
+        :return: List of the steam IDs of the selected players
+        """
+        # Players within the radius and matching the filters
+        mask = self._mask(team, alive) & (self.distances(point) <= radius)
+        # Convert the mask to steam IDs
+        return [self.steamids[row] for row in np.flatnonzero(mask)]
+
+    # Selects the players within the flames of a molotov/incendiary grenade
+    def players_in_inferno(
+            self, grenade: str, radius: float = FLAME_RADIUS,
+            team: str = None, alive: bool = True
+    ) -> list[str]:
+        """
+        Selects the players within the radius around any flame piece of the
+        inferno.
+        :param grenade: Key of the grenade in the "grenades" information
+        :param radius: Radius around each flame piece in game units
+        :param team: Only select players of this team, e.g., "T" or "CT"
+        :param alive: Only select players which are alive
+        :return: List of the steam IDs of the selected players, empty if the
+            grenade is not an inferno
+        """
+        # Flame pieces of the grenade, if any
+        flames = self.flames.get(grenade)
+        # No flames or no players, nobody can be burning
+        if flames is None or not len(flames) or not self.steamids:
+            return []
+        # Distance of each player (rows) to each flame piece (columns)
+        distances = np.linalg.norm(
+            self.positions[:, None, :] - flames[None, :, :], axis=2
+        )
+        # Players within the radius of any flame and matching the filters
+        mask = self._mask(team, alive) & (distances.min(axis=1) <= radius)
+        # Convert the mask to steam IDs
+        return [self.steamids[row] for row in np.flatnonzero(mask)]
+
+    # Selects the players within the cloud of a smoke grenade
+    def players_in_smoke(
+            self, grenade: str, radius: float = SMOKE_RADIUS,
+            team: str = None, alive: bool = True
+    ) -> list[str]:
+        """
+        Selects the players within the radius around the grenade position.
+        :param grenade: Key of the grenade in the "grenades" information
+        :param radius: Radius of the smoke cloud in game units
+        :param team: Only select players of this team, e.g., "T" or "CT"
+        :param alive: Only select players which are alive
+        :return: List of the steam IDs of the selected players, empty if the
+            grenade has no position
+        """
+        # Grenades without position cannot contain anybody
+        if grenade not in self.grenades:
+            return []
+        # Same as selecting the players around the grenade position
+        return self.players_within(
+            radius, self.grenades[grenade], team, alive
+        )
+
+    # Finds the nearest living player of the opposing team
+    def nearest_enemy(self, steamid: str) -> tuple[str, float] | None:
+        """
+        Finds the nearest living player of the opposing team.
+        :param steamid: Steam ID of the player to search the enemy of
+        :return: Tuple of the steam ID of the nearest enemy and its distance,
+            None if the player is not indexed or there is no enemy alive
+        """
+        # Players without position or team do not have enemies
+        if steamid not in self.rows or self.teams[self.rows[steamid]] is None:
+            return None
+        # Row of the player in the arrays
+        row = self.rows[steamid]
+        # Living players of any other team
+        mask = self._mask(None, True) & (self.teams != self.teams[row])
+        mask &= np.array([t is not None for t in self.teams], dtype=bool)
+        # No enemy alive
+        if not mask.any():
+            return None
+        # Distances of all players, those not matching are excluded
+        distances = np.where(mask, self.distances(self.positions[row]), np.inf)
+        # Index of the nearest enemy
+        nearest = int(np.argmin(distances))
+        # Return the steam ID and distance of the nearest enemy
+        return self.steamids[nearest], float(distances[nearest])
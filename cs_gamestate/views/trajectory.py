@@ -0,0 +1,200 @@
+# Postponed evaluation of annotations, allows to type-hint methods with their
+# own enclosing class type
+from __future__ import annotations
+# Time of receiving the game states, the provider timestamp only has a
+# resolution of seconds
+import time
+
+# Store and interpolate the samples vectorized
+import numpy as np
+
+# Top-Level Game State Structure
+from cs_gamestate.structs.gamestate import GameState
+# Coordinate tuples as vectors with NaN marking missing coordinates
+from cs_gamestate.views.utils import vector
+
+
+# Bounded ring buffer of the positions and forward vectors of a single player
+class Trajectory:
+    # Allocates the arrays of the ring buffer once
+    def __init__(self, capacity: int = 256):
+        """
+        Creates an empty trajectory.
+        :param capacity: Maximum number of samples kept, the oldest samples
+            are overwritten first
+        """
+        # Time of each sample
+        self._times = np.empty(capacity, dtype=float)
+        # Position and forward vector of each sample as rows
+        self._positions = np.empty((capacity, 3), dtype=float)
+        self._forwards = np.empty((capacity, 3), dtype=float)
+        # Index of the next sample to write and number of samples stored
+        self._head, self._size = 0, 0
+
+    # Number of samples stored
+    def __len__(self):
+        return self._size
+
+    # Maximum number of samples stored
+    @property
+    def capacity(self) -> int:
+        return len(self._times)
+
+    # Appends a sample, overwriting the oldest if the buffer is full
+    def append(self, t: float, position, forward=None):
+        """
+        Appends a sample to the trajectory.
+        :param t: Time of the sample in seconds, must not decrease
+        :param position: Coordinate tuple of the position
+        :param forward: Coordinate tuple of the forward vector, NaN if missing
+        """
+        # Write the sample at the head of the ring buffer
+        self._times[self._head] = t
+        self._positions[self._head] = position
+        self._forwards[self._head] = vector(forward)
+        # Advance the head, wrapping around at the end of the arrays
+        self._head = (self._head + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+    # Time of the latest sample
+    @property
+    def last(self) -> float | None:
+        return self._times[self._head - 1] if self._size else None
+
+    # Gets the samples in chronological order
+    def samples(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Gets copies of the stored samples ordered from oldest to latest.
+        :return: Tuple of the times (N), positions (N x 3) and forward vectors
+            (N x 3)
+        """
+        # Not wrapped around yet: The samples are stored in order
+        if self._size < self.capacity:
+            order = slice(0, self._size)
+            return (
+                self._times[order].copy(), self._positions[order].copy(),
+                self._forwards[order].copy()
+            )
+        # Wrapped around: The oldest sample is at the head
+        order = np.roll(np.arange(self.capacity), -self._head)
+        return self._times[order], self._positions[order], self._forwards[order]
+
+    # Interpolates the trajectory at arbitrary times
+    def at(self, times, extrapolate: float = 0.25):
+        """
+        Interpolates the position and forward vector at each of the times.
+        :param times: Single time or array of times in seconds
+        :param extrapolate: Maximum time in seconds to extrapolate beyond the
+            latest sample, later times are clamped, earlier times are clamped
+            to the oldest sample
+        :return: Tuple of the positions and forward vectors, N x 3 arrays for
+            arrays of times or 3-vectors for single times, None if empty
+        """
+        # Nothing to interpolate without samples
+        if not self._size:
+            return None
+        # Samples in chronological order
+        ts, positions, forwards = self.samples()
+        # Treat single times like arrays of times
+        t = np.atleast_1d(np.asarray(times, dtype=float))
+        # Clamp to the range covered by the samples plus the extrapolation
+        t = np.clip(t, ts[0], ts[-1] + extrapolate)
+        # A single sample cannot be interpolated, it is held constant
+        if self._size == 1:
+            p = np.repeat(positions, len(t), axis=0)
+            f = np.repeat(forwards, len(t), axis=0)
+        else:
+            # Index of the segment end of each time, the last segment is
+            # continued for extrapolation
+            end = np.clip(np.searchsorted(ts, t, side="right"), 1, len(ts) - 1)
+            start = end - 1
+            # Duration of each segment, repeated times do not divide by zero
+            dt = ts[end] - ts[start]
+            # Relative position of each time within its segment
+            w = np.divide(
+                t - ts[start], dt, out=np.zeros_like(t), where=dt > 0
+            )[:, None]
+            # Linear interpolation of positions and forward vectors
+            p = positions[start] + w * (positions[end] - positions[start])
+            f = forwards[start] + w * (forwards[end] - forwards[start])
+            # Interpolated forward vectors need to be normalized again
+            norm = np.linalg.norm(f, axis=1, keepdims=True)
+            f = np.divide(f, norm, out=f, where=norm > 0)
+        # Single times yield single vectors
+        if np.ndim(times) == 0:
+            return p[0], f[0]
+        # Return the interpolated positions and forward vectors
+        return p, f
+
+    # Downsamples the trajectory for storage
+    def downsample(self, interval: float):
+        """
+        Keeps only the first sample of each interval.
+        :param interval: Length of the intervals in seconds
+        :return: Tuple of the times (N), positions (N x 3) and forward vectors
+            (N x 3) of the kept samples
+        """
+        # Samples in chronological order
+        ts, positions, forwards = self.samples()
+        # Interval each sample falls into, relative to the oldest sample
+        bins = np.floor((ts - ts[:1]) / interval)
+        # Keep the samples starting a new interval
+        keep = np.ones(len(ts), dtype=bool)
+        keep[1:] = bins[1:] != bins[:-1]
+        # Return the kept samples
+        return ts[keep], positions[keep], forwards[keep]
+
+
+# Tracks the trajectory of each player from the game states
+class TrajectoryTracker:
+    # Starts without any trajectories
+    def __init__(self, capacity: int = 256, extrapolate: float = 0.25):
+        """
+        Creates an empty tracker.
+        :param capacity: Maximum number of samples kept per player
+        :param extrapolate: Maximum time in seconds to extrapolate beyond the
+            latest sample of each player
+        """
+        # Size of each players ring buffer
+        self.capacity = capacity
+        # Maximum extrapolation time
+        self.extrapolate = extrapolate
+        # Trajectory of each player by steam ID
+        self.players: dict[str, Trajectory] = {}
+
+    # Appends the positions of all players of the next game state
+    def update(self, state: GameState, t: float = None):
+        """
+        Appends a sample to the trajectory of each player with position.
+        :param state: Next game state, needs "allplayers" information with
+            positions
+        :param t: Time the game state has been received in seconds, defaults
+            to now
+        :return: Returns the trajectory of each player by steam ID
+        """
+        # Receiving time defaults to now
+        t = time.time() if t is None else t
+        # Run over all players, if there is information on them
+        for steamid, player in (state.allplayers or {}).items():
+            # Players without valid position cannot be tracked
+            if player is None or np.isnan(vector(player.position)[0]):
+                continue
+            # Create the trajectory of new players
+            if steamid not in self.players:
+                self.players[steamid] = Trajectory(self.capacity)
+            # Append the sample to the trajectory of the player
+            self.players[steamid].append(t, player.position, player.forward)
+        # Return the trajectories of all players
+        return self.players
+
+    # Interpolates the positions of all players at a render time
+    def at(self, t: float) -> dict[str, tuple[np.ndarray, np.ndarray]]:
+        """
+        Interpolates the position and forward vector of all players.
+        :param t: Render time in seconds
+        :return: Dictionary of position and forward vector by steam ID
+        """
+        return {
+            steamid: trajectory.at(t, self.extrapolate)
+            for steamid, trajectory in self.players.items()
+        }
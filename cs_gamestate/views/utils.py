@@ -0,0 +1,12 @@
+# Missing coordinates are represented by NaN
+import numpy as np
+
+
+# Converts a coordinate tuple to a 3-dimensional vector, NaN if missing or
+# malformed
+def vector(coordinates) -> tuple[float, float, float]:
+    # Only coordinate tuples of three numbers are valid
+    if isinstance(coordinates, tuple) and len(coordinates) == 3:
+        return coordinates
+    # Anything else is treated as "not present"
+    return np.nan, np.nan, np.nan